@@ -1,26 +1,53 @@
 """Streamlit UI for the Gold Strategy Playground."""
 from __future__ import annotations
 
+import contextlib
+import json
+import math
+
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from gold_strategy import profiling
 from gold_strategy.backtest.engine import run_backtest
-from gold_strategy.backtest.sweep import run_sma_parameter_sweep
+from gold_strategy.backtest.metrics import summarize_metrics_matrix
+from gold_strategy.backtest.overfitting import overfitting_diagnostics, suggest_n_splits
+from gold_strategy.backtest.stability import date_range_stability_surface
+from gold_strategy.backtest.sweep import sma_parameter_pairs, sma_sweep_returns
 from gold_strategy.backtest.walk_forward import run_walk_forward
-from gold_strategy.data.loaders import build_feature_frame, load_price_data
+from gold_strategy.data.loaders import DEFAULT_DATA_PATH, load_price_data
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.data.snapshot import DEFAULT_SNAPSHOT_PATH, snapshot_is_fresh
+from gold_strategy.strategies.ensemble import StrategySpec, evaluate_ensembles, weight_grid
 from gold_strategy.strategies.rsi_mean_reversion import generate_rsi_mean_reversion_signals
 from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
 
 st.set_page_config(page_title="Gold Strategy Playground", layout="wide")
 
 
-@st.cache_data(show_spinner=False)
-def get_data() -> tuple[pd.DataFrame, pd.DataFrame]:
-    prices = load_price_data()
-    features = build_feature_frame(prices)
-    return prices, features
+@st.cache_resource(show_spinner=False)
+def get_data() -> ResampleCache:
+    # Prefer the prebuilt binary snapshot; fall back to the CSV and refresh the snapshot.
+    if snapshot_is_fresh(DEFAULT_SNAPSHOT_PATH, DEFAULT_DATA_PATH):
+        return ResampleCache.load(DEFAULT_SNAPSHOT_PATH)
+    cache = ResampleCache(load_price_data())
+    try:
+        cache.save(DEFAULT_SNAPSHOT_PATH)
+    except OSError:
+        pass  # read-only deployments still work, just without the fast path
+    return cache
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def stability_frame(
+    strategy_returns: pd.Series, period: str, periods_per_year: float, metric: str
+) -> pd.DataFrame:
+    # The surface is quadratic in the number of periods, so reruns reuse it.
+    surface = date_range_stability_surface(
+        strategy_returns, period=period, periods_per_year=periods_per_year
+    )
+    return surface.frame(metric)
 
 
 def _filter_range(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
@@ -28,6 +55,7 @@ def _filter_range(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> p
     return df.loc[mask].reset_index(drop=True)
 
 
+@profiling.profiled("app.plot_price_with_overlays")
 def plot_price_with_overlays(
     features: pd.DataFrame, overlays: list[tuple[str, str | pd.Series]] | None = None
 ) -> go.Figure:
@@ -56,6 +84,7 @@ def plot_price_with_overlays(
     return fig
 
 
+@profiling.profiled("app.plot_rsi")
 def plot_rsi(features: pd.DataFrame, rsi_col: str, oversold: float, overbought: float) -> go.Figure:
     fig = go.Figure(
         data=go.Scatter(
@@ -70,6 +99,7 @@ def plot_rsi(features: pd.DataFrame, rsi_col: str, oversold: float, overbought:
     return fig
 
 
+@profiling.profiled("app.plot_equity")
 def plot_equity(result) -> go.Figure:
     equity = result.equity_curve.copy()
     equity.index = equity.index.tz_convert(None)
@@ -80,6 +110,7 @@ def plot_equity(result) -> go.Figure:
     return fig
 
 
+@profiling.profiled("app.plot_drawdown")
 def plot_drawdown(result) -> go.Figure:
     drawdown = result.drawdown.copy()
     drawdown.index = drawdown.index.tz_convert(None)
@@ -90,7 +121,10 @@ def plot_drawdown(result) -> go.Figure:
     return fig
 
 
+@profiling.profiled("app.plot_sweep_heatmap")
 def plot_sweep_heatmap(df: pd.DataFrame, metric: str) -> go.Figure:
+    import plotly.express as px  # deferred: only the sweep tab needs it
+
     pivot = df.pivot(index="long_window", columns="short_window", values=metric)
     if pivot.empty:
         return go.Figure()
@@ -104,8 +138,27 @@ def plot_sweep_heatmap(df: pd.DataFrame, metric: str) -> go.Figure:
     return fig
 
 
+@profiling.profiled("app.plot_stability_surface")
+def plot_stability_surface(surface: pd.DataFrame, metric: str) -> go.Figure:
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=surface.to_numpy(),
+            x=list(surface.columns),
+            y=list(surface.index),
+            colorscale="Viridis",
+            colorbar=dict(title=metric.replace("_", " ").title()),
+        )
+    )
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=30, b=20),
+        xaxis=dict(title="End", type="category"),
+        yaxis=dict(title="Start", type="category"),
+    )
+    return fig
+
+
 try:
-    prices, base_features = get_data()
+    price_cache = get_data()
 except FileNotFoundError as exc:
     st.error(str(exc))
     st.stop()
@@ -113,18 +166,37 @@ except FileNotFoundError as exc:
 st.title("Gold Strategy Playground")
 st.caption("Educational tool for backtesting simple gold futures strategies")
 
-min_date = prices["date"].min().date()
-max_date = prices["date"].max().date()
+min_date = price_cache.base["date"].min().date()
+max_date = price_cache.base["date"].max().date()
+
+BAR_SIZE_OPTIONS = {
+    "Daily": "daily",
+    "Weekly": "weekly",
+    "Monthly": "monthly",
+}
 
 STRATEGY_OPTIONS = {
     "SMA Crossover": "sma",
     "RSI Mean Reversion": "rsi",
 }
 
+ENSEMBLE_COMPONENTS = {
+    spec.label: spec
+    for spec in [
+        StrategySpec.sma(20, 50),
+        StrategySpec.sma(10, 30),
+        StrategySpec.sma(50, 200),
+        StrategySpec.rsi(14, 30, 70),
+        StrategySpec.rsi(7, 25, 75),
+    ]
+}
+
 with st.sidebar:
     st.header("Parameters")
     strategy_choice = st.selectbox("Strategy", list(STRATEGY_OPTIONS.keys()), index=0)
     strategy_key = STRATEGY_OPTIONS[strategy_choice]
+    bar_choice = st.selectbox("Bar size", list(BAR_SIZE_OPTIONS.keys()), index=0)
+    resolution = BAR_SIZE_OPTIONS[bar_choice]
 
     if strategy_key == "sma":
         short_window = st.number_input("Short SMA", min_value=5, max_value=120, value=20, step=1)
@@ -151,8 +223,21 @@ with st.sidebar:
     transaction_cost = st.slider("Transaction cost (bps)", 0.0, 50.0, 5.0, 0.5)
     slippage_cost = st.slider("Slippage (bps)", 0.0, 50.0, 0.0, 0.5)
     initial_capital = st.number_input("Initial capital", min_value=1.0, value=1.0, step=1.0)
+    show_performance = st.checkbox("Show performance panel", value=False)
     run_clicked = st.button("Run Backtest", type="primary")
 
+# A fresh profiler per script run, so the panel always shows the latest rerun. It sits
+# on an exit stack that is closed before every st.stop() and at the end of the run.
+profiling.disable()  # drop a profiler an interrupted earlier run left in this context
+run_profiling = contextlib.ExitStack()
+last_profile = run_profiling.enter_context(profiling.profile()) if show_performance else None
+
+
+def _stop_run() -> None:
+    run_profiling.close()
+    st.stop()
+
+
 if "auto_run" not in st.session_state:
     st.session_state.auto_run = True
 if run_clicked:
@@ -160,14 +245,18 @@ if run_clicked:
 
 if not st.session_state.auto_run:
     st.info("Adjust parameters and click 'Run Backtest' to see results.")
-    st.stop()
+    _stop_run()
+
+prices = price_cache.prices(resolution)
+base_features = price_cache.features(resolution)
+periods_per_year = price_cache.periods_per_year(resolution)
 
 filtered_prices = _filter_range(prices, start_ts, end_ts)
 filtered_features = _filter_range(base_features, start_ts, end_ts)
 
 if filtered_prices.empty:
     st.warning("No data for selected range")
-    st.stop()
+    _stop_run()
 
 if strategy_key == "sma":
     enriched_features, signals = generate_sma_crossover_signals(
@@ -190,6 +279,7 @@ result = run_backtest(
     transaction_cost_bps=transaction_cost,
     slippage_bps=slippage_cost,
     initial_capital=initial_capital,
+    periods_per_year=periods_per_year,
 )
 
 metrics = result.metrics
@@ -205,11 +295,11 @@ metric_cols[4].metric("Sharpe", f"{metrics['sharpe']:.2f}")
 tab_labels = ["Price & Indicators", "Equity curve", "Drawdown"]
 if strategy_key == "sma":
     tab_labels.append("Parameter sweep")
-tab_labels.append("Walk-forward")
+tab_labels.extend(["Walk-forward", "Stability", "Ensemble"])
 tabs = st.tabs(tab_labels)
 chart_tab, equity_tab, drawdown_tab = tabs[:3]
 sweep_tab = tabs[3] if strategy_key == "sma" else None
-walk_tab = tabs[-1]
+walk_tab, stability_tab, ensemble_tab = tabs[-3:]
 
 with chart_tab:
     if strategy_key == "sma":
@@ -269,17 +359,34 @@ if sweep_tab:
                         f"Large grid detected ({len(combos)} combos). This may take a while to compute."
                     )
                 with st.spinner("Running parameter sweep..."):
-                    sweep_df = run_sma_parameter_sweep(
+                    # One return matrix feeds both the metrics table and the diagnostics.
+                    sweep_returns = sma_sweep_returns(
                         filtered_prices,
                         filtered_features,
                         short_values,
                         long_values,
                         transaction_cost_bps=transaction_cost,
                         slippage_bps=slippage_cost,
-                        initial_capital=initial_capital,
                     )
+                    pairs = sma_parameter_pairs(short_values, long_values)
+                    sweep_df = pd.DataFrame(
+                        {
+                            "short_window": [short for short, _ in pairs],
+                            "long_window": [long for _, long in pairs],
+                            **summarize_metrics_matrix(sweep_returns.to_numpy(), periods_per_year),
+                        }
+                    )
+                    try:
+                        diagnostics = overfitting_diagnostics(
+                            sweep_returns,
+                            n_splits=suggest_n_splits(len(sweep_returns)),
+                            periods_per_year=periods_per_year,
+                        )
+                    except ValueError as exc:
+                        diagnostics = str(exc)
                 st.session_state["sweep_results"] = sweep_df
                 st.session_state["sweep_metric"] = metric_choice
+                st.session_state["sweep_diagnostics"] = diagnostics
 
         sweep_data = st.session_state.get("sweep_results")
         if sweep_data is not None:
@@ -292,7 +399,33 @@ if sweep_tab:
                     sweep_data[["short_window", "long_window", metric_name]].round(precision),
                     use_container_width=True,
                 )
-                st.plotly_chart(plot_sweep_heatmap(sweep_data, metric_name), use_container_width=True)
+                heatmap_col, diagnostics_col = st.columns([3, 1])
+                heatmap_col.plotly_chart(
+                    plot_sweep_heatmap(sweep_data, metric_name), use_container_width=True
+                )
+                with diagnostics_col:
+                    st.markdown("**Overfitting check**")
+                    diagnostics = st.session_state.get("sweep_diagnostics")
+                    if isinstance(diagnostics, str):
+                        st.info(f"Diagnostics unavailable: {diagnostics}")
+                    elif diagnostics is not None:
+                        st.metric("Prob. of backtest overfitting", f"{diagnostics.pbo:.0%}")
+                        deflated = diagnostics.deflated_sharpe
+                        st.metric(
+                            "Deflated Sharpe",
+                            "n/a" if math.isnan(deflated) else f"{deflated:.0%}",
+                            help="Undefined when the winner's skew and kurtosis make "
+                            "the Sharpe ratio's variance estimate non-positive.",
+                        )
+                        st.metric("OOS loss rate", f"{diagnostics.prob_oos_loss:.0%}")
+                        st.metric("IS→OOS Sharpe slope", f"{diagnostics.degradation_slope:.2f}")
+                        st.caption(
+                            f"Best full-sample pair: {diagnostics.best_column} "
+                            f"(Sharpe {diagnostics.best_sharpe:.2f} vs "
+                            f"{diagnostics.expected_max_sharpe:.2f} expected from luck). "
+                            f"CSCV over {diagnostics.n_combinations} splits of "
+                            f"{diagnostics.n_splits} blocks."
+                        )
         else:
             st.info("Submit a sweep to visualize the grid search results.")
 
@@ -324,6 +457,7 @@ with walk_tab:
                 transaction_cost_bps=transaction_cost,
                 slippage_bps=slippage_cost,
                 initial_capital=initial_capital,
+                periods_per_year=periods_per_year,
             )
         except ValueError as exc:
             st.warning(str(exc))
@@ -334,6 +468,83 @@ with walk_tab:
             st.write("Test equity curve")
             st.plotly_chart(plot_equity(wf_result.test), use_container_width=True)
 
+with stability_tab:
+    st.subheader("Date-range stability")
+    st.write("Metric for every start/end sub-period of the selected range.")
+    stability_period = st.radio("Period", ["Year", "Quarter"], horizontal=True)
+    stability_metric = st.selectbox(
+        "Stability metric", ["sharpe", "cagr", "total_return", "volatility"], index=0
+    )
+    stability = stability_frame(
+        result.strategy_returns,
+        "Y" if stability_period == "Year" else "Q",
+        periods_per_year,
+        stability_metric,
+    )
+    if len(stability.index) < 2:
+        st.info("Select a range spanning at least two periods to see a surface.")
+    else:
+        st.plotly_chart(
+            plot_stability_surface(stability, stability_metric), use_container_width=True
+        )
+
+with ensemble_tab:
+    st.subheader("Strategy ensembles")
+    st.write("Blend several strategies; every blend is backtested in one batched pass.")
+    with st.form("ensemble_form"):
+        component_labels = st.multiselect(
+            "Components",
+            list(ENSEMBLE_COMPONENTS),
+            default=list(ENSEMBLE_COMPONENTS)[:2] + [list(ENSEMBLE_COMPONENTS)[3]],
+        )
+        weight_steps = st.number_input("Weight grid steps", min_value=1, max_value=10, value=4)
+        ensemble_submit = st.form_submit_button("Evaluate ensembles")
+
+    if ensemble_submit:
+        if len(component_labels) < 2:
+            st.warning("Pick at least two components to blend.")
+        else:
+            specs = [ENSEMBLE_COMPONENTS[label] for label in component_labels]
+            n_components = len(specs)
+            with st.spinner("Evaluating ensembles..."):
+                st.session_state["ensemble_results"] = evaluate_ensembles(
+                    filtered_prices,
+                    filtered_features,
+                    specs,
+                    vote_thresholds=[k / n_components for k in range(1, n_components + 1)],
+                    weights=weight_grid(n_components, int(weight_steps)),
+                    transaction_cost_bps=transaction_cost,
+                    slippage_bps=slippage_cost,
+                    periods_per_year=periods_per_year,
+                )
+
+    ensemble_data = st.session_state.get("ensemble_results")
+    if ensemble_data is not None:
+        st.dataframe(
+            ensemble_data.sort_values("sharpe", ascending=False).round(4),
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("Submit the form to compare AND/OR, vote and weighted blends.")
+
+run_profiling.close()
+if last_profile is not None:
+    with st.expander("Performance", expanded=True):
+        st.write(f"Run time: {last_profile.elapsed * 1_000:.0f} ms (span times are inclusive)")
+        st.dataframe(last_profile.summary().round(4), use_container_width=True)
+        if last_profile.counters:
+            counter_df = pd.DataFrame(
+                {"count": last_profile.counters, "per_second": last_profile.rates()}
+            )
+            st.table(counter_df.round(2))
+        st.download_button("Download JSON", last_profile.to_json(), file_name="profile.json")
+        st.download_button(
+            "Download Chrome trace",
+            json.dumps(last_profile.to_chrome_trace()),
+            file_name="profile_trace.json",
+        )
+
 st.caption(
-    "Results use t+1 execution on daily closes with transaction/slippage costs applied only on trades."
+    "Results use t+1 execution on bar closes with transaction/slippage costs applied only on trades."
 )
@@ -0,0 +1,88 @@
+"""Distributed SMA sweep: wall time and speedup by local worker count.
+
+Run from the repository root::
+
+    python benchmarks/bench_distributed.py [--bars 20000] [--workers 1 2 4] [--shard-size 10]
+
+Times ``run_sma_parameter_sweep`` in-process as the baseline, then
+``run_distributed_sma_sweep`` with each ``--workers`` count of local processes on
+a fresh queue directory. Wall times include worker start-up (interpreter and
+imports) and queue polling, so small grids understate the speedup. Scaling is
+bounded by the host's cores: compare the speedup column with ``os.cpu_count()``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.distributed import run_distributed_sma_sweep
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep
+from gold_strategy.data.loaders import build_feature_frame
+
+
+def _synthetic_prices(bars: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 1_300 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return pd.DataFrame(
+        {
+            "date": pd.bdate_range("1950-01-01", periods=bars, tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0.0,
+        }
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-size", type=int, default=10)
+    args = parser.parse_args()
+
+    prices = _synthetic_prices(args.bars)
+    features = build_feature_frame(prices)
+    grid = dict(short_windows=range(5, 65, 5), long_windows=range(70, 270, 20))
+
+    start = time.perf_counter()
+    expected = run_sma_parameter_sweep(prices, features, **grid)
+    baseline = time.perf_counter() - start
+    print(
+        f"{len(expected)} pairs on {args.bars:,} bars, shards of {args.shard_size}, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(f"  {'in-process':<12} {baseline:8.2f} s")
+
+    first = None
+    for n_workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            result = run_distributed_sma_sweep(
+                Path(tmp) / "queue",
+                prices,
+                features,
+                **grid,
+                local_workers=n_workers,
+                shard_size=args.shard_size,
+            )
+            elapsed = time.perf_counter() - start
+        pd.testing.assert_frame_equal(result, expected)
+        first = first or elapsed * args.workers[0]
+        speedup = first / elapsed
+        print(
+            f"  {n_workers:>2} workers   {elapsed:8.2f} s  speedup {speedup:5.2f}x  "
+            f"efficiency {speedup / n_workers:4.0%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+"""Lean (float32/int8) vs float64 pipeline: memory, throughput and accuracy.
+
+Run from the repository root::
+
+    python benchmarks/bench_lean.py [--bars 1000000] [--sweep-bars 200000]
+
+Uses a synthetic minute-bar series. Three stages are compared: loading the CSV
+(``downcast``), one ``run_backtest`` and an SMA parameter sweep. Peak memory is
+the ``tracemalloc`` high-water mark of each call (numpy and pandas buffers
+included). The accuracy table is the largest absolute metric difference between
+the lean and float64 paths.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.metrics import METRIC_NAMES, annualization_factor
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep, sma_sweep_returns
+from gold_strategy.data.loaders import build_feature_frame, load_price_data
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+
+SHORT_WINDOWS = range(5, 55, 5)
+LONG_WINDOWS = range(60, 260, 20)
+
+
+def _write_minute_csv(path: Path, bars: int) -> None:
+    rng = np.random.default_rng(0)
+    close = 1_900 * np.exp(np.cumsum(rng.normal(0, 4e-4, bars)))
+    spread = np.abs(rng.normal(0, 2e-4, bars)) * close
+    pd.DataFrame(
+        {
+            "Date": pd.date_range("2015-01-01", periods=bars, freq="min").strftime(
+                "%Y-%m-%d %H:%M"
+            ),
+            "Open": close.round(1),
+            "High": (close + spread).round(1),
+            "Low": (close - spread).round(1),
+            "Close": close.round(1),
+            "Volume": rng.integers(0, 500, bars),
+        }
+    ).to_csv(path, index=False)
+
+
+def _measure(fn: Callable[[], object]) -> tuple[object, float, float]:
+    """Return (result, seconds, peak MiB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def _frame_mib(*objects: pd.Series | pd.DataFrame) -> float:
+    return sum(int(np.sum(obj.memory_usage(deep=True))) for obj in objects) / 2**20
+
+
+def _report(label: str, seconds: float, peak_mib: float, held_mib: float | None = None) -> None:
+    held = f"  result {held_mib:8.1f} MiB" if held_mib is not None else ""
+    print(f"  {label:<34} {seconds * 1_000:9.1f} ms  peak {peak_mib:8.1f} MiB{held}")
+
+
+def _max_metric_error(full: dict | pd.DataFrame, lean: dict | pd.DataFrame) -> dict[str, float]:
+    return {
+        name: float(np.max(np.abs(np.asarray(lean[name]) - np.asarray(full[name]))))
+        for name in METRIC_NAMES
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=1_000_000, help="minute bars to load/backtest")
+    parser.add_argument("--sweep-bars", type=int, default=200_000, help="bars used by the sweep")
+    args = parser.parse_args()
+    periods_per_year = annualization_factor("1min")
+    errors: dict[str, dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "minute_bars.csv"
+        _write_minute_csv(csv_path, args.bars)
+
+        print(f"Load {args.bars:,} minute bars")
+        loaded = {}
+        for lean in (False, True):
+            prices, seconds, peak = _measure(
+                lambda lean=lean: load_price_data(csv_path, chunksize=250_000, downcast=lean)
+            )
+            loaded[lean] = prices
+            _report("float32 (downcast)" if lean else "float64", seconds, peak, _frame_mib(prices))
+
+    print(f"run_backtest, SMA 20/100 on {args.bars:,} bars")
+    features = build_feature_frame(loaded[False])
+    enriched, signals = generate_sma_crossover_signals(features, 20, 100)
+    results = {}
+    for lean in (False, True):
+        prices = loaded[lean]
+        result, seconds, peak = _measure(
+            lambda lean=lean, prices=prices: run_backtest(
+                prices,
+                enriched,
+                signals,
+                transaction_cost_bps=1,
+                periods_per_year=periods_per_year,
+                lean=lean,
+            )
+        )
+        results[lean] = result
+        held = _frame_mib(
+            result.signals,
+            result.positions,
+            result.turnover,
+            result.strategy_returns,
+            result.equity_curve,
+            result.drawdown,
+        )
+        _report("lean" if lean else "float64", seconds, peak, held)
+    errors["run_backtest"] = _max_metric_error(results[False].metrics, results[True].metrics)
+
+    sweep_prices = loaded[False].iloc[: args.sweep_bars].reset_index(drop=True)
+    sweep_features = build_feature_frame(sweep_prices)
+    grid = dict(
+        short_windows=SHORT_WINDOWS,
+        long_windows=LONG_WINDOWS,
+        transaction_cost_bps=1,
+    )
+    n_pairs = len(SHORT_WINDOWS) * len(LONG_WINDOWS)
+    print(f"SMA sweep, {n_pairs} pairs on {args.sweep_bars:,} bars")
+    sweeps = {}
+    for lean in (False, True):
+        sweep, seconds, peak = _measure(
+            lambda lean=lean: run_sma_parameter_sweep(
+                sweep_prices, sweep_features, **grid, periods_per_year=periods_per_year, lean=lean
+            )
+        )
+        sweeps[lean] = sweep
+        _report("lean (batched)" if lean else "float64 (per pair)", seconds, peak)
+    errors["sweep"] = _max_metric_error(sweeps[False], sweeps[True])
+
+    print("Sweep return matrix (time x pair)")
+    for lean in (False, True):
+        matrix, seconds, peak = _measure(
+            lambda lean=lean: sma_sweep_returns(sweep_prices, sweep_features, **grid, lean=lean)
+        )
+        _report("float32" if lean else "float64", seconds, peak, _frame_mib(matrix))
+
+    print("Max |lean - float64| per metric")
+    print(pd.DataFrame(errors).T.to_string(float_format=lambda value: f"{value:.2e}"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Cold-start benchmarks: module import times and app time-to-first-render.
+
+Run from the repository root::
+
+    python benchmarks/bench_startup.py [--repeat 5]
+
+Each import is timed in a fresh interpreter. Time-to-first-render drives
+``app.py`` through Streamlit's ``AppTest`` against a synthetic daily CSV, once
+parsing the CSV (cold, no snapshot) and once from the prebuilt snapshot.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+IMPORT_TARGETS = [
+    "pandas",
+    "plotly.graph_objects",
+    "plotly.express",
+    "streamlit",
+    "gold_strategy.backtest.engine",
+    "gold_strategy.backtest.sweep",
+    "gold_strategy.data.resample",
+]
+
+_FIRST_RENDER_SCRIPT = """
+import time
+
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=300).run()
+assert not app.exception, [e.message for e in app.exception]
+print(time.perf_counter() - start)
+"""
+
+
+def _time_import(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _write_sample_csv(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    close = 1_300 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    pd.DataFrame(
+        {
+            "Date": pd.bdate_range("1990-01-01", periods=rows).strftime("%Y-%m-%d"),
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": 1_000,
+        }
+    ).to_csv(path, index=False)
+
+
+def _time_first_render(workdir: Path) -> float:
+    script = _FIRST_RENDER_SCRIPT.format(app=str(ROOT / "app.py"))
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=workdir,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _report(label: str, samples: list[float]) -> None:
+    median_ms = statistics.median(samples) * 1_000
+    print(f"{label:<40} median {median_ms:8.1f} ms  min {min(samples) * 1_000:8.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=9_000, help="rows in the synthetic CSV")
+    args = parser.parse_args()
+
+    print("Import time (fresh interpreter)")
+    for module in IMPORT_TARGETS:
+        _report(f"  import {module}", [_time_import(module) for _ in range(args.repeat)])
+
+    print("Time to first render (app.py via AppTest)")
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "data").mkdir()
+        csv_path = workdir / "data" / "Gold_Spot_historical_data.csv"
+        snapshot_path = workdir / "data" / "gold_snapshot.npz"
+        _write_sample_csv(csv_path, args.rows)
+
+        cold = []
+        for _ in range(args.repeat):
+            snapshot_path.unlink(missing_ok=True)
+            cold.append(_time_first_render(workdir))
+        _report("  CSV parse + resample", cold)
+
+        # The last cold run left a fresh snapshot behind.
+        os.utime(snapshot_path)
+        _report("  prebuilt snapshot", [_time_first_render(workdir) for _ in range(args.repeat)])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
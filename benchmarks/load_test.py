@@ -0,0 +1,146 @@
+"""Load test for the local backtest service: latency percentiles under concurrency.
+
+Run from the repository root::
+
+    python benchmarks/load_test.py [--requests 400] [--concurrency 16] [--distinct 24]
+
+By default an in-process service is started on a free localhost port over a
+synthetic daily series; pass ``--url http://127.0.0.1:8765`` to target a running
+``python -m gold_strategy.service`` instead. Requests are drawn at random from
+``--distinct`` payloads (mostly single backtests, some small sweeps), so repeats
+exercise the result cache and request coalescing. Latencies are reported
+overall and per ``X-Cache`` source; ``503`` responses show backpressure.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.service import BacktestServer, BacktestService
+
+
+def _synthetic_cache(rows: int) -> ResampleCache:
+    rng = np.random.default_rng(0)
+    close = 1_300 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    prices = pd.DataFrame(
+        {
+            "date": pd.bdate_range("1990-01-01", periods=rows, tz="UTC"),
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": 1_000.0,
+        }
+    )
+    return ResampleCache(prices)
+
+
+def _payloads(distinct: int, rng: random.Random) -> list[tuple[str, dict]]:
+    payloads = []
+    for i in range(distinct):
+        if i % 8 == 7:
+            short = rng.randrange(5, 30, 5)
+            payloads.append(
+                ("sweep", {"short_windows": [short, short + 5], "long_windows": [60, 90, 120]})
+            )
+        elif i % 2:
+            window = rng.randrange(7, 30)
+            payloads.append(("backtest", {"strategy": "rsi", "parameters": {"window": window}}))
+        else:
+            short = rng.randrange(5, 40)
+            params = {"short_window": short, "long_window": short + rng.randrange(10, 150)}
+            payloads.append(("backtest", {"strategy": "sma", "parameters": params}))
+    return payloads
+
+
+def _call(url: str, endpoint: str, body: dict) -> tuple[float, int, str]:
+    request = urllib.request.Request(
+        f"{url}/{endpoint}",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=600) as response:
+            response.read()
+            status, source = response.status, response.headers.get("X-Cache", "")
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        status, source = exc.code, ""
+    return time.perf_counter() - start, status, source
+
+
+def _percentiles(label: str, latencies: list[float]) -> None:
+    if not latencies:
+        return
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1_000, [50, 95, 99])
+    print(
+        f"  {label:<12} n={len(latencies):<5} "
+        f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  p99 {p99:8.1f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="target an already running service")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct", type=int, default=24, help="distinct request payloads")
+    parser.add_argument("--rows", type=int, default=9_000, help="bars in the synthetic series")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        service = BacktestService(
+            _synthetic_cache(args.rows), workers=args.workers, max_pending=args.max_pending
+        )
+        server = BacktestServer(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = server.url
+
+    rng = random.Random(args.seed)
+    payloads = _payloads(args.distinct, rng)
+    schedule = [rng.choice(payloads) for _ in range(args.requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda job: _call(url, *job), schedule))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for _, status, _ in results)
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, {args.distinct} distinct "
+        f"payloads: {elapsed:.2f} s ({args.requests / elapsed:.1f} req/s)"
+    )
+    print(f"  status codes {dict(sorted(statuses.items()))}")
+    _percentiles("all", [latency for latency, _, _ in results])
+    _percentiles("ok", [latency for latency, status, _ in results if status == 200])
+    for source in ("miss", "coalesced", "hit"):
+        _percentiles(source, [latency for latency, _, s in results if s == source])
+    _percentiles("rejected", [latency for latency, status, _ in results if status == 503])
+
+    if server is not None:
+        print(f"  service stats {server.service.health()['stats']}")
+        server.shutdown()
+        server.server_close()
+        server.service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+"""Stationary block-bootstrap confidence intervals for backtest metrics."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import (
+    METRIC_NAMES,
+    TRADING_DAYS_PER_YEAR,
+    summarize_metrics_matrix,
+)
+from gold_strategy.backtest.panel import backtest_matrix, simple_returns_matrix
+from gold_strategy.profiling import count, profiled
+
+# Replicates per work unit. Fixed so that a seed gives the same draws for any n_jobs.
+_CHUNK_SIZE = 250
+
+PanelSignalFn = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def stationary_bootstrap_indices(
+    n_obs: int,
+    n_replicates: int,
+    mean_block_length: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return (replicate x n_obs) indices for the Politis-Romano stationary bootstrap.
+
+    Blocks start at uniform positions, have geometric lengths with the given mean
+    and wrap around the end of the sample. All replicates are drawn at once.
+    """
+    if mean_block_length < 1:
+        raise ValueError("mean_block_length must be >= 1")
+    starts = rng.integers(0, n_obs, size=(n_replicates, n_obs))
+    restart = rng.random((n_replicates, n_obs)) < 1.0 / mean_block_length
+    restart[:, 0] = True
+
+    steps = np.arange(n_obs)
+    block_origin = np.maximum.accumulate(np.where(restart, steps, 0), axis=1)
+    block_start = np.take_along_axis(starts, block_origin, axis=1)
+    return (block_start + steps - block_origin) % n_obs
+
+
+def _block_length(mean_block_length: float | None, n_obs: int) -> float:
+    """``mean_block_length``, or n ** (1/3) when it is None; validated before any work."""
+    if mean_block_length is None:
+        return max(1.0, n_obs ** (1 / 3))
+    if mean_block_length < 1:
+        raise ValueError("mean_block_length must be >= 1")
+    return mean_block_length
+
+
+def _check_replicates(n_replicates: int) -> None:
+    if n_replicates < 1:
+        raise ValueError("n_replicates must be >= 1")
+
+
+def _return_chunk(
+    seed: np.random.SeedSequence,
+    n_replicates: int,
+    *,
+    returns: np.ndarray,
+    mean_block_length: float,
+    periods_per_year: float,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    indices = stationary_bootstrap_indices(len(returns), n_replicates, mean_block_length, rng)
+    return summarize_metrics_matrix(returns[indices.T], periods_per_year)
+
+
+def _price_chunk(
+    seed: np.random.SeedSequence,
+    n_replicates: int,
+    *,
+    closes: pd.Series,
+    signal_fn: PanelSignalFn,
+    mean_block_length: float,
+    total_cost_bps: float,
+    periods_per_year: float,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    close_values = closes.to_numpy(dtype=float)
+    price_returns = close_values[1:] / close_values[:-1] - 1
+    indices = stationary_bootstrap_indices(
+        len(price_returns), n_replicates, mean_block_length, rng
+    )
+    growth = np.cumprod(1 + price_returns[indices.T], axis=0)
+    paths = np.vstack([np.ones((1, n_replicates)), growth]) * close_values[0]
+    synthetic = pd.DataFrame(paths, index=closes.index)
+
+    signals = signal_fn(synthetic).to_numpy(dtype=float)
+    _, _, strategy_returns = backtest_matrix(
+        simple_returns_matrix(paths), signals, total_cost_bps
+    )
+    return summarize_metrics_matrix(strategy_returns, periods_per_year)
+
+
+def _run_chunks(
+    worker: Callable[..., Dict[str, np.ndarray]],
+    n_replicates: int,
+    seed: int | None,
+    n_jobs: int,
+) -> Dict[str, np.ndarray]:
+    sizes = [_CHUNK_SIZE] * (n_replicates // _CHUNK_SIZE)
+    if n_replicates % _CHUNK_SIZE:
+        sizes.append(n_replicates % _CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    count("bootstrap.replicates", n_replicates)
+
+    if n_jobs > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(worker, seeds, sizes))
+    else:
+        chunks = list(map(worker, seeds, sizes))
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in METRIC_NAMES}
+
+
+def _intervals(
+    estimates: Dict[str, float],
+    replicates: Dict[str, np.ndarray],
+    confidence: float,
+) -> pd.DataFrame:
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for name in METRIC_NAMES:
+        lower, upper = np.nanpercentile(replicates[name], [tail, 100 - tail])
+        rows[name] = {
+            "estimate": float(estimates[name]),
+            "lower": float(lower),
+            "upper": float(upper),
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+@profiled("bootstrap.metric_intervals")
+def bootstrap_metric_intervals(
+    strategy_returns: pd.Series,
+    *,
+    n_replicates: int = 2_000,
+    mean_block_length: float | None = None,
+    confidence: float = 0.95,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    seed: int | None = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """Percentile intervals for every metric by resampling ``strategy_returns``.
+
+    Returns a frame indexed by metric with ``estimate``, ``lower`` and ``upper``
+    columns. ``mean_block_length`` defaults to n ** (1/3).
+    """
+    returns = strategy_returns.to_numpy(dtype=float)
+    if returns.size == 0:
+        raise ValueError("strategy_returns is empty")
+    _check_replicates(n_replicates)
+    block = _block_length(mean_block_length, len(returns))
+
+    worker = partial(
+        _return_chunk,
+        returns=returns,
+        mean_block_length=block,
+        periods_per_year=periods_per_year,
+    )
+    replicates = _run_chunks(worker, n_replicates, seed, n_jobs)
+    estimates = {
+        name: values[0]
+        for name, values in summarize_metrics_matrix(returns, periods_per_year).items()
+    }
+    return _intervals(estimates, replicates, confidence)
+
+
+@profiled("bootstrap.signal_intervals")
+def bootstrap_signal_intervals(
+    prices: pd.DataFrame,
+    signal_fn: PanelSignalFn,
+    *,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    n_replicates: int = 500,
+    mean_block_length: float | None = None,
+    confidence: float = 0.95,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    seed: int | None = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """Percentile intervals from resampled price paths with signals regenerated.
+
+    ``signal_fn`` maps a (date x path) close panel to signals, e.g.
+    ``partial(generate_sma_crossover_panel_signals, short_window=20, long_window=50)``;
+    every chunk of synthetic paths is signalled and backtested as one panel.
+    """
+    closes = prices.set_index("date")["close"] if "date" in prices.columns else prices["close"]
+    if len(closes) < 2:
+        raise ValueError("At least two prices are required")
+    _check_replicates(n_replicates)
+    block = _block_length(mean_block_length, len(closes) - 1)
+    total_cost_bps = transaction_cost_bps + slippage_bps
+
+    worker = partial(
+        _price_chunk,
+        closes=closes,
+        signal_fn=signal_fn,
+        mean_block_length=block,
+        total_cost_bps=total_cost_bps,
+        periods_per_year=periods_per_year,
+    )
+    replicates = _run_chunks(worker, n_replicates, seed, n_jobs)
+
+    original = pd.DataFrame({"close": closes})
+    _, _, strategy_returns = backtest_matrix(
+        simple_returns_matrix(original.to_numpy()),
+        signal_fn(original).to_numpy(dtype=float),
+        total_cost_bps,
+    )
+    estimates = {
+        name: values[0]
+        for name, values in summarize_metrics_matrix(strategy_returns, periods_per_year).items()
+    }
+    return _intervals(estimates, replicates, confidence)
@@ -0,0 +1,159 @@
+"""Out-of-core store for per-parameter return curves.
+
+Curves live in one memory-mapped (time x parameter-set) float matrix on disk,
+laid out column-major so each parameter set's series is contiguous and can be
+read lazily without touching the rest of the file. A small JSON index maps
+parameter keys to columns::
+
+    store_dir/returns.bin   raw float matrix, one column per parameter set
+    store_dir/dates.npy     shared datetime index (int64 nanoseconds, UTC)
+    store_dir/index.json    dtype, row count and ordered parameter keys
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+_INITIAL_CAPACITY = 64
+
+ParameterKey = str | Mapping[str, float | int]
+
+
+def parameter_key(parameters: Mapping[str, float | int]) -> str:
+    """Return the canonical key for a parameter set, e.g. ``long_window=50,short_window=20``."""
+    return ",".join(f"{name}={parameters[name]}" for name in sorted(parameters))
+
+
+class CurveStore:
+    """Memory-mapped matrix of strategy returns keyed by parameter set."""
+
+    def __init__(
+        self,
+        path: Path,
+        dates: pd.DatetimeIndex,
+        dtype: np.dtype,
+        keys: list[str],
+        writable: bool,
+    ) -> None:
+        self.path = path
+        self.dates = dates
+        self.dtype = np.dtype(dtype)
+        self._keys = keys
+        self._columns: Dict[str, int] = {key: i for i, key in enumerate(keys)}
+        self._writable = writable
+        self._matrix: np.memmap | None = None
+        self._capacity = 0
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        dates: Iterable,
+        *,
+        dtype: str | np.dtype = "float64",
+    ) -> CurveStore:
+        """Create an empty store whose curves are all indexed by ``dates``."""
+        root = Path(path)
+        root.mkdir(parents=True, exist_ok=True)
+        if (root / "index.json").exists():
+            raise FileExistsError(f"Curve store already exists at {root}")
+        index = pd.DatetimeIndex(pd.to_datetime(dates, utc=True), name="date")
+        np.save(root / "dates.npy", index.asi8)
+        (root / "returns.bin").touch()
+        store = cls(root, index, np.dtype(dtype), [], writable=True)
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path: str | Path, *, writable: bool = False) -> CurveStore:
+        root = Path(path)
+        meta = json.loads((root / "index.json").read_text())
+        dates = pd.DatetimeIndex(pd.to_datetime(np.load(root / "dates.npy"), utc=True), name="date")
+        return cls(root, dates, np.dtype(meta["dtype"]), list(meta["keys"]), writable)
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: ParameterKey) -> bool:
+        return self._resolve(key) in self._columns
+
+    @staticmethod
+    def _resolve(key: ParameterKey) -> str:
+        return key if isinstance(key, str) else parameter_key(key)
+
+    def _map(self, capacity: int) -> np.memmap:
+        if self._matrix is not None and capacity <= self._capacity:
+            return self._matrix
+        n_rows = len(self.dates)
+        data_file = self.path / "returns.bin"
+        if self._writable:
+            needed = n_rows * capacity * self.dtype.itemsize
+            with open(data_file, "r+b") as handle:
+                handle.seek(0, 2)
+                if handle.tell() < needed:
+                    handle.truncate(needed)
+        self._matrix = np.memmap(
+            data_file,
+            dtype=self.dtype,
+            mode="r+" if self._writable else "r",
+            shape=(n_rows, capacity),
+            order="F",
+        )
+        self._capacity = capacity
+        return self._matrix
+
+    def write(self, key: ParameterKey, returns: pd.Series | np.ndarray) -> int:
+        """Store one curve (aligned to ``dates``) and return its column number."""
+        if not self._writable:
+            raise PermissionError("Curve store was opened read-only")
+        values = np.asarray(returns, dtype=self.dtype)
+        if values.shape != (len(self.dates),):
+            raise ValueError(f"Expected {len(self.dates)} returns, got {values.shape}")
+        name = self._resolve(key)
+        column = self._columns.get(name)
+        if column is None:
+            column = len(self._keys)
+            self._keys.append(name)
+            self._columns[name] = column
+        if column >= self._capacity:
+            self._map(max(_INITIAL_CAPACITY, self._capacity * 2, column + 1))
+        self._matrix[:, column] = values
+        return column
+
+    def flush(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+        meta = {"dtype": self.dtype.str, "n_rows": len(self.dates), "keys": self._keys}
+        (self.path / "index.json").write_text(json.dumps(meta))
+
+    def _column(self, key: ParameterKey) -> np.ndarray:
+        name = self._resolve(key)
+        if name not in self._columns:
+            raise KeyError(f"No curve stored for {name!r}")
+        return self._map(len(self._keys))[:, self._columns[name]]
+
+    def returns(self, key: ParameterKey) -> pd.Series:
+        """Read one return curve from disk."""
+        return pd.Series(np.array(self._column(key)), index=self.dates, name="strategy_return")
+
+    def equity(self, key: ParameterKey, initial_capital: float = 1.0) -> pd.Series:
+        equity = (1 + self.returns(key)).cumprod() * initial_capital
+        equity.name = "equity"
+        return equity
+
+    def matrix(self, keys: Iterable[ParameterKey] | None = None) -> pd.DataFrame:
+        """Return a (date x key) frame for ``keys`` (all curves by default)."""
+        names = self._keys if keys is None else [self._resolve(key) for key in keys]
+        if not names:
+            return pd.DataFrame(index=self.dates)
+        mapped = self._map(len(self._keys))
+        columns = [self._columns[name] for name in names]
+        return pd.DataFrame(mapped[:, columns], index=self.dates, columns=names)
@@ -0,0 +1,418 @@
+"""Distributed SMA sweeps over a shared-filesystem work queue.
+
+A coordinator splits the parameter grid into shards under ``queue_dir``; workers on
+any host that can see the directory claim shards with an atomic ``rename``,
+evaluate them and drop results back. Layout::
+
+    queue_dir/job.json           sweep settings and frame column metadata
+    queue_dir/job.npz            price and feature columns as plain arrays
+    queue_dir/pending/<shard>    unclaimed shards (JSON: pairs + attempt)
+    queue_dir/running/<shard>    claimed shards; mtime is the worker heartbeat
+    queue_dir/done/<shard>       metric records per shard (JSON)
+    queue_dir/failed/<shard>     shard plus the worker's error message
+    queue_dir/STOP               tells workers to exit
+
+Start remote workers with ``python -m gold_strategy.backtest.distributed worker
+<queue_dir>``. The coordinator requeues shards whose heartbeat is older than
+``shard_timeout`` and retries failed or timed-out shards up to ``max_retries``
+times. It gives up when every local worker has exited, or when no worker has
+touched the queue for ``shard_timeout`` seconds, while shards are still open.
+
+Nothing in the queue is unpickled (``np.load`` runs with ``allow_pickle=False``),
+so a process that can write to ``queue_dir`` cannot run code on the coordinator
+or on workers. It can still forge results, so only share the directory with
+hosts you trust to compute them.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR
+from gold_strategy.backtest.sweep import evaluate_sma_pairs, sma_parameter_pairs
+from gold_strategy.profiling import count, profiled
+
+_SUBDIRS = ("pending", "running", "done", "failed")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Hosts sharing the queue can reuse pids, so the temp name also carries the host.
+    tmp = path.with_name(
+        f".{path.name}.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _shard_name(shard_id: int) -> str:
+    return f"shard-{shard_id:05d}.json"
+
+
+def _shard_id(path: Path) -> int:
+    return int(path.stem.split("-")[1].split("@")[0])
+
+
+def _frame_arrays(name: str, frame: pd.DataFrame) -> tuple[dict, dict[str, np.ndarray]]:
+    """Split ``frame`` into pickle-free arrays plus the metadata to rebuild it."""
+    if frame.index.name is not None:
+        frame = frame.reset_index()
+    meta: dict = {"columns": [str(column) for column in frame.columns], "tz": {}}
+    arrays = {}
+    for i, column in enumerate(frame.columns):
+        series = frame[column]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            meta["tz"][str(column)] = str(series.dt.tz)
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = series.to_numpy()
+        if values.dtype.kind not in "biufM":
+            raise ValueError(f"Column {column!r} of {name} must be numeric or datetime")
+        arrays[f"{name}_{i}"] = values
+    return meta, arrays
+
+
+def _frame_from_arrays(name: str, meta: dict, arrays: np.lib.npyio.NpzFile) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {column: arrays[f"{name}_{i}"] for i, column in enumerate(meta["columns"])}
+    )
+    for column, tz in meta["tz"].items():
+        frame[column] = frame[column].dt.tz_localize("UTC").dt.tz_convert(tz)
+    return frame
+
+
+def _load_job(root: Path) -> dict:
+    meta = json.loads((root / "job.json").read_text())
+    with np.load(root / "job.npz", allow_pickle=False) as arrays:
+        frames = {
+            name: _frame_from_arrays(name, meta["frames"][name], arrays)
+            for name in ("prices", "features")
+        }
+    return {**frames, "settings": meta["settings"]}
+
+
+def submit_sma_sweep(
+    queue_dir: str | Path,
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    *,
+    shard_size: int = 25,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    initial_capital: float = 1.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> int:
+    """Write the job and its shards to ``queue_dir``; return the number of shards."""
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    root = Path(queue_dir)
+    if root.exists() and any(root.iterdir()):
+        raise ValueError(f"Queue directory {root} is not empty.")
+    for name in _SUBDIRS:
+        (root / name).mkdir(parents=True, exist_ok=True)
+
+    price_meta, price_arrays = _frame_arrays("prices", prices)
+    feature_meta, feature_arrays = _frame_arrays("features", features)
+    meta = {
+        "frames": {"prices": price_meta, "features": feature_meta},
+        "settings": {
+            "transaction_cost_bps": transaction_cost_bps,
+            "slippage_bps": slippage_bps,
+            "initial_capital": initial_capital,
+            "periods_per_year": periods_per_year,
+        },
+    }
+    with open(root / "job.npz", "wb") as handle:
+        np.savez(handle, **price_arrays, **feature_arrays)
+    _write_atomic(root / "job.json", json.dumps(meta).encode())
+
+    pairs = sma_parameter_pairs(short_windows, long_windows)
+    shards = [pairs[i : i + shard_size] for i in range(0, len(pairs), shard_size)]
+    for shard_id, shard_pairs in enumerate(shards):
+        shard = {"shard_id": shard_id, "pairs": shard_pairs, "attempt": 0}
+        _write_atomic(root / "pending" / _shard_name(shard_id), json.dumps(shard).encode())
+    return len(shards)
+
+
+class _Heartbeat:
+    """Touches the claimed shard file so the coordinator knows the worker is alive."""
+
+    def __init__(self, path: Path, interval: float) -> None:
+        self._path = path
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                os.utime(self._path)
+            except FileNotFoundError:
+                return
+
+    def __enter__(self) -> _Heartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _claim_next(root: Path, worker_id: str) -> Path | None:
+    for candidate in sorted((root / "pending").glob("shard-*.json")):
+        claimed = root / "running" / f"{candidate.stem}@{worker_id}.json"
+        try:
+            os.rename(candidate, claimed)
+        except FileNotFoundError:
+            continue  # another worker won the race
+        os.utime(claimed)
+        return claimed
+    return None
+
+
+@profiled("distributed.worker")
+def run_worker(
+    queue_dir: str | Path,
+    *,
+    worker_id: str | None = None,
+    poll_interval: float = 0.2,
+    heartbeat_interval: float = 1.0,
+    exit_when_idle: bool = False,
+) -> int:
+    """Process shards until ``STOP`` appears (or the queue drains); return shards done."""
+    root = Path(queue_dir)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    job: dict | None = None
+    processed = 0
+
+    while not (root / "STOP").exists():
+        claimed = _claim_next(root, worker_id)
+        if claimed is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        shard = json.loads(claimed.read_text())
+        done_path = root / "done" / _shard_name(shard["shard_id"])
+        try:
+            with _Heartbeat(claimed, heartbeat_interval):
+                if job is None:
+                    job = _load_job(root)
+                records = evaluate_sma_pairs(
+                    job["prices"],
+                    job["features"],
+                    [tuple(pair) for pair in shard["pairs"]],
+                    **job["settings"],
+                )
+            _write_atomic(done_path, json.dumps(records).encode())
+        except Exception as exc:  # report any shard failure to the coordinator
+            shard["error"] = f"{type(exc).__name__}: {exc}"
+            failed_path = root / "failed" / _shard_name(shard["shard_id"])
+            _write_atomic(failed_path, json.dumps(shard).encode())
+        else:
+            processed += 1
+            count("distributed.shards")
+        try:
+            claimed.unlink()
+        except FileNotFoundError:
+            pass  # coordinator already requeued it after a missed heartbeat
+    return processed
+
+
+def start_local_workers(queue_dir: str | Path, n_workers: int) -> list[subprocess.Popen]:
+    """Spawn ``n_workers`` worker processes on this host."""
+    command = [sys.executable, "-m", "gold_strategy.backtest.distributed", "worker"]
+    return [
+        subprocess.Popen([*command, str(queue_dir), "--worker-id", f"local-{i}"])
+        for i in range(n_workers)
+    ]
+
+
+def _requeue(root: Path, source: Path, shard: dict) -> None:
+    shard = {key: value for key, value in shard.items() if key != "error"}
+    shard["attempt"] += 1
+    _write_atomic(root / "pending" / _shard_name(shard["shard_id"]), json.dumps(shard).encode())
+    source.unlink(missing_ok=True)
+
+
+def _last_activity(root: Path) -> float:
+    """Newest mtime among queue entries: submissions, requeues, heartbeats and results."""
+    latest = 0.0
+    for sub in _SUBDIRS:
+        for path in (root / sub).glob("shard-*.json"):
+            try:
+                latest = max(latest, path.stat().st_mtime)
+            except FileNotFoundError:
+                continue  # moved between listing and stat
+    return latest
+
+
+@profiled("distributed.wait")
+def wait_for_sweep(
+    queue_dir: str | Path,
+    *,
+    shard_timeout: float = 300.0,
+    max_retries: int = 2,
+    poll_interval: float = 0.2,
+    timeout: float | None = None,
+    workers: Sequence[subprocess.Popen] = (),
+) -> pd.DataFrame:
+    """Supervise the queue until every shard is done and return merged sweep results.
+
+    ``workers`` are local worker processes to watch: once all of them have exited
+    with shards still open the sweep fails instead of waiting forever. Independently
+    of ``workers``, the sweep fails when no shard is running and nothing in the
+    queue has changed for ``shard_timeout`` seconds (no live worker at all).
+    """
+    root = Path(queue_dir)
+    expected = {_shard_id(path) for sub in _SUBDIRS for path in (root / sub).glob("shard-*.json")}
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    try:
+        while True:
+            done = {_shard_id(path) for path in (root / "done").glob("shard-*.json")}
+            if expected <= done:
+                break
+
+            for failed in (root / "failed").glob("shard-*.json"):
+                shard = json.loads(failed.read_text())
+                if shard["shard_id"] in done:
+                    failed.unlink(missing_ok=True)
+                elif shard["attempt"] >= max_retries:
+                    raise RuntimeError(
+                        f"Shard {shard['shard_id']} failed after {shard['attempt'] + 1} "
+                        f"attempts: {shard.get('error')}"
+                    )
+                else:
+                    count("distributed.retries")
+                    _requeue(root, failed, shard)
+
+            now = time.time()
+            running_shards = list((root / "running").glob("shard-*.json"))
+            for running in running_shards:
+                try:
+                    stale = now - running.stat().st_mtime > shard_timeout
+                    shard = json.loads(running.read_text()) if stale else None
+                except FileNotFoundError:
+                    continue  # finished between listing and stat
+                if shard is None or shard["shard_id"] in done:
+                    continue
+                if shard["attempt"] >= max_retries:
+                    raise RuntimeError(
+                        f"Shard {shard['shard_id']} timed out after {shard['attempt'] + 1} "
+                        f"attempts (no heartbeat for {shard_timeout} seconds)"
+                    )
+                count("distributed.timeouts")
+                _requeue(root, running, shard)
+
+            if workers and all(process.poll() is not None for process in workers):
+                codes = [process.returncode for process in workers]
+                raise RuntimeError(
+                    f"All {len(workers)} local workers exited (codes {codes}) with "
+                    f"{len(expected - done)} shards unfinished"
+                )
+            if not running_shards and now - _last_activity(root) > shard_timeout:
+                raise RuntimeError(
+                    f"No worker has claimed a shard in {root} for {shard_timeout} seconds; "
+                    "start workers with `python -m gold_strategy.backtest.distributed worker`"
+                )
+
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Sweep in {root} did not finish within {timeout} seconds.")
+            time.sleep(poll_interval)
+    finally:
+        (root / "STOP").touch()
+
+    records: list[dict] = []
+    for shard_id in sorted(expected):
+        records.extend(json.loads((root / "done" / _shard_name(shard_id)).read_text()))
+    if not records:
+        return pd.DataFrame(columns=["short_window", "long_window"])
+    return pd.DataFrame.from_records(records)
+
+
+def run_distributed_sma_sweep(
+    queue_dir: str | Path,
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    *,
+    local_workers: int = 0,
+    shard_size: int = 25,
+    shard_timeout: float = 300.0,
+    max_retries: int = 2,
+    timeout: float | None = None,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    initial_capital: float = 1.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> pd.DataFrame:
+    """Submit a sweep, optionally start local workers, and return merged results.
+
+    The result matches ``run_sma_parameter_sweep`` row for row. With
+    ``local_workers=0`` the coordinator only waits for externally started workers.
+    """
+    submit_sma_sweep(
+        queue_dir,
+        prices,
+        features,
+        short_windows,
+        long_windows,
+        shard_size=shard_size,
+        transaction_cost_bps=transaction_cost_bps,
+        slippage_bps=slippage_bps,
+        initial_capital=initial_capital,
+        periods_per_year=periods_per_year,
+    )
+    workers = start_local_workers(queue_dir, local_workers)
+    try:
+        return wait_for_sweep(
+            queue_dir,
+            shard_timeout=shard_timeout,
+            max_retries=max_retries,
+            timeout=timeout,
+            workers=workers,
+        )
+    finally:
+        for process in workers:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Distributed SMA sweep worker")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="process shards from a queue directory")
+    worker.add_argument("queue_dir")
+    worker.add_argument("--worker-id")
+    worker.add_argument("--poll-interval", type=float, default=0.2)
+    worker.add_argument("--exit-when-idle", action="store_true")
+    args = parser.parse_args(argv)
+
+    run_worker(
+        args.queue_dir,
+        worker_id=args.worker_id,
+        poll_interval=args.poll_interval,
+        exit_when_idle=args.exit_when_idle,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,15 @@
-"""Backtest engine for long/cash strategies."""
+"""Backtest engine for long/cash (and fractionally sized) strategies."""
 from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Dict
 
+import numpy as np
 import pandas as pd
 
-from gold_strategy.backtest.metrics import summarize_metrics
+from gold_strategy.backtest.exits import ExitRules, apply_exit_rules
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, summarize_metrics
+from gold_strategy.profiling import count, profiled, span
 
 
 @dataclass
@@ -22,7 +25,8 @@ class BacktestResult:
     metrics: Dict[str, float]
 
 
-def _ensure_datetime_index(frame: pd.DataFrame) -> pd.DataFrame:
+def ensure_datetime_index(frame: pd.DataFrame) -> pd.DataFrame:
+    """Return ``frame`` indexed by sorted UTC ``date`` timestamps; may modify it in place."""
     if frame.index.name == "date":
         return frame
     if "date" in frame.columns:
@@ -33,6 +37,42 @@ def _ensure_datetime_index(frame: pd.DataFrame) -> pd.DataFrame:
     return frame
 
 
+def align_signals(
+    signals: pd.Series, index: pd.DatetimeIndex, *, lean: bool = False
+) -> pd.Series:
+    """Return ``signals`` on the UTC price ``index``; dates without a signal are flat.
+
+    With ``lean``, signals taking only the values -1/0/1 (bool, integer or float)
+    come back as int8 and fractional weights as float32 instead of float64.
+    """
+    aligned = signals.copy()
+    if isinstance(aligned.index, pd.DatetimeIndex):
+        if aligned.index.tz is None:
+            aligned.index = aligned.index.tz_localize("UTC")
+        else:
+            aligned.index = aligned.index.tz_convert("UTC")
+    if lean:
+        dtype = np.int8 if lean_signal_is_binary(aligned) else np.float32
+        aligned = aligned.reindex(index, fill_value=0).fillna(0).astype(dtype)
+    else:
+        aligned = aligned.reindex(index).fillna(0.0)
+    aligned.name = "signal"
+    return aligned
+
+
+def lean_signal_is_binary(signals: pd.Series | np.ndarray) -> bool:
+    """True when every non-NaN value is -1, 0 or 1, whatever the dtype (NaN means flat)."""
+    values = np.asarray(signals)
+    if values.dtype.kind == "b":
+        return True
+    if values.dtype.kind not in "iuf":
+        return False
+    if values.dtype.kind == "f":
+        values = values[~np.isnan(values)]
+    return bool(np.isin(values, (-1, 0, 1)).all())
+
+
+@profiled("backtest.run_backtest")
 def run_backtest(
     prices: pd.DataFrame,
     features: pd.DataFrame,
@@ -40,42 +80,67 @@ def run_backtest(
     transaction_cost_bps: float = 0.0,
     slippage_bps: float = 0.0,
     initial_capital: float = 1.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    exits: ExitRules | None = None,
+    lean: bool = False,
 ) -> BacktestResult:
-    """Execute backtest with t+1 position application and trade-only costs."""
-    price_frame = _ensure_datetime_index(prices.copy())
-    feature_frame = _ensure_datetime_index(features.copy())
-
-    aligned_signals = signals.copy()
-    if isinstance(aligned_signals.index, pd.DatetimeIndex):
-        if aligned_signals.index.tz is None:
-            aligned_signals.index = aligned_signals.index.tz_localize("UTC")
-        else:
-            aligned_signals.index = aligned_signals.index.tz_convert("UTC")
-    aligned_signals = aligned_signals.reindex(price_frame.index).fillna(0.0)
-    aligned_signals.name = "signal"
+    """Execute backtest with t+1 position application and trade-only costs.
+
+    Signals may be fractional or leveraged weights (see ``backtest.sizing``); costs
+    scale with the absolute change in weight. ``periods_per_year`` annualizes CAGR,
+    volatility and Sharpe; pass ``annualization_factor(bar_frequency)`` for intraday
+    or resampled bars. ``exits`` adds stop-loss/take-profit/trailing-stop rules
+    evaluated against each bar's high/low (see ``backtest.exits``).
+
+    ``lean`` stores signals, positions and turnover as int8 (float32 for fractional
+    weights) and returns, equity and drawdown as float32. Equity and metrics are
+    still accumulated in float64 before the result is downcast.
+    """
+    count("backtests")
+    with span("backtest.align"):
+        price_frame = ensure_datetime_index(prices.copy())
+        feature_frame = ensure_datetime_index(features.copy())
+
+        aligned_signals = align_signals(signals, price_frame.index, lean=lean)
 
     positions = aligned_signals.shift(1).fillna(0.0)
     positions.name = "position"
 
     returns = price_frame["close"].pct_change().fillna(0.0)
+    if lean:
+        positions = positions.astype(aligned_signals.dtype)
+        returns = returns.astype(np.float32)
 
-    turnover = positions.diff().abs().fillna(positions.abs())
+    turnover = positions.diff().abs().fillna(positions.abs()).astype(positions.dtype)
     turnover.name = "turnover"
 
+    if exits is not None:
+        with span("backtest.exits"):
+            positions, returns, turnover = apply_exit_rules(price_frame, positions, exits)
+
     total_cost_bps = transaction_cost_bps + slippage_bps
-    costs = turnover * (total_cost_bps / 10_000)
+    costs = turnover.astype(returns.dtype) * returns.dtype.type(total_cost_bps / 10_000)
 
     strategy_returns = positions * returns - costs
     strategy_returns.name = "strategy_return"
 
-    equity_curve = (1 + strategy_returns).cumprod() * initial_capital
+    # Compounding always runs in float64; float32 products drift over long series.
+    exact_returns = strategy_returns.astype(np.float64, copy=False)
+    equity_curve = (1 + exact_returns).cumprod() * initial_capital
     equity_curve.name = "equity"
 
     normalized_equity = equity_curve / initial_capital
     drawdown = normalized_equity / normalized_equity.cummax() - 1
     drawdown.name = "drawdown"
 
-    metrics = summarize_metrics(strategy_returns, normalized_equity, drawdown)
+    with span("backtest.metrics"):
+        metrics = summarize_metrics(
+            exact_returns, normalized_equity, drawdown, periods_per_year=periods_per_year
+        )
+
+    if lean:
+        equity_curve = equity_curve.astype(np.float32)
+        drawdown = drawdown.astype(np.float32)
 
     return BacktestResult(
         prices=price_frame,
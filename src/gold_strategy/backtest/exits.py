@@ -0,0 +1,247 @@
+"""Protective exits (stop-loss, take-profit, trailing stop) on intrabar OHLC.
+
+A trade is a run of bars with a non-zero position of one sign; its entry price is
+the close of the bar before the run (the signal bar, since positions apply at t+1).
+Short trades mirror the levels: stops sit above entry and trail the lowest low,
+targets sit below entry. Within
+each trade the first bar whose low/high touches an exit level closes the position
+for the rest of the run. First touches are found for every trade and every exit
+setting at once with ``np.minimum.reduceat`` over trade segments, so sweeping stop
+distances costs a few array passes rather than a loop over bars.
+
+Fill assumptions:
+
+* ``fill="level"`` exits at the stop/target level, or at the open when the bar
+  gaps through it (long stops fill at ``min(open, level)``, long targets at
+  ``max(open, level)``; mirrored for shorts).
+* ``fill="close"`` exits at the close of the touching bar.
+* When one bar touches both a stop and the target, ``ambiguous`` picks the winner
+  (``"stop"``, the conservative default, or ``"target"``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import product
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, summarize_metrics_matrix
+from gold_strategy.profiling import count, profiled
+
+_FILLS = ("level", "close")
+_AMBIGUOUS = ("stop", "target")
+
+
+@dataclass(frozen=True)
+class ExitRules:
+    """Exit distances as fractions of price (``0.02`` = 2%); ``None`` disables a rule."""
+
+    stop_loss: float | None = None
+    take_profit: float | None = None
+    trailing_stop: float | None = None
+    fill: str = "level"
+    ambiguous: str = "stop"
+
+    def __post_init__(self) -> None:
+        if self.fill not in _FILLS:
+            raise ValueError(f"fill must be one of {_FILLS}")
+        if self.ambiguous not in _AMBIGUOUS:
+            raise ValueError(f"ambiguous must be one of {_AMBIGUOUS}")
+        for name in ("stop_loss", "take_profit", "trailing_stop"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+
+
+def _as_levels(values: Sequence[float | None]) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+
+def exit_matrix(
+    positions: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    stop_losses: Sequence[float | None],
+    take_profits: Sequence[float | None],
+    trailing_stops: Sequence[float | None],
+    *,
+    fill: str = "level",
+    ambiguous: str = "stop",
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Apply k exit settings to one position series.
+
+    The three level sequences are paired column-wise (NaN/None disables a rule).
+    Returns (time x k) ``positions``, per-unit ``asset_returns`` (the exit bar uses
+    the fill price) and ``turnover`` (exit trades are charged on the exit bar).
+    """
+    positions = np.asarray(positions, dtype=float)
+    open_, high, low, close = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    stop_loss, take_profit, trailing = (
+        _as_levels(stop_losses),
+        _as_levels(take_profits),
+        _as_levels(trailing_stops),
+    )
+    n_bars, n_settings = len(positions), len(stop_loss)
+    steps = np.arange(n_bars)
+
+    prev_close = np.empty(n_bars)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_returns = np.nan_to_num(close / prev_close - 1, nan=0.0, posinf=0.0, neginf=0.0)
+
+    side = np.sign(positions)
+    held = side != 0
+    prev_side = np.concatenate([[0.0], side[:-1]])
+    # A flip from long to short (or back) closes one trade and opens another.
+    trade_start = held & (side != prev_side)
+    trade_id = np.cumsum(trade_start) * held
+    start_bar = np.maximum.accumulate(np.where(trade_start, steps, 0))
+    entry = np.where(held, prev_close[start_bar], np.nan)
+    is_long = (side > 0)[:, None]
+
+    # Most favourable high (longs) / low (shorts) of the trade's *earlier* bars,
+    # floored at the entry price.
+    groups = pd.DataFrame(
+        {"high": np.where(held, high, np.nan), "low": np.where(held, low, np.nan)}
+    ).groupby(trade_id)
+    prior_high = groups["high"].cummax().shift(1).to_numpy()
+    prior_low = groups["low"].cummin().shift(1).to_numpy()
+    fresh = trade_start | ~held
+    high_water = np.fmax(entry, np.where(fresh, np.nan, prior_high))
+    low_water = np.fmin(entry, np.where(fresh, np.nan, prior_low))
+
+    long_stop = np.fmax(
+        entry[:, None] * (1 - stop_loss[None, :]), high_water[:, None] * (1 - trailing[None, :])
+    )
+    short_stop = np.fmin(
+        entry[:, None] * (1 + stop_loss[None, :]), low_water[:, None] * (1 + trailing[None, :])
+    )
+    stop_level = np.where(is_long, long_stop, short_stop)
+    target_level = np.where(
+        is_long,
+        entry[:, None] * (1 + take_profit[None, :]),
+        entry[:, None] * (1 - take_profit[None, :]),
+    )
+    with np.errstate(invalid="ignore"):
+        hit_stop = held[:, None] & np.where(
+            is_long, low[:, None] <= stop_level, high[:, None] >= stop_level
+        )
+        hit_target = held[:, None] & np.where(
+            is_long, high[:, None] >= target_level, low[:, None] <= target_level
+        )
+    hit = hit_stop | hit_target
+
+    out_positions = np.repeat(positions[:, None], n_settings, axis=1)
+    asset_returns = np.repeat(base_returns[:, None], n_settings, axis=1)
+    starts = np.flatnonzero(trade_start)
+    if starts.size and n_settings:
+        candidate = np.where(hit, steps[:, None], n_bars)
+        first_hit = np.minimum.reduceat(candidate, starts, axis=0)
+        first_bar = np.where(held[:, None], first_hit[np.maximum(trade_id - 1, 0)], n_bars)
+
+        is_exit = steps[:, None] == first_bar
+        out_positions[steps[:, None] > first_bar] = 0.0
+
+        if fill == "level":
+            take_target = hit_target & (~hit_stop if ambiguous == "stop" else True)
+            # Gaps through a level fill at the (worse for stops, better for targets) open.
+            stop_fill = np.where(
+                is_long, np.fmin(open_[:, None], stop_level), np.fmax(open_[:, None], stop_level)
+            )
+            target_fill = np.where(
+                is_long,
+                np.fmax(open_[:, None], target_level),
+                np.fmin(open_[:, None], target_level),
+            )
+            fill_price = np.where(take_target, target_fill, stop_fill)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                exit_returns = fill_price / prev_close[:, None] - 1
+            asset_returns = np.where(is_exit, exit_returns, asset_returns)
+    else:
+        is_exit = np.zeros((n_bars, n_settings), dtype=bool)
+
+    turnover = np.abs(np.diff(out_positions, axis=0, prepend=0.0))
+    # The exit trade happens inside the exit bar, not at the next bar's open.
+    exit_size = np.where(is_exit, np.abs(out_positions), 0.0)
+    turnover += exit_size
+    turnover[1:] -= exit_size[:-1]
+    return out_positions, asset_returns, turnover
+
+
+def apply_exit_rules(
+    price_frame: pd.DataFrame,
+    positions: pd.Series,
+    rules: ExitRules,
+) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """Return (positions, asset_returns, turnover) for one rule set on a dated frame."""
+    missing = [col for col in ("open", "high", "low", "close") if col not in price_frame.columns]
+    if missing:
+        raise ValueError(f"Exit rules need OHLC columns; missing {missing}")
+    out_positions, asset_returns, turnover = exit_matrix(
+        positions.to_numpy(),
+        price_frame["open"].to_numpy(),
+        price_frame["high"].to_numpy(),
+        price_frame["low"].to_numpy(),
+        price_frame["close"].to_numpy(),
+        [rules.stop_loss],
+        [rules.take_profit],
+        [rules.trailing_stop],
+        fill=rules.fill,
+        ambiguous=rules.ambiguous,
+    )
+    index = positions.index
+    return (
+        pd.Series(out_positions[:, 0], index=index, name="position"),
+        pd.Series(asset_returns[:, 0], index=index, name="asset_return"),
+        pd.Series(turnover[:, 0], index=index, name="turnover"),
+    )
+
+
+@profiled("exits.grid")
+def run_exit_grid(
+    prices: pd.DataFrame,
+    signals: pd.Series,
+    *,
+    stop_losses: Sequence[float | None] = (None,),
+    take_profits: Sequence[float | None] = (None,),
+    trailing_stops: Sequence[float | None] = (None,),
+    fill: str = "level",
+    ambiguous: str = "stop",
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> pd.DataFrame:
+    """Metrics for every (stop_loss, take_profit, trailing_stop) combination in one pass."""
+    # Imported here because the engine itself imports this module for ``exits=``.
+    from gold_strategy.backtest.engine import align_signals, ensure_datetime_index
+
+    ExitRules(fill=fill, ambiguous=ambiguous)  # validate the fill settings
+    grid = list(product(stop_losses, take_profits, trailing_stops))
+    count("exits.settings", len(grid))
+    price_frame = ensure_datetime_index(prices.copy())
+    positions = align_signals(signals, price_frame.index).shift(1).fillna(0.0)
+
+    out_positions, asset_returns, turnover = exit_matrix(
+        positions.to_numpy(),
+        price_frame["open"].to_numpy(),
+        price_frame["high"].to_numpy(),
+        price_frame["low"].to_numpy(),
+        price_frame["close"].to_numpy(),
+        [stop for stop, _, _ in grid],
+        [target for _, target, _ in grid],
+        [trail for _, _, trail in grid],
+        fill=fill,
+        ambiguous=ambiguous,
+    )
+    total_cost = (transaction_cost_bps + slippage_bps) / 10_000
+    strategy_returns = out_positions * asset_returns - turnover * total_cost
+
+    table = pd.DataFrame(grid, columns=["stop_loss", "take_profit", "trailing_stop"])
+    for name, values in summarize_metrics_matrix(strategy_returns, periods_per_year).items():
+        table[name] = values
+    return table
@@ -4,9 +4,52 @@ from __future__ import annotations
 import math
 from typing import Dict
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 TRADING_DAYS_PER_YEAR = 252
+# COMEX gold trades on Globex nearly around the clock (one-hour daily maintenance break).
+TRADING_HOURS_PER_DAY = 23
+
+# Columns per float64 pass in ``summarize_metrics_matrix``.
+_METRIC_CHUNK = 32
+
+METRIC_NAMES = ("total_return", "cagr", "volatility", "max_drawdown", "sharpe")
+
+_CALENDAR_PERIODS_PER_YEAR = (
+    (pd.offsets.BusinessDay, TRADING_DAYS_PER_YEAR),
+    (pd.offsets.Week, 52),
+    (
+        (
+            pd.offsets.MonthEnd,
+            pd.offsets.MonthBegin,
+            pd.offsets.BusinessMonthEnd,
+            pd.offsets.BusinessMonthBegin,
+        ),
+        12,
+    ),
+    ((pd.offsets.QuarterEnd, pd.offsets.QuarterBegin), 4),
+    ((pd.offsets.YearEnd, pd.offsets.YearBegin), 1),
+)
+
+
+def annualization_factor(bar_frequency: str) -> float:
+    """Return the number of ``bar_frequency`` bars in a trading year.
+
+    Daily and longer fixed bars scale from 252 trading days; intraday bars assume a
+    23-hour session, so ``"1min"`` gives 252 * 23 * 60 bars per year.
+    """
+    offset = to_offset(bar_frequency)
+    if isinstance(offset, pd.offsets.Tick):
+        seconds = offset.nanos / 1e9
+        if seconds >= 86_400:
+            return TRADING_DAYS_PER_YEAR * 86_400 / seconds
+        return TRADING_DAYS_PER_YEAR * TRADING_HOURS_PER_DAY * 3_600 / seconds
+    for offset_types, periods in _CALENDAR_PERIODS_PER_YEAR:
+        if isinstance(offset, offset_types):
+            return periods / offset.n
+    raise ValueError(f"Unsupported bar frequency: {bar_frequency}")
 
 
 def total_return(equity_curve: pd.Series) -> float:
@@ -15,7 +58,7 @@ def total_return(equity_curve: pd.Series) -> float:
     return float(equity_curve.iloc[-1] - 1.0)
 
 
-def cagr(equity_curve: pd.Series, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+def cagr(equity_curve: pd.Series, periods_per_year: float = TRADING_DAYS_PER_YEAR) -> float:
     if equity_curve.empty:
         return 0.0
     total_periods = len(equity_curve)
@@ -28,7 +71,9 @@ def cagr(equity_curve: pd.Series, periods_per_year: int = TRADING_DAYS_PER_YEAR)
     return float(ending_value ** (1 / years) - 1)
 
 
-def annualized_volatility(returns: pd.Series, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+def annualized_volatility(
+    returns: pd.Series, periods_per_year: float = TRADING_DAYS_PER_YEAR
+) -> float:
     if returns.empty:
         return 0.0
     return float(returns.std(ddof=0) * math.sqrt(periods_per_year))
@@ -37,7 +82,7 @@ def annualized_volatility(returns: pd.Series, periods_per_year: int = TRADING_DA
 def sharpe_ratio(
     returns: pd.Series,
     risk_free_rate: float = 0.0,
-    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
 ) -> float:
     if returns.empty:
         return 0.0
@@ -54,11 +99,58 @@ def max_drawdown(drawdown: pd.Series) -> float:
     return float(drawdown.min())
 
 
-def summarize_metrics(strategy_returns: pd.Series, equity_curve: pd.Series, drawdown: pd.Series) -> Dict[str, float]:
+def summarize_metrics(
+    strategy_returns: pd.Series,
+    equity_curve: pd.Series,
+    drawdown: pd.Series,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> Dict[str, float]:
     return {
         "total_return": total_return(equity_curve),
-        "cagr": cagr(equity_curve),
-        "volatility": annualized_volatility(strategy_returns),
+        "cagr": cagr(equity_curve, periods_per_year),
+        "volatility": annualized_volatility(strategy_returns, periods_per_year),
         "max_drawdown": max_drawdown(drawdown),
-        "sharpe": sharpe_ratio(strategy_returns),
+        "sharpe": sharpe_ratio(strategy_returns, periods_per_year=periods_per_year),
+    }
+
+
+def summarize_metrics_matrix(
+    strategy_returns: np.ndarray,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> Dict[str, np.ndarray]:
+    """Vectorized ``summarize_metrics`` over the columns of a (time x k) return matrix.
+
+    Metrics are accumulated in float64 whatever the input dtype, ``_METRIC_CHUNK``
+    columns at a time so the float64 temporaries stay small for wide float32 input.
+    """
+    returns = np.asarray(strategy_returns)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    n_periods, n_columns = returns.shape
+    if n_periods == 0:
+        zeros = np.zeros(n_columns)
+        return {name: zeros.copy() for name in METRIC_NAMES}
+    if n_columns > _METRIC_CHUNK:
+        chunks = [
+            summarize_metrics_matrix(returns[:, start : start + _METRIC_CHUNK], periods_per_year)
+            for start in range(0, n_columns, _METRIC_CHUNK)
+        ]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in METRIC_NAMES}
+
+    returns = returns.astype(np.float64, copy=False)
+    equity = np.cumprod(1 + returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    ending_value = equity[-1]
+    years = n_periods / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = np.where(ending_value > 0, np.abs(ending_value) ** (1 / years) - 1, 0.0)
+        vol = returns.std(axis=0)
+        sharpe = np.where(vol > 0, returns.mean(axis=0) / vol * math.sqrt(periods_per_year), 0.0)
+
+    return {
+        "total_return": ending_value - 1.0,
+        "cagr": growth,
+        "volatility": vol * math.sqrt(periods_per_year),
+        "max_drawdown": drawdown.min(axis=0),
+        "sharpe": sharpe,
     }
@@ -0,0 +1,263 @@
+"""Overfitting diagnostics for parameter sweeps: CSCV/PBO and the deflated Sharpe ratio.
+
+Both work on a (time x parameter-set) return matrix, e.g. ``sma_sweep_returns`` or
+``CurveStore.matrix()``.
+
+Combinatorially symmetric cross-validation (Bailey, Borwein, López de Prado and
+Zhu) cuts the rows into ``n_splits`` equal blocks and, for every choice of half
+the blocks as in-sample (IS), picks the best IS parameter set and ranks it
+out-of-sample (OOS). Sharpe ratios only need per-block sums of ``r`` and ``r**2``,
+so all splits are evaluated as one (combination x block) @ (block x parameter)
+matrix product instead of re-running any backtest.
+
+* ``pbo``: share of splits whose IS winner ranks in the bottom half OOS.
+* degradation: least-squares fit of OOS on IS Sharpe of the winners, and the
+  share of splits where the winner loses money OOS.
+* ``deflated_sharpe``: probability that the best full-sample Sharpe beats the
+  maximum expected from ``n_trials`` unskilled trials (Bailey and López de Prado),
+  accounting for the winner's skew and kurtosis.
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR
+from gold_strategy.profiling import count, profiled
+
+_EULER_GAMMA = 0.5772156649015329
+# Splits per matrix product; bounds the (combination x parameter) temporaries.
+_CHUNK_SIZE = 2048
+
+
+@dataclass
+class OverfittingReport:
+    columns: list
+    n_splits: int
+    pbo: float
+    logits: np.ndarray
+    is_sharpe: np.ndarray
+    oos_sharpe: np.ndarray
+    degradation_slope: float
+    degradation_intercept: float
+    prob_oos_loss: float
+    best_column: object
+    best_sharpe: float
+    expected_max_sharpe: float
+    deflated_sharpe: float
+
+    @property
+    def n_combinations(self) -> int:
+        return len(self.logits)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "pbo": self.pbo,
+            "prob_oos_loss": self.prob_oos_loss,
+            "degradation_slope": self.degradation_slope,
+            "degradation_intercept": self.degradation_intercept,
+            "best_sharpe": self.best_sharpe,
+            "expected_max_sharpe": self.expected_max_sharpe,
+            "deflated_sharpe": self.deflated_sharpe,
+            "n_trials": float(len(self.columns)),
+            "n_combinations": float(self.n_combinations),
+        }
+
+
+def _as_matrix(returns: pd.DataFrame | np.ndarray) -> tuple[np.ndarray, list]:
+    if isinstance(returns, pd.DataFrame):
+        values, columns = returns.to_numpy(dtype=float), list(returns.columns)
+    else:
+        values = np.asarray(returns, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("returns must be a (time x parameter set) matrix")
+        columns = list(range(values.shape[1]))
+    # A NaN would zero every Sharpe ratio it touches and silently skew the ranks.
+    if not np.isfinite(values).all():
+        raise ValueError("returns contain NaN or infinite values; drop or fill them first")
+    return values, columns
+
+
+def _sharpe(sums: np.ndarray, sq_sums: np.ndarray, n_obs: float) -> np.ndarray:
+    mean = sums / n_obs
+    var = np.maximum(sq_sums / n_obs - mean**2, 0.0)
+    std = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 1e-12, mean / std, 0.0)
+
+
+def split_combinations(n_splits: int) -> np.ndarray:
+    """(combination x block) 0/1 matrix of every half-size in-sample block set."""
+    if n_splits < 2 or n_splits % 2:
+        raise ValueError("n_splits must be an even number >= 2")
+    picks = np.array(list(combinations(range(n_splits), n_splits // 2)))
+    membership = np.zeros((len(picks), n_splits))
+    np.put_along_axis(membership, picks, 1.0, axis=1)
+    return membership
+
+
+def _evaluate_chunk(
+    membership: np.ndarray,
+    block_sums: np.ndarray,
+    block_sq_sums: np.ndarray,
+    n_obs_half: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    is_sums = membership @ block_sums
+    is_sq_sums = membership @ block_sq_sums
+    is_sharpe = _sharpe(is_sums, is_sq_sums, n_obs_half)
+    oos_sharpe = _sharpe(
+        block_sums.sum(axis=0) - is_sums, block_sq_sums.sum(axis=0) - is_sq_sums, n_obs_half
+    )
+
+    rows = np.arange(len(membership))
+    best = is_sharpe.argmax(axis=1)
+    best_oos = oos_sharpe[rows, best]
+    # Relative OOS rank of the IS winner in (0, 1); ties share the average rank.
+    below = (oos_sharpe < best_oos[:, None]).sum(axis=1)
+    tied = (oos_sharpe == best_oos[:, None]).sum(axis=1)
+    omega = (below + (tied + 1) / 2) / (oos_sharpe.shape[1] + 1)
+    logits = np.log(omega / (1 - omega))
+    return logits, is_sharpe[rows, best], best_oos
+
+
+@profiled("overfitting.cscv")
+def cscv(
+    returns: pd.DataFrame | np.ndarray,
+    *,
+    n_splits: int = 16,
+    n_jobs: int = 1,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-split (logits, IS Sharpe, OOS Sharpe) of the in-sample winner.
+
+    Sharpe ratios are per period (not annualized). Rows that do not fill a whole
+    block are dropped from the start of the sample. ``n_jobs`` > 1 spreads chunks
+    of splits over threads (the matrix products release the GIL).
+    """
+    values, columns = _as_matrix(returns)
+    if len(columns) < 2:
+        raise ValueError("CSCV needs at least two parameter sets")
+    block_len = len(values) // n_splits
+    if block_len < 2:
+        raise ValueError(f"Need at least {2 * n_splits} rows for {n_splits} splits")
+
+    trimmed = values[len(values) - block_len * n_splits :]
+    blocks = trimmed.reshape(n_splits, block_len, len(columns))
+    block_sums = blocks.sum(axis=1)
+    block_sq_sums = np.square(blocks).sum(axis=1)
+
+    membership = split_combinations(n_splits)
+    count("overfitting.splits", len(membership))
+    n_obs_half = block_len * n_splits / 2
+    chunks = [
+        membership[start : start + _CHUNK_SIZE]
+        for start in range(0, len(membership), _CHUNK_SIZE)
+    ]
+
+    def worker(chunk: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _evaluate_chunk(chunk, block_sums, block_sq_sums, n_obs_half)
+
+    if n_jobs > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(worker, chunks))
+    else:
+        parts = [worker(chunk) for chunk in chunks]
+    logits, is_sharpe, oos_sharpe = (np.concatenate(part) for part in zip(*parts, strict=True))
+    return logits, is_sharpe, oos_sharpe
+
+
+def expected_max_sharpe(sharpe_variance: float, n_trials: int) -> float:
+    """Expected maximum Sharpe of ``n_trials`` zero-skill trials with this variance."""
+    from scipy.stats import norm  # deferred: only the deflated Sharpe needs scipy
+
+    if n_trials < 2 or sharpe_variance <= 0:
+        return 0.0
+    return math.sqrt(sharpe_variance) * (
+        (1 - _EULER_GAMMA) * norm.ppf(1 - 1 / n_trials)
+        + _EULER_GAMMA * norm.ppf(1 - 1 / (n_trials * math.e))
+    )
+
+
+def deflated_sharpe_ratio(
+    returns: pd.DataFrame | np.ndarray,
+    column: object | None = None,
+) -> tuple[float, float, float]:
+    """Return (deflated Sharpe probability, per-period Sharpe, expected max Sharpe).
+
+    Every column counts as one trial; ``column`` (default: the best full-sample
+    Sharpe) is the strategy being judged.
+    """
+    from scipy.stats import kurtosis, norm, skew
+
+    values, columns = _as_matrix(returns)
+    n_obs = len(values)
+    if n_obs < 3:
+        raise ValueError("Need at least three observations")
+    sharpe = _sharpe(values.sum(axis=0), np.square(values).sum(axis=0), n_obs)
+    index = int(sharpe.argmax()) if column is None else columns.index(column)
+    selected = values[:, index]
+    observed = float(sharpe[index])
+
+    benchmark = expected_max_sharpe(
+        float(sharpe.var(ddof=1)) if len(columns) > 1 else 0.0, len(columns)
+    )
+    skewness = float(skew(selected)) if selected.std() > 0 else 0.0
+    kurt = float(kurtosis(selected, fisher=False)) if selected.std() > 0 else 3.0
+    denominator = 1 - skewness * observed + (kurt - 1) / 4 * observed**2
+    if denominator <= 0:
+        return float("nan"), observed, benchmark
+    z = (observed - benchmark) * math.sqrt(n_obs - 1) / math.sqrt(denominator)
+    return float(norm.cdf(z)), observed, benchmark
+
+
+def overfitting_diagnostics(
+    returns: pd.DataFrame | np.ndarray,
+    *,
+    n_splits: int = 16,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    n_jobs: int = 1,
+) -> OverfittingReport:
+    """Run CSCV and the deflated Sharpe ratio on a (time x parameter set) matrix.
+
+    Sharpe ratios in the report are annualized with ``periods_per_year``.
+    """
+    values, columns = _as_matrix(returns)
+    logits, is_sharpe, oos_sharpe = cscv(values, n_splits=n_splits, n_jobs=n_jobs)
+    full_sharpe = _sharpe(values.sum(axis=0), np.square(values).sum(axis=0), len(values))
+    best = int(full_sharpe.argmax())
+    deflated, best_sharpe, benchmark = deflated_sharpe_ratio(values, column=best)
+
+    if np.ptp(is_sharpe) > 0:
+        slope, intercept = np.polyfit(is_sharpe, oos_sharpe, 1)
+    else:
+        slope, intercept = 0.0, float(oos_sharpe.mean())
+    scale = math.sqrt(periods_per_year)
+
+    return OverfittingReport(
+        columns=columns,
+        n_splits=n_splits,
+        pbo=float((logits <= 0).mean()),
+        logits=logits,
+        is_sharpe=is_sharpe * scale,
+        oos_sharpe=oos_sharpe * scale,
+        degradation_slope=float(slope),
+        degradation_intercept=float(intercept) * scale,
+        prob_oos_loss=float((oos_sharpe < 0).mean()),
+        best_column=columns[best],
+        best_sharpe=best_sharpe * scale,
+        expected_max_sharpe=benchmark * scale,
+        deflated_sharpe=deflated,
+    )
+
+
+def suggest_n_splits(n_obs: int, candidates: Sequence[int] = (16, 12, 10, 8, 6, 4)) -> int:
+    """Largest candidate split count leaving at least 20 rows per block."""
+    for n_splits in candidates:
+        if n_obs // n_splits >= 20:
+            return n_splits
+    return candidates[-1]
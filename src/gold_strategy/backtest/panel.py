@@ -0,0 +1,126 @@
+"""Vectorized backtests over a (time x instrument) panel of close prices."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import (
+    TRADING_DAYS_PER_YEAR,
+    summarize_metrics,
+    summarize_metrics_matrix,
+)
+from gold_strategy.profiling import count, profiled
+
+
+@dataclass
+class PanelBacktestResult:
+    closes: pd.DataFrame
+    signals: pd.DataFrame
+    positions: pd.DataFrame
+    turnover: pd.DataFrame
+    strategy_returns: pd.DataFrame
+    equity_curves: pd.DataFrame
+    portfolio_returns: pd.Series
+    portfolio_equity: pd.Series
+    metrics: pd.DataFrame
+    portfolio_metrics: Dict[str, float]
+
+
+def simple_returns_matrix(closes: np.ndarray) -> np.ndarray:
+    """Return close-to-close returns with the first row (and gaps) set to zero."""
+    closes = np.asarray(closes, dtype=float)
+    returns = np.zeros_like(closes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = closes[1:] / closes[:-1] - 1
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def backtest_matrix(
+    asset_returns: np.ndarray,
+    signals: np.ndarray,
+    total_cost_bps: float = 0.0,
+    *,
+    lean: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Core t+1 backtest on arrays; returns (positions, turnover, strategy_returns).
+
+    ``signals`` is (time x k). ``asset_returns`` is either (time x k) or a single
+    (time,) series broadcast across every signal column. With ``lean``, bool or
+    integer signals give int8 positions/turnover and returns are float32.
+    """
+    float_dtype = np.float32 if lean else np.float64
+    signals = np.asarray(signals)
+    if lean and signals.dtype.kind in "biu":
+        signals = signals.astype(np.int8, copy=False)
+    else:
+        signals = signals.astype(float_dtype, copy=False)
+    if signals.ndim == 1:
+        signals = signals[:, None]
+    asset_returns = np.asarray(asset_returns, dtype=float_dtype)
+    if asset_returns.ndim == 1:
+        asset_returns = asset_returns[:, None]
+
+    positions = np.zeros_like(signals)
+    positions[1:] = signals[:-1]
+    turnover = np.abs(np.diff(positions, axis=0, prepend=positions.dtype.type(0)))
+    cost_rate = float_dtype(total_cost_bps / 10_000)
+    strategy_returns = positions * asset_returns - turnover * cost_rate
+    return positions, turnover, strategy_returns
+
+
+@profiled("panel.run_panel_backtest")
+def run_panel_backtest(
+    closes: pd.DataFrame,
+    signals: pd.DataFrame,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    initial_capital: float = 1.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> PanelBacktestResult:
+    """Backtest every instrument column at once plus an equal-weight portfolio.
+
+    Uses the same conventions as ``run_backtest`` (t+1 positions, trade-only
+    costs); the portfolio rebalances to equal weights across instruments each bar.
+    """
+    count("panel.instrument_backtests", closes.shape[1])
+    closes = closes.sort_index()
+    aligned_signals = signals.reindex(index=closes.index, columns=closes.columns).fillna(0.0)
+
+    positions, turnover, strategy_returns = backtest_matrix(
+        simple_returns_matrix(closes.to_numpy()),
+        aligned_signals.to_numpy(),
+        transaction_cost_bps + slippage_bps,
+    )
+
+    def _frame(values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=closes.index, columns=closes.columns)
+
+    returns_frame = _frame(strategy_returns)
+    equity_curves = returns_frame.add(1).cumprod() * initial_capital
+
+    metrics = pd.DataFrame(
+        summarize_metrics_matrix(strategy_returns, periods_per_year), index=closes.columns
+    )
+
+    portfolio_returns = returns_frame.mean(axis=1).rename("strategy_return")
+    normalized = (1 + portfolio_returns).cumprod()
+    portfolio_drawdown = normalized / normalized.cummax() - 1
+    portfolio_metrics = summarize_metrics(
+        portfolio_returns, normalized, portfolio_drawdown, periods_per_year=periods_per_year
+    )
+
+    return PanelBacktestResult(
+        closes=closes,
+        signals=aligned_signals,
+        positions=_frame(positions),
+        turnover=_frame(turnover),
+        strategy_returns=returns_frame,
+        equity_curves=equity_curves,
+        portfolio_returns=portfolio_returns,
+        portfolio_equity=(normalized * initial_capital).rename("equity"),
+        metrics=metrics,
+        portfolio_metrics=portfolio_metrics,
+    )
@@ -0,0 +1,171 @@
+"""Position sizing between raw signals and the backtest engine.
+
+Raw strategy signals are 0/1. Volatility targeting scales each long signal by
+``target_vol / realized_vol`` (capped at ``max_leverage``) so the position carries
+a roughly constant risk budget. Realized volatility at bar t only uses returns up
+to t, and the engine applies weights at t+1, so sizing adds no look-ahead.
+
+Whole grids of (target_vol, lookback) settings are sized in one pass: realized
+volatility is computed once per distinct lookback from prefix sums, and every
+setting becomes a column of one (time x setting) weight matrix.
+"""
+from __future__ import annotations
+
+from itertools import product
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.engine import align_signals, ensure_datetime_index
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, summarize_metrics_matrix
+from gold_strategy.backtest.panel import backtest_matrix, simple_returns_matrix
+from gold_strategy.profiling import count, profiled
+
+
+def realized_volatility(
+    returns: np.ndarray,
+    lookbacks: Sequence[int],
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> Dict[int, np.ndarray]:
+    """Annualized trailing volatility (ddof=0) per lookback; NaN until a full window."""
+    returns = np.asarray(returns, dtype=float)
+    sums = np.concatenate([[0.0], np.cumsum(returns)])
+    squares = np.concatenate([[0.0], np.cumsum(returns**2)])
+
+    out = {}
+    for lookback in dict.fromkeys(int(lb) for lb in lookbacks):
+        if lookback <= 1:
+            raise ValueError("lookback must be > 1")
+        vol = np.full(len(returns), np.nan)
+        if lookback <= len(returns):
+            mean = (sums[lookback:] - sums[:-lookback]) / lookback
+            mean_sq = (squares[lookback:] - squares[:-lookback]) / lookback
+            variance = np.clip(mean_sq - mean**2, 0.0, None)
+            vol[lookback - 1 :] = np.sqrt(variance * periods_per_year)
+        out[lookback] = vol
+    return out
+
+
+def _apply_rebalance_threshold(weights: np.ndarray, threshold: float) -> np.ndarray:
+    """Hold the previous weight until the target drifts by more than ``threshold``.
+
+    Moves to or from flat (signal changes) always trade. The recursion is
+    sequential in time but vectorized across every setting column.
+    """
+    held = np.empty_like(weights)
+    current = np.zeros(weights.shape[1])
+    for t, target in enumerate(weights):
+        move = (np.abs(target - current) > threshold) | (target == 0) | (current == 0)
+        current = np.where(move, target, current)
+        held[t] = current
+    return held
+
+
+def volatility_target_weights(
+    signals: np.ndarray,
+    asset_returns: np.ndarray,
+    target_vols: Sequence[float],
+    lookbacks: Sequence[int],
+    *,
+    max_leverage: float = 2.0,
+    rebalance_threshold: float = 0.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> np.ndarray:
+    """Return a (time x setting) weight matrix for paired ``target_vols``/``lookbacks``.
+
+    ``signals`` is a single (time,) signal shared by every setting; bars without a
+    full volatility window are left flat.
+    """
+    if len(target_vols) != len(lookbacks):
+        raise ValueError("target_vols and lookbacks must have the same length")
+    if max_leverage <= 0:
+        raise ValueError("max_leverage must be positive")
+    signals = np.asarray(signals, dtype=float)
+    vols = realized_volatility(asset_returns, lookbacks, periods_per_year)
+
+    vol_matrix = np.column_stack([vols[int(lb)] for lb in lookbacks])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.asarray(target_vols, dtype=float)[None, :] / vol_matrix
+    scale = np.nan_to_num(np.clip(scale, 0.0, max_leverage), nan=0.0)
+    weights = signals[:, None] * scale
+
+    if rebalance_threshold > 0:
+        weights = _apply_rebalance_threshold(weights, rebalance_threshold)
+    return weights
+
+
+def _close_returns(prices: pd.DataFrame) -> pd.Series:
+    close = ensure_datetime_index(prices.copy())["close"]
+    return pd.Series(simple_returns_matrix(close.to_numpy()[:, None])[:, 0], index=close.index)
+
+
+def volatility_target_signals(
+    prices: pd.DataFrame,
+    signals: pd.Series,
+    *,
+    target_vol: float,
+    lookback: int,
+    max_leverage: float = 2.0,
+    rebalance_threshold: float = 0.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> pd.Series:
+    """Size one signal series; pass the result to ``run_backtest`` as ``signals``."""
+    returns = _close_returns(prices)
+    aligned = align_signals(signals, returns.index)
+    weights = volatility_target_weights(
+        aligned.to_numpy(),
+        returns.to_numpy(),
+        [target_vol],
+        [lookback],
+        max_leverage=max_leverage,
+        rebalance_threshold=rebalance_threshold,
+        periods_per_year=periods_per_year,
+    )
+    return pd.Series(weights[:, 0], index=returns.index, name="signal")
+
+
+@profiled("sizing.grid")
+def run_volatility_target_grid(
+    prices: pd.DataFrame,
+    signals: pd.Series,
+    target_vols: Sequence[float],
+    lookbacks: Sequence[int],
+    *,
+    max_leverage: float = 2.0,
+    rebalance_threshold: float = 0.0,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> pd.DataFrame:
+    """Backtest every (target_vol, lookback) combination as one batched matrix run.
+
+    Returns one row per combination with the usual metrics plus average absolute
+    position (``avg_leverage``) and average per-bar ``turnover``.
+    """
+    grid = list(product([float(v) for v in target_vols], [int(lb) for lb in lookbacks]))
+    if not grid:
+        return pd.DataFrame(columns=["target_vol", "lookback"])
+    count("sizing.settings", len(grid))
+
+    returns = _close_returns(prices)
+    aligned = align_signals(signals, returns.index)
+    weights = volatility_target_weights(
+        aligned.to_numpy(),
+        returns.to_numpy(),
+        [target for target, _ in grid],
+        [lookback for _, lookback in grid],
+        max_leverage=max_leverage,
+        rebalance_threshold=rebalance_threshold,
+        periods_per_year=periods_per_year,
+    )
+    positions, turnover, strategy_returns = backtest_matrix(
+        returns.to_numpy(), weights, transaction_cost_bps + slippage_bps
+    )
+
+    table = pd.DataFrame(grid, columns=["target_vol", "lookback"])
+    for name, values in summarize_metrics_matrix(strategy_returns, periods_per_year).items():
+        table[name] = values
+    table["avg_leverage"] = np.abs(positions).mean(axis=0) if len(positions) else 0.0
+    table["turnover"] = turnover.mean(axis=0) if len(turnover) else 0.0
+    return table
@@ -0,0 +1,114 @@
+"""Metric surfaces over every (start period, end period) sub-range.
+
+Prefix sums of returns, squared returns and log growth are built once; any
+contiguous sub-range's count, mean, variance and compounded growth is then a
+difference of two prefix entries, so the whole (start x end) surface costs O(1)
+per cell instead of one backtest per range. Metrics follow ``summarize_metrics``
+except max drawdown, which cannot be composed from prefix sums and is omitted.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR
+from gold_strategy.profiling import profiled
+
+SURFACE_METRICS = ("total_return", "cagr", "volatility", "sharpe")
+
+
+@dataclass
+class StabilitySurface:
+    starts: list[str]
+    ends: list[str]
+    columns: list[str]
+    values: Dict[str, np.ndarray]  # metric -> (start x end x column), NaN where start > end
+
+    def frame(self, metric: str, column: str | None = None) -> pd.DataFrame:
+        """Return the (start x end) surface of ``metric`` for one return column."""
+        if metric not in self.values:
+            raise KeyError(f"Unknown metric {metric!r}. Available: {list(self.values)}")
+        position = 0 if column is None else self.columns.index(column)
+        return pd.DataFrame(
+            self.values[metric][:, :, position],
+            index=pd.Index(self.starts, name="start"),
+            columns=pd.Index(self.ends, name="end"),
+        )
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+
+@profiled("stability.surface")
+def date_range_stability_surface(
+    returns: pd.Series | pd.DataFrame,
+    *,
+    period: str = "Y",
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> StabilitySurface:
+    """Build metric surfaces for every start/end ``period`` (pandas period alias).
+
+    ``returns`` is one strategy's per-bar return series or a (date x parameter-set)
+    sweep matrix such as ``CurveStore.matrix()``; each column gets its own surface.
+    """
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+    frame = frame.sort_index()
+    if frame.empty:
+        raise ValueError("returns is empty")
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    labels = index.to_period(period).astype(str).to_numpy()
+
+    values = frame.to_numpy(dtype=float)
+    growth = 1 + values
+    sums = _prefix(values)
+    squares = _prefix(values**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = _prefix(np.where(growth > 0, np.log(np.where(growth > 0, growth, 1.0)), 0.0))
+    wipeouts = _prefix((growth <= 0).astype(float))
+
+    boundaries = np.flatnonzero(np.concatenate([[True], labels[1:] != labels[:-1]]))
+    names = [str(label) for label in labels[boundaries]]
+    first = boundaries  # first bar of each period
+    last = np.concatenate([boundaries[1:], [len(labels)]])  # one past the last bar
+
+    lo, hi = first[:, None], last[None, :]
+    valid = lo < hi
+    n = np.where(valid, hi - lo, 1)[:, :, None].astype(float)
+
+    def _span(prefix: np.ndarray) -> np.ndarray:
+        return prefix[hi] - prefix[lo]  # (start x end x column)
+
+    mean = _span(sums) / n
+    variance = np.clip(_span(squares) / n - mean**2, 0.0, None)
+    std = np.sqrt(variance)
+    log_growth = _span(logs)
+    wiped = _span(wipeouts) > 0
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        total = np.where(wiped, -1.0, np.expm1(log_growth))
+        cagr = np.where(wiped, 0.0, np.expm1(log_growth * periods_per_year / n))
+        sharpe = np.where(std > 0, mean / std * math.sqrt(periods_per_year), 0.0)
+
+    mask = ~valid[:, :, None]
+    surfaces = {
+        "total_return": total,
+        "cagr": cagr,
+        "volatility": std * math.sqrt(periods_per_year),
+        "sharpe": sharpe,
+    }
+    for name in surfaces:
+        surfaces[name] = np.where(mask, np.nan, surfaces[name])
+
+    return StabilitySurface(
+        starts=names,
+        ends=names,
+        columns=[str(column) for column in frame.columns],
+        values=surfaces,
+    )
@@ -2,12 +2,26 @@
 from __future__ import annotations
 
 from itertools import product
-from typing import Iterable, Sequence
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
 
+import numpy as np
 import pandas as pd
 
-from gold_strategy.backtest.engine import run_backtest
-from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+from gold_strategy.backtest.curve_store import CurveStore, parameter_key
+from gold_strategy.backtest.engine import ensure_datetime_index, run_backtest
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, summarize_metrics_matrix
+from gold_strategy.backtest.panel import backtest_matrix
+from gold_strategy.indicators.graph import evaluate_indicators
+from gold_strategy.profiling import count, profiled, span
+from gold_strategy.strategies.sma_crossover import (
+    crossover_state,
+    generate_sma_crossover_signals,
+    sma_crossover_indicators,
+)
+
+# Parameter sets per (time x block) matrix in the batched path; bounds peak memory.
+_BLOCK_SIZE = 256
 
 
 def _unique_sorted(values: Iterable[int]) -> Sequence[int]:
@@ -15,25 +29,61 @@ def _unique_sorted(values: Iterable[int]) -> Sequence[int]:
     return [v for v in uniq if v > 0]
 
 
-def run_sma_parameter_sweep(
+def sma_parameter_pairs(
+    short_windows: Iterable[int], long_windows: Iterable[int]
+) -> list[tuple[int, int]]:
+    """Return the valid (short, long) grid in sweep order."""
+    short_list = _unique_sorted(short_windows)
+    long_list = _unique_sorted(long_windows)
+    return [(short, long) for short, long in product(short_list, long_list) if short < long]
+
+
+def evaluate_sma_pairs(
     prices: pd.DataFrame,
     features: pd.DataFrame,
-    short_windows: Iterable[int],
-    long_windows: Iterable[int],
+    pairs: Sequence[tuple[int, int]],
     *,
     transaction_cost_bps: float = 0.0,
     slippage_bps: float = 0.0,
     initial_capital: float = 1.0,
-) -> pd.DataFrame:
-    """Evaluate SMA crossover strategy over a parameter grid."""
-    short_list = _unique_sorted(short_windows)
-    long_list = _unique_sorted(long_windows)
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    curve_store: CurveStore | None = None,
+    lean: bool = False,
+) -> list[dict[str, float | int]]:
+    """Backtest each (short, long) pair and return one metrics record per pair.
+
+    When ``curve_store`` is given, each pair's ``strategy_returns`` is written to it.
+    ``lean`` evaluates the grid in (time x pair) blocks with bool signals, int8
+    positions and float32 returns instead of one float64 ``run_backtest`` per pair.
+    """
+    count("sweep.parameter_sets", len(pairs))
+    if lean:
+        records = []
+        blocks = _sweep_return_blocks(
+            prices, features, pairs, transaction_cost_bps + slippage_bps, lean=True
+        )
+        for block_pairs, block_returns in blocks:
+            with span("sweep.metrics"):
+                block_metrics = summarize_metrics_matrix(block_returns, periods_per_year)
+            for column, (short, long) in enumerate(block_pairs):
+                row = {"short_window": short, "long_window": long}
+                if curve_store is not None:
+                    curve_store.write(row, block_returns[:, column])
+                row.update({name: float(values[column]) for name, values in block_metrics.items()})
+                records.append(row)
+        return records
+
+    # One shared pass computes every window the grid needs.
+    indicators = evaluate_indicators(
+        features,
+        [spec for short, long in pairs for spec in sma_crossover_indicators(short, long)],
+    )
 
     records: list[dict[str, float | int]] = []
-    for short, long in product(short_list, long_list):
-        if short >= long:
-            continue
-        enriched, signals = generate_sma_crossover_signals(features, short, long)
+    for short, long in pairs:
+        enriched, signals = generate_sma_crossover_signals(
+            features, short, long, indicators=indicators
+        )
         result = run_backtest(
             prices,
             enriched,
@@ -41,10 +91,137 @@ def run_sma_parameter_sweep(
             transaction_cost_bps=transaction_cost_bps,
             slippage_bps=slippage_bps,
             initial_capital=initial_capital,
+            periods_per_year=periods_per_year,
         )
         row = {"short_window": short, "long_window": long}
+        if curve_store is not None:
+            curve_store.write(
+                {"short_window": short, "long_window": long}, result.strategy_returns
+            )
         row.update(result.metrics)
         records.append(row)
+    return records
+
+
+def _sweep_return_blocks(
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    pairs: Sequence[tuple[int, int]],
+    total_cost_bps: float,
+    *,
+    lean: bool,
+    block_size: int = _BLOCK_SIZE,
+) -> Iterator[tuple[Sequence[tuple[int, int]], np.ndarray]]:
+    """Yield (pairs, time x pair strategy returns) blocks of the grid.
+
+    Follows ``run_backtest``: signals are taken on the feature dates, aligned to
+    the price dates (missing dates are flat) and applied t+1.
+    """
+    price_frame = ensure_datetime_index(prices.copy())
+    indicators = evaluate_indicators(
+        features,
+        [spec for short, long in pairs for spec in sma_crossover_indicators(short, long)],
+    )
+    if "date" in features.columns:
+        feature_dates = pd.DatetimeIndex(pd.to_datetime(features["date"], utc=True))
+    else:
+        feature_dates = pd.DatetimeIndex(pd.to_datetime(features.index, utc=True))
+    rows = feature_dates.get_indexer(price_frame.index)
+    store = indicators.to_numpy()[np.where(rows < 0, 0, rows)]
+    store[rows < 0] = np.nan
+    column_of = {name: i for i, name in enumerate(indicators.columns)}
+
+    asset_returns = price_frame["close"].pct_change().fillna(0.0).to_numpy()
+    if lean:
+        asset_returns = asset_returns.astype(np.float32)
+    for start in range(0, len(pairs), block_size):
+        block = pairs[start : start + block_size]
+        # Filled column by column so no (time x pair) float64 SMA copies are made.
+        signals = np.empty(
+            (len(store), len(block)), dtype=bool if lean else float, order="F"
+        )
+        for column, (short, long) in enumerate(block):
+            signals[:, column] = crossover_state(
+                store[:, column_of[f"sma_{short}"]],
+                store[:, column_of[f"sma_{long}"]],
+                dtype=signals.dtype,
+            )
+        _, _, strategy_returns = backtest_matrix(
+            asset_returns, signals, total_cost_bps, lean=lean
+        )
+        yield block, strategy_returns
+
+
+@profiled("sweep.sma_returns")
+def sma_sweep_returns(
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    *,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    lean: bool = False,
+) -> pd.DataFrame:
+    """Return the (date x parameter set) strategy return matrix of an SMA grid.
+
+    Columns are ``parameter_key`` strings (as in ``CurveStore``), in the same order
+    as the rows of ``run_sma_parameter_sweep``. ``lean`` returns float32 values.
+    """
+    pairs = sma_parameter_pairs(short_windows, long_windows)
+    count("sweep.parameter_sets", len(pairs))
+    dates = ensure_datetime_index(prices.copy()).index
+    blocks = [
+        returns
+        for _, returns in _sweep_return_blocks(
+            prices, features, pairs, transaction_cost_bps + slippage_bps, lean=lean
+        )
+    ]
+    values = np.hstack(blocks) if blocks else np.zeros((len(dates), 0))
+    columns = [parameter_key({"short_window": s, "long_window": lw}) for s, lw in pairs]
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+
+@profiled("sweep.sma")
+def run_sma_parameter_sweep(
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    *,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    initial_capital: float = 1.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    curve_store: str | Path | None = None,
+    lean: bool = False,
+) -> pd.DataFrame:
+    """Evaluate SMA crossover strategy over a parameter grid.
+
+    ``curve_store`` names a new directory that receives every pair's return curve
+    as a memory-mapped matrix; reopen it with ``CurveStore.open``. ``lean`` runs
+    the batched reduced-precision path (see ``evaluate_sma_pairs``) and stores
+    curves as float32.
+    """
+    store = None
+    if curve_store is not None:
+        dates = prices["date"] if "date" in prices.columns else prices.index
+        store = CurveStore.create(
+            curve_store, dates.sort_values(), dtype="float32" if lean else "float64"
+        )
+    records = evaluate_sma_pairs(
+        prices,
+        features,
+        sma_parameter_pairs(short_windows, long_windows),
+        transaction_cost_bps=transaction_cost_bps,
+        slippage_bps=slippage_bps,
+        initial_capital=initial_capital,
+        periods_per_year=periods_per_year,
+        curve_store=store,
+        lean=lean,
+    )
+    if store is not None:
+        store.flush()
 
     if not records:
         return pd.DataFrame(columns=["short_window", "long_window"])
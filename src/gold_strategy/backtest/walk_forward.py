@@ -6,6 +6,8 @@ from dataclasses import dataclass
 import pandas as pd
 
 from gold_strategy.backtest.engine import BacktestResult, run_backtest
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR
+from gold_strategy.profiling import profiled, span
 from gold_strategy.strategies.rsi_mean_reversion import generate_rsi_mean_reversion_signals
 from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
 
@@ -16,6 +18,7 @@ class WalkForwardResult:
     test: BacktestResult
 
 
+@profiled("walk_forward.run")
 def run_walk_forward(
     prices: pd.DataFrame,
     features: pd.DataFrame,
@@ -26,13 +29,15 @@ def run_walk_forward(
     transaction_cost_bps: float,
     slippage_bps: float,
     initial_capital: float,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
 ) -> WalkForwardResult:
-    train_mask = features["date"] <= train_end
-    train_prices = prices.loc[train_mask]
-    train_features = features.loc[train_mask]
+    with span("walk_forward.split"):
+        train_mask = features["date"] <= train_end
+        train_prices = prices.loc[train_mask]
+        train_features = features.loc[train_mask]
 
-    test_prices = prices.loc[~train_mask]
-    test_features = features.loc[~train_mask]
+        test_prices = prices.loc[~train_mask]
+        test_features = features.loc[~train_mask]
 
     if train_prices.empty or test_prices.empty:
         raise ValueError("Train or test segment is empty. Adjust the cutoff date.")
@@ -69,6 +74,7 @@ def run_walk_forward(
         transaction_cost_bps=transaction_cost_bps,
         slippage_bps=slippage_bps,
         initial_capital=initial_capital,
+        periods_per_year=periods_per_year,
     )
     test_result = run_backtest(
         test_prices,
@@ -77,5 +83,6 @@ def run_walk_forward(
         transaction_cost_bps=transaction_cost_bps,
         slippage_bps=slippage_bps,
         initial_capital=initial_capital,
+        periods_per_year=periods_per_year,
     )
     return WalkForwardResult(train=train_result, test=test_result)
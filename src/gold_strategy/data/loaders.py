@@ -2,34 +2,42 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Mapping
 
 import pandas as pd
 
+from gold_strategy.profiling import profiled, span
+
 DEFAULT_DATA_PATH = Path("data/Gold_Spot_historical_data.csv")
 
 
 _REQUIRED_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
 
+_COLUMN_MAP = {
+    "Date": "date",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+}
+
+_OHLCV_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
 
-def load_price_data(csv_path: str | Path = DEFAULT_DATA_PATH) -> pd.DataFrame:
-    """Return cleaned OHLCV prices without derived columns."""
-    path = Path(csv_path)
-    if not path.exists():
-        raise FileNotFoundError(
-            f"Could not find price file at {path}. Download the Kaggle CSV into data/."
-        )
 
-    raw = pd.read_csv(path)
+def _wanted_column(name: str) -> bool:
+    return name in _COLUMN_MAP or name in _REQUIRED_COLUMNS
 
-    column_map = {
-        "Date": "date",
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Volume": "volume",
-    }
-    df = raw.rename(columns=column_map)
+
+@profiled("data.clean")
+def _clean_chunk(raw: pd.DataFrame, downcast: bool) -> pd.DataFrame:
+    df = raw.rename(columns=_COLUMN_MAP)
 
     missing = [col for col in _REQUIRED_COLUMNS if col not in df.columns]
     if missing:
@@ -39,13 +47,87 @@ def load_price_data(csv_path: str | Path = DEFAULT_DATA_PATH) -> pd.DataFrame:
     prices["date"] = pd.to_datetime(prices["date"], utc=True)
     numeric_cols = [c for c in prices.columns if c != "date"]
     prices[numeric_cols] = prices[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    prices = prices.sort_values("date").reset_index(drop=True)
-
     prices["volume"] = prices["volume"].fillna(0)
 
+    if downcast:
+        prices[numeric_cols] = prices[numeric_cols].astype("float32")
     return prices
 
 
+@profiled("data.load_price_data")
+def load_price_data(
+    csv_path: str | Path = DEFAULT_DATA_PATH,
+    *,
+    chunksize: int | None = None,
+    downcast: bool = False,
+) -> pd.DataFrame:
+    """Return cleaned OHLCV prices without derived columns.
+
+    ``chunksize`` streams the CSV in blocks of that many rows so multi-million-row
+    intraday files never hold the raw string frame in memory at once. ``downcast``
+    stores OHLCV as float32, halving the footprint of the cleaned frame.
+    """
+    path = Path(csv_path)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Could not find price file at {path}. Download the Kaggle CSV into data/."
+        )
+
+    if chunksize is None:
+        with span("data.read_csv"):
+            raw = pd.read_csv(path, usecols=_wanted_column)
+        prices = _clean_chunk(raw, downcast)
+    else:
+        with pd.read_csv(path, usecols=_wanted_column, chunksize=chunksize) as reader:
+            chunks = [_clean_chunk(chunk, downcast) for chunk in reader]
+        if not chunks:
+            chunks = [_clean_chunk(pd.read_csv(path, usecols=_wanted_column, nrows=0), downcast)]
+        prices = pd.concat(chunks, ignore_index=True)
+
+    if not prices["date"].is_monotonic_increasing:
+        prices = prices.sort_values("date", kind="stable")
+    return prices.reset_index(drop=True)
+
+
+@profiled("data.load_panel_prices")
+def load_panel_prices(
+    csv_paths: Mapping[str, str | Path],
+    *,
+    field: str = "close",
+    chunksize: int | None = None,
+    downcast: bool = False,
+) -> pd.DataFrame:
+    """Return a (date x instrument) frame of ``field`` aligned on shared dates.
+
+    Each CSV is loaded with ``load_price_data``; only dates present for every
+    instrument are kept so the panel has no gaps.
+    """
+    if not csv_paths:
+        raise ValueError("At least one instrument is required.")
+    columns = {}
+    for instrument, path in csv_paths.items():
+        prices = load_price_data(path, chunksize=chunksize, downcast=downcast)
+        columns[instrument] = prices.drop_duplicates("date", keep="last").set_index("date")[field]
+    panel = pd.concat(columns, axis=1, join="inner").sort_index()
+    panel.index.name = "date"
+    panel.columns.name = "instrument"
+    return panel
+
+
+@profiled("data.resample_prices")
+def resample_prices(prices: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars to a coarser ``rule`` (pandas offset alias, e.g. ``"1h"``, ``"W"``).
+
+    Buckets without any source bar (weekends, session breaks) are dropped rather
+    than forward-filled.
+    """
+    frame = prices.set_index("date")[list(_OHLCV_AGGREGATIONS)]
+    bars = frame.resample(rule).agg(_OHLCV_AGGREGATIONS)
+    bars = bars.dropna(subset=["close"])
+    return bars.reset_index()
+
+
+@profiled("data.build_feature_frame")
 def build_feature_frame(prices: pd.DataFrame) -> pd.DataFrame:
     """Return a copy of prices with derived columns (daily returns, indicators)."""
     features = prices.copy()
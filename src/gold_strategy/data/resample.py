@@ -0,0 +1,134 @@
+"""Multi-resolution OHLCV cache derived from a single base price series."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Mapping
+
+import pandas as pd
+
+from gold_strategy.backtest.metrics import annualization_factor
+from gold_strategy.data.loaders import build_feature_frame, resample_prices
+from gold_strategy.data.snapshot import read_frames, write_frames
+from gold_strategy.profiling import count, profiled
+
+STANDARD_RESOLUTIONS: Dict[str, str] = {
+    "daily": "1D",
+    "weekly": "W-FRI",
+    "monthly": "ME",
+}
+
+
+class ResampleCache:
+    """Base prices plus OHLCV and feature frames resampled once per resolution.
+
+    Cached frames share the ``load_price_data``/``build_feature_frame`` schema, so
+    they can be handed straight to the signal generators and ``run_backtest``
+    (with ``periods_per_year=cache.periods_per_year(resolution)``).
+    """
+
+    def __init__(
+        self,
+        prices: pd.DataFrame,
+        resolutions: Mapping[str, str] = STANDARD_RESOLUTIONS,
+    ) -> None:
+        self._base = prices.sort_values("date", kind="stable").reset_index(drop=True)
+        self._rules = dict(resolutions)
+        self._prices: Dict[str, pd.DataFrame] = {}
+        self._features: Dict[str, pd.DataFrame] = {}
+        # Row in ``_base`` where the (possibly still open) last bar of each resolution starts.
+        self._tail_start: Dict[str, int] = {}
+        for name in self._rules:
+            self._rebuild_from(name, 0)
+
+    def save(self, path: str | Path) -> None:
+        """Write the base series and every cached resolution to a binary snapshot."""
+        frames = {"base": self._base}
+        for name in self._rules:
+            frames[f"{name}/prices"] = self._prices[name]
+            frames[f"{name}/features"] = self._features[name]
+        write_frames(path, frames, {"rules": self._rules, "tail_start": self._tail_start})
+
+    @classmethod
+    def load(cls, path: str | Path) -> ResampleCache:
+        """Restore a cache written by ``save`` without resampling anything."""
+        frames, meta = read_frames(path)
+        cache = cls.__new__(cls)
+        cache._base = frames["base"]
+        cache._rules = dict(meta["rules"])
+        cache._prices = {name: frames[f"{name}/prices"] for name in cache._rules}
+        cache._features = {name: frames[f"{name}/features"] for name in cache._rules}
+        cache._tail_start = {name: int(row) for name, row in meta["tail_start"].items()}
+        return cache
+
+    @property
+    def base(self) -> pd.DataFrame:
+        return self._base
+
+    @property
+    def resolutions(self) -> list[str]:
+        return list(self._rules)
+
+    def _rule(self, resolution: str) -> str:
+        if resolution not in self._rules:
+            count("cache.miss")
+            raise KeyError(f"Unknown resolution {resolution!r}. Cached: {self.resolutions}")
+        return self._rules[resolution]
+
+    def prices(self, resolution: str) -> pd.DataFrame:
+        """Return OHLCV bars for ``resolution``."""
+        self._rule(resolution)
+        count("cache.hit")
+        return self._prices[resolution]
+
+    def features(self, resolution: str) -> pd.DataFrame:
+        """Return the feature frame (OHLCV + returns) for ``resolution``."""
+        self._rule(resolution)
+        count("cache.hit")
+        return self._features[resolution]
+
+    def periods_per_year(self, resolution: str) -> float:
+        return annualization_factor(self._rule(resolution))
+
+    @profiled("resample_cache.append")
+    def append(self, new_bars: pd.DataFrame) -> None:
+        """Add base bars that arrived after the cached history.
+
+        Only the last (possibly incomplete) bar of each resolution and the buckets
+        covering ``new_bars`` are recomputed; earlier bars are left untouched.
+        """
+        if new_bars.empty:
+            return
+        new_bars = new_bars.sort_values("date", kind="stable")
+        if not self._base.empty and new_bars["date"].iloc[0] <= self._base["date"].iloc[-1]:
+            raise ValueError("New bars must start after the last cached bar.")
+
+        self._base = pd.concat([self._base, new_bars[self._base.columns]], ignore_index=True)
+        for name in self._rules:
+            self._rebuild_from(name, self._tail_start.get(name, 0))
+
+    def _rebuild_from(self, name: str, start_row: int) -> None:
+        rule = self._rules[name]
+        tail = self._base.iloc[start_row:]
+        tail_bars = resample_prices(tail, rule)
+
+        cached = self._prices.get(name)
+        kept = cached.iloc[:-1] if cached is not None and not cached.empty else None
+        if kept is None or kept.empty:
+            bars = tail_bars
+            features = build_feature_frame(tail_bars)
+        else:
+            bars = pd.concat([kept, tail_bars], ignore_index=True)
+            # Seed pct_change with the last untouched bar so returns stay continuous.
+            seeded = build_feature_frame(pd.concat([kept.iloc[-1:], tail_bars]))
+            features = pd.concat(
+                [self._features[name].iloc[: len(kept)], seeded.iloc[1:]], ignore_index=True
+            )
+
+        self._prices[name] = bars
+        self._features[name] = features
+
+        if tail.empty:
+            self._tail_start[name] = start_row
+            return
+        groups = tail.groupby(pd.Grouper(key="date", freq=rule)).ngroup().to_numpy()
+        self._tail_start[name] = start_row + int((groups == groups[-1]).argmax())
@@ -0,0 +1,96 @@
+"""Binary snapshots of price/feature frames for fast cold starts.
+
+Frames are stored column-by-column in one uncompressed ``.npz`` archive (datetimes
+as int64 nanoseconds) together with a JSON metadata blob, so loading is a handful
+of contiguous array reads instead of CSV parsing. Build one ahead of time with::
+
+    python -m gold_strategy.data.snapshot data/Gold_Spot_historical_data.csv
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.profiling import profiled
+
+DEFAULT_SNAPSHOT_PATH = Path("data/gold_snapshot.npz")
+
+_META_KEY = "__meta__"
+
+
+def write_frames(
+    path: str | Path, frames: Dict[str, pd.DataFrame], meta: dict | None = None
+) -> None:
+    """Write ``frames`` (default RangeIndex, column data only) plus ``meta`` to ``path``."""
+    arrays: Dict[str, np.ndarray] = {}
+    layout = {}
+    for name, frame in frames.items():
+        columns = []
+        for column in frame.columns:
+            series = frame[column]
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                utc = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                arrays[f"{name}/{column}"] = utc.to_numpy("datetime64[ns]").view("int64")
+                columns.append([column, "datetime_utc"])
+            else:
+                arrays[f"{name}/{column}"] = series.to_numpy()
+                columns.append([column, str(series.dtype)])
+        layout[name] = columns
+    header = {"frames": layout, "meta": meta or {}}
+    arrays[_META_KEY] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.stem}.{os.getpid()}.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, target)
+
+
+@profiled("data.read_snapshot")
+def read_frames(path: str | Path) -> tuple[Dict[str, pd.DataFrame], dict]:
+    """Inverse of ``write_frames``; returns ``(frames, meta)``."""
+    with np.load(Path(path), allow_pickle=False) as archive:
+        header = json.loads(archive[_META_KEY].tobytes().decode())
+        frames = {}
+        for name, columns in header["frames"].items():
+            data = {}
+            for column, kind in columns:
+                values = archive[f"{name}/{column}"]
+                if kind == "datetime_utc":
+                    data[column] = pd.to_datetime(values, utc=True)
+                else:
+                    data[column] = values
+            frames[name] = pd.DataFrame(data)
+    return frames, header["meta"]
+
+
+def snapshot_is_fresh(snapshot_path: str | Path, source_path: str | Path) -> bool:
+    """True when the snapshot exists and is at least as new as its source CSV."""
+    snapshot, source = Path(snapshot_path), Path(source_path)
+    if not snapshot.exists():
+        return False
+    return not source.exists() or snapshot.stat().st_mtime >= source.stat().st_mtime
+
+
+def main(argv: list[str] | None = None) -> int:
+    from gold_strategy.data.loaders import DEFAULT_DATA_PATH, load_price_data
+    from gold_strategy.data.resample import ResampleCache
+
+    parser = argparse.ArgumentParser(description="Prebuild the app's price/feature snapshot")
+    parser.add_argument("csv_path", nargs="?", default=str(DEFAULT_DATA_PATH))
+    parser.add_argument("--output", default=str(DEFAULT_SNAPSHOT_PATH))
+    args = parser.parse_args(argv)
+
+    ResampleCache(load_price_data(args.csv_path)).save(args.output)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""Declarative indicator specs evaluated in one shared pass.
+
+Strategies declare what they need (``sma("close", 20)``, ``rsi("close", 14)``) and
+``evaluate_indicators`` plans the work so shared intermediates are computed once:
+one prefix sum per source feeds every SMA window, and one ``diff`` with its
+gain/loss split feeds every RSI window.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.profiling import profiled
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    kind: str
+    source: str
+    window: int
+
+    @property
+    def column(self) -> str:
+        if self.source == "close":
+            return f"{self.kind}_{self.window}"
+        return f"{self.kind}_{self.source}_{self.window}"
+
+
+def sma(source: str, window: int) -> IndicatorSpec:
+    if window <= 0:
+        raise ValueError("window must be positive")
+    return IndicatorSpec("sma", source, int(window))
+
+
+def rsi(source: str, window: int) -> IndicatorSpec:
+    if window <= 1:
+        raise ValueError("window must be > 1")
+    return IndicatorSpec("rsi", source, int(window))
+
+
+def _evaluate_sma(values: np.ndarray, windows: Iterable[int]) -> Dict[int, np.ndarray]:
+    valid = ~np.isnan(values)
+    # Centre on the first observation so the running sum stays small and precise.
+    offset = values[valid][0] if valid.any() else 0.0
+    centred = np.where(valid, values - offset, 0.0)
+    sums = np.concatenate([[0.0], np.cumsum(centred)])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+
+    out = {}
+    for window in windows:
+        result = np.full(len(values), np.nan)
+        if window <= len(values):
+            window_sum = sums[window:] - sums[:-window]
+            window_count = counts[window:] - counts[:-window]
+            means = window_sum / window + offset
+            result[window - 1 :] = np.where(window_count == window, means, np.nan)
+        out[window] = result
+    return out
+
+
+def _evaluate_rsi(series: pd.Series, windows: Iterable[int]) -> Dict[int, np.ndarray]:
+    delta = series.diff()
+    moves = pd.DataFrame({"gain": delta.clip(lower=0), "loss": -delta.clip(upper=0)})
+
+    out = {}
+    for window in windows:
+        averages = moves.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = averages["gain"].to_numpy() / averages["loss"].to_numpy()
+            values = 100 - (100 / (1 + rs))
+        out[window] = np.nan_to_num(values, nan=0.0)
+    return out
+
+
+@profiled("indicators.evaluate")
+def evaluate_indicators(frame: pd.DataFrame, specs: Iterable[IndicatorSpec]) -> pd.DataFrame:
+    """Evaluate ``specs`` against ``frame`` into a column store keyed by ``spec.column``.
+
+    Duplicate specs are evaluated once. Results match ``simple_moving_average`` and
+    ``relative_strength_index`` and share ``frame``'s index.
+    """
+    unique = list(dict.fromkeys(specs))
+    windows_by_node: Dict[tuple[str, str], list[int]] = {}
+    for spec in unique:
+        if spec.kind not in ("sma", "rsi"):
+            raise ValueError(f"Unknown indicator kind: {spec.kind}")
+        windows_by_node.setdefault((spec.kind, spec.source), []).append(spec.window)
+
+    computed: Dict[IndicatorSpec, np.ndarray] = {}
+    for (kind, source), windows in windows_by_node.items():
+        series = frame[source].astype(float)
+        if kind == "sma":
+            results = _evaluate_sma(series.to_numpy(), windows)
+        else:
+            results = _evaluate_rsi(series, windows)
+        for window, values in results.items():
+            computed[IndicatorSpec(kind, source, window)] = values
+
+    return pd.DataFrame({spec.column: computed[spec] for spec in unique}, index=frame.index)
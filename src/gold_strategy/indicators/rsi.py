@@ -4,7 +4,9 @@ from __future__ import annotations
 import pandas as pd
 
 
-def relative_strength_index(series: pd.Series, window: int = 14) -> pd.Series:
+def relative_strength_index(
+    series: pd.Series | pd.DataFrame, window: int = 14
+) -> pd.Series | pd.DataFrame:
     if window <= 1:
         raise ValueError("window must be > 1")
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 import pandas as pd
 
 
-def simple_moving_average(series: pd.Series, window: int) -> pd.Series:
+def simple_moving_average(
+    series: pd.Series | pd.DataFrame, window: int
+) -> pd.Series | pd.DataFrame:
     if window <= 0:
         raise ValueError("window must be positive")
     return series.rolling(window=window, min_periods=window).mean()
@@ -0,0 +1,226 @@
+"""Opt-in stage timing, allocation spans and counters.
+
+Library code marks stages with ``span("engine.align")`` blocks, ``@profiled``
+decorators and ``count("backtests")`` calls. While no profiler is active these are
+a context-variable lookup plus a shared no-op context, so instrumentation can stay in hot
+paths. Activate collection with ``with profile() as profiler:`` (or ``enable()`` /
+``disable()``) and export via ``to_json`` or ``to_chrome_trace``.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, TypeVar
+
+import pandas as pd
+
+F = TypeVar("F", bound=Callable)
+
+_NULL_SPAN: ContextManager[None] = contextlib.nullcontext()
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+    alloc_bytes: int | None = None
+
+
+class Profiler:
+    """Collects span timings (and optionally net allocations) plus named counters."""
+
+    def __init__(self, *, track_allocations: bool = False) -> None:
+        self.track_allocations = track_allocations
+        self.spans: list[SpanRecord] = []
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._stopped: float | None = None
+        self._started_tracemalloc = False
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        alloc_before = tracemalloc.get_traced_memory()[0] if self.track_allocations else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            alloc = None
+            if alloc_before is not None:
+                alloc = tracemalloc.get_traced_memory()[0] - alloc_before
+            record = SpanRecord(name, start - self._origin, duration, threading.get_ident(), alloc)
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def stop(self) -> None:
+        if self._stopped is None:
+            self._stopped = time.perf_counter()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @property
+    def elapsed(self) -> float:
+        end = self._stopped if self._stopped is not None else time.perf_counter()
+        return end - self._origin
+
+    def summary(self) -> pd.DataFrame:
+        """Per-span totals sorted by total time (seconds), then one row per counter.
+
+        Counter rows (e.g. ``cache.hit``) only fill ``calls``, with the count.
+        """
+        columns = ["calls", "total_s", "mean_ms", "max_ms", "share"]
+        if self.track_allocations:
+            columns.append("alloc_mb")
+        counters = pd.DataFrame(float("nan"), index=list(self.counters), columns=columns)
+        counters["calls"] = list(self.counters.values())
+        if not self.spans:
+            return counters if self.counters else pd.DataFrame(columns=columns)
+        frame = pd.DataFrame([asdict(span) for span in self.spans])
+        grouped = frame.groupby("name")
+        table = pd.DataFrame(
+            {
+                "calls": grouped.size(),
+                "total_s": grouped["duration"].sum(),
+                "mean_ms": grouped["duration"].mean() * 1_000,
+                "max_ms": grouped["duration"].max() * 1_000,
+            }
+        )
+        table["share"] = table["total_s"] / max(self.elapsed, 1e-12)
+        if self.track_allocations:
+            table["alloc_mb"] = grouped["alloc_bytes"].sum() / 1e6
+        table = table[columns].sort_values("total_s", ascending=False)
+        return pd.concat([table, counters]) if self.counters else table
+
+    def rates(self) -> Dict[str, float]:
+        """Counters per second of profiled wall time (e.g. backtests per second)."""
+        elapsed = max(self.elapsed, 1e-12)
+        return {name: value / elapsed for name, value in self.counters.items()}
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed_s": self.elapsed,
+            "counters": dict(self.counters),
+            "rates_per_s": self.rates(),
+            "spans": [asdict(span) for span in self.spans],
+        }
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def to_chrome_trace(self, path: str | Path | None = None) -> dict:
+        """Return (and optionally write) a ``chrome://tracing`` / Perfetto document."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {} if span.alloc_bytes is None else {"alloc_bytes": span.alloc_bytes},
+            }
+            for span in self.spans
+        ]
+        events.extend(
+            {"name": name, "ph": "C", "ts": self.elapsed * 1e6, "pid": pid, "args": {name: value}}
+            for name, value in self.counters.items()
+        )
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            Path(path).write_text(json.dumps(trace))
+        return trace
+
+
+# Per context rather than per process: each Streamlit session (and each thread)
+# sees only the profiler it activated. New threads start without one.
+_active: contextvars.ContextVar[Profiler | None] = contextvars.ContextVar(
+    "gold_strategy_profiler", default=None
+)
+
+
+def active_profiler() -> Profiler | None:
+    return _active.get()
+
+
+def enable(*, track_allocations: bool = False) -> Profiler:
+    """Start a fresh profiler in the current context, replacing any active one."""
+    previous = _active.get()
+    if previous is not None:
+        previous.stop()
+    profiler = Profiler(track_allocations=track_allocations)
+    _active.set(profiler)
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """Stop collection and return the profiler that was active, if any."""
+    profiler = _active.get()
+    _active.set(None)
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+@contextlib.contextmanager
+def profile(*, track_allocations: bool = False) -> Iterator[Profiler]:
+    profiler = Profiler(track_allocations=track_allocations)
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active.reset(token)
+
+
+def span(name: str) -> ContextManager[None]:
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator recording each call of the wrapped function as span ``name``."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,545 @@
+"""Local HTTP/JSON backtest service over one warm in-memory price store.
+
+Start it from the repository root::
+
+    python -m gold_strategy.service [--port 8765] [--workers 2] [--max-pending 16]
+
+Endpoints (JSON bodies, JSON responses)::
+
+    POST /backtest       {"strategy": "sma", "parameters": {...}, ...}
+    POST /sweep          {"short_windows": [...], "long_windows": [...], ...}
+    POST /walk-forward   {"strategy": "rsi", "parameters": {...}, "train_end": "2015-01-01"}
+    GET  /health         store size and request counters
+
+Every POST also accepts ``resolution`` (daily/weekly/monthly), ``start``/``end``
+dates and ``transaction_cost_bps``/``slippage_bps``/``initial_capital``.
+
+Prices and features are resampled once at startup (``ResampleCache``) and date
+slices are memoized, along with the SMA/RSI columns ``/backtest`` computes on
+each slice, so a new parameter set only evaluates windows not seen before on
+that slice. Identical requests that arrive while one is computing share
+its result, finished results sit in an LRU cache, and computations run on a
+bounded thread pool: once ``max_pending`` distinct requests are queued or
+running, new ones get ``503`` with ``Retry-After`` instead of piling up. The
+``X-Cache`` response header reports ``hit``, ``coalesced`` or ``miss``. Cache keys
+are built after resolving defaults and types, so ``{}`` and the same request with
+every default spelled out share one entry. Sweeps above ``max_sweep_pairs``
+parameter pairs are refused with ``400``.
+"""
+from __future__ import annotations
+
+import argparse
+import contextvars
+import json
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep, sma_parameter_pairs
+from gold_strategy.backtest.walk_forward import run_walk_forward
+from gold_strategy.data.loaders import DEFAULT_DATA_PATH, load_price_data
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.data.snapshot import DEFAULT_SNAPSHOT_PATH, snapshot_is_fresh
+from gold_strategy.indicators.graph import IndicatorSpec, evaluate_indicators
+from gold_strategy.profiling import count
+from gold_strategy.strategies.rsi_mean_reversion import (
+    generate_rsi_mean_reversion_signals,
+    rsi_mean_reversion_indicators,
+)
+from gold_strategy.strategies.sma_crossover import (
+    generate_sma_crossover_signals,
+    sma_crossover_indicators,
+)
+
+_DEFAULT_PARAMETERS = {
+    "sma": {"short_window": 20, "long_window": 50},
+    "rsi": {"window": 14, "oversold": 30.0, "overbought": 70.0},
+}
+_PARAMETER_TYPES: Dict[str, Callable[[Any], Any]] = {
+    "short_window": int,
+    "long_window": int,
+    "window": int,
+    "oversold": float,
+    "overbought": float,
+}
+# Date slices (and the indicator columns computed on them) kept warm per
+# (resolution, start, end).
+_SLICE_CACHE_SIZE = 32
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the worker pool already holds ``max_pending`` requests."""
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "item"):  # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _timestamp(value: str | None) -> pd.Timestamp | None:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _iso(value: str | None) -> str | None:
+    ts = _timestamp(value)
+    return None if ts is None else ts.isoformat()
+
+
+def _curve(series: pd.Series) -> dict[str, list]:
+    return {
+        "dates": [ts.isoformat() for ts in series.index],
+        "values": [float(v) for v in series.to_numpy()],
+    }
+
+
+class BacktestService:
+    """Request handling independent of the HTTP layer (also usable in-process).
+
+    ``submit(endpoint, params)`` returns a ``Future`` with the JSON-ready result
+    and how it was served (``"hit"``, ``"coalesced"`` or ``"miss"``).
+    """
+
+    def __init__(
+        self,
+        cache: ResampleCache,
+        *,
+        workers: int = 2,
+        max_pending: int = 16,
+        cache_size: int = 128,
+        max_sweep_pairs: int = 2_000,
+    ) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be positive")
+        self.cache = cache
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.max_sweep_pairs = max_sweep_pairs
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backtest")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._results: OrderedDict[str, Any] = OrderedDict()
+        # (prices, features, indicator columns keyed by ``IndicatorSpec.column``) per slice;
+        # the indicator memo lives and is evicted with its slice.
+        self._slices: OrderedDict[
+            tuple, tuple[pd.DataFrame, pd.DataFrame, Dict[str, np.ndarray]]
+        ] = OrderedDict()
+        self.stats = {
+            "requests": 0,
+            "hits": 0,
+            "coalesced": 0,
+            "computed": 0,
+            "rejected": 0,
+            "slice_hits": 0,
+            "slice_misses": 0,
+            "indicator_hits": 0,
+            "indicator_misses": 0,
+        }
+        self.endpoints: Dict[str, Callable[[dict], Any]] = {
+            "backtest": self._backtest,
+            "sweep": self._sweep,
+            "walk-forward": self._walk_forward,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, endpoint: str, params: dict) -> tuple[Future, str]:
+        """Schedule (or join, or answer from cache) one request.
+
+        Raises ``ValueError`` for requests that fail validation (e.g. an unknown
+        strategy or an oversized sweep) before they take a worker slot.
+        """
+        if endpoint not in self.endpoints:
+            raise KeyError(endpoint)
+        with self._lock:
+            self.stats["requests"] += 1
+        normalized = self._normalize(endpoint, params)
+        key = f"{endpoint}:{json.dumps(normalized, sort_keys=True, default=str)}"
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.stats["hits"] += 1
+                count("cache.hit")
+                done: Future = Future()
+                done.set_result(self._results[key])
+                return done, "hit"
+            if key in self._inflight:
+                self.stats["coalesced"] += 1
+                return self._inflight[key], "coalesced"
+            if len(self._inflight) >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise ServiceBusy(f"{len(self._inflight)} requests already pending")
+            count("cache.miss")
+            # The worker runs in the caller's context, so an active profiler sees its spans.
+            future = self._executor.submit(
+                contextvars.copy_context().run,
+                self._compute,
+                key,
+                self.endpoints[endpoint],
+                params,
+            )
+            self._inflight[key] = future
+            self.stats["computed"] += 1
+        future.add_done_callback(lambda _: self._release(key))
+        return future, "miss"
+
+    def _compute(self, key: str, handler: Callable[[dict], Any], params: dict) -> Any:
+        result = handler(params)
+        # Cached before the future resolves, so a repeat request never recomputes.
+        with self._lock:
+            if self.cache_size > 0:
+                self._results[key] = result
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return result
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def health(self) -> dict:
+        with self._lock:
+            pending = len(self._inflight)
+            cached = len(self._results)
+            stats = dict(self.stats)
+        return {
+            "status": "ok",
+            "bars": len(self.cache.base),
+            "resolutions": self.cache.resolutions,
+            "pending": pending,
+            "max_pending": self.max_pending,
+            "cached_results": cached,
+            "stats": stats,
+        }
+
+    @staticmethod
+    def _slice_key(params: dict) -> tuple:
+        resolution = str(params.get("resolution", "daily"))
+        return (resolution, _iso(params.get("start")), _iso(params.get("end")))
+
+    def _normalize(self, endpoint: str, params: dict) -> dict:
+        """``params`` with defaults resolved and types fixed, for the cache key."""
+        resolution, start, end = self._slice_key(params)
+        normalized = {
+            **params,
+            "resolution": resolution,
+            "start": start,
+            "end": end,
+            **self._costs(params),
+        }
+        if endpoint in ("backtest", "walk-forward"):
+            normalized["strategy"], normalized["parameters"] = self._strategy(params)
+        if endpoint == "backtest":
+            normalized["include_curve"] = bool(params.get("include_curve", False))
+        elif endpoint == "sweep":
+            normalized.update(self._sweep_grid(params))
+        elif endpoint == "walk-forward":
+            if "train_end" not in params:
+                raise ValueError("train_end is required")
+            normalized["train_end"] = _iso(params["train_end"])
+        return normalized
+
+    def _frames(self, params: dict) -> tuple[pd.DataFrame, pd.DataFrame, float]:
+        key = self._slice_key(params)
+        resolution = key[0]
+        periods_per_year = self.cache.periods_per_year(resolution)
+        with self._lock:
+            if key in self._slices:
+                self._slices.move_to_end(key)
+                self.stats["slice_hits"] += 1
+                count("cache.hit")
+                prices, features, _ = self._slices[key]
+                return prices, features, periods_per_year
+            self.stats["slice_misses"] += 1
+            count("cache.miss")
+
+        prices = self.cache.prices(resolution)
+        features = self.cache.features(resolution)
+        start, end = _timestamp(key[1]), _timestamp(key[2])
+        mask = pd.Series(True, index=prices.index)
+        if start is not None:
+            mask &= prices["date"] >= start
+        if end is not None:
+            mask &= prices["date"] <= end
+        if not mask.any():
+            raise ValueError("No data for selected range")
+        prices = prices.loc[mask].reset_index(drop=True)
+        features = features.loc[mask].reset_index(drop=True)
+        with self._lock:
+            self._slices[key] = (prices, features, {})
+            while len(self._slices) > _SLICE_CACHE_SIZE:
+                self._slices.popitem(last=False)
+        return prices, features, periods_per_year
+
+    def _indicator_store(
+        self, params: dict, features: pd.DataFrame, specs: list[IndicatorSpec]
+    ) -> pd.DataFrame:
+        """Indicator columns for ``specs`` on this slice, computing only the missing ones.
+
+        Columns are only memoized while the slice is cached: a request still running
+        on an evicted slice computes what it needs without storing it.
+        """
+        key = self._slice_key(params)
+        with self._lock:
+            entry = self._slices.get(key)
+            columns = entry[2] if entry is not None else {}
+            missing = [spec for spec in specs if spec.column not in columns]
+            self.stats["indicator_hits"] += len(specs) - len(missing)
+            self.stats["indicator_misses"] += len(missing)
+            count("cache.hit", len(specs) - len(missing))
+            count("cache.miss", len(missing))
+            known = {spec.column: columns[spec.column] for spec in specs if spec not in missing}
+        if missing:
+            computed = evaluate_indicators(features, missing)
+            fresh = {column: computed[column].to_numpy() for column in computed.columns}
+            with self._lock:
+                entry = self._slices.get(key)
+                if entry is not None:
+                    entry[2].update(fresh)
+            known.update(fresh)
+        return pd.DataFrame(known, index=features.index)
+
+    @staticmethod
+    def _strategy(params: dict) -> tuple[str, dict]:
+        strategy = params.get("strategy", "sma")
+        if strategy not in _DEFAULT_PARAMETERS:
+            raise ValueError(f"strategy must be one of {sorted(_DEFAULT_PARAMETERS)}")
+        parameters = {**_DEFAULT_PARAMETERS[strategy], **params.get("parameters", {})}
+        return strategy, {
+            name: _PARAMETER_TYPES.get(name, lambda value: value)(value)
+            for name, value in parameters.items()
+        }
+
+    def _sweep_grid(self, params: dict) -> dict:
+        if "short_windows" not in params or "long_windows" not in params:
+            raise ValueError("short_windows and long_windows are required")
+        grid = {
+            "short_windows": sorted({int(w) for w in params["short_windows"]}),
+            "long_windows": sorted({int(w) for w in params["long_windows"]}),
+            "lean": bool(params.get("lean", False)),
+        }
+        n_pairs = len(sma_parameter_pairs(grid["short_windows"], grid["long_windows"]))
+        if n_pairs > self.max_sweep_pairs:
+            raise ValueError(
+                f"Sweep has {n_pairs} parameter pairs; this service accepts at most "
+                f"{self.max_sweep_pairs}"
+            )
+        return grid
+
+    @staticmethod
+    def _costs(params: dict) -> dict[str, float]:
+        return {
+            "transaction_cost_bps": float(params.get("transaction_cost_bps", 0.0)),
+            "slippage_bps": float(params.get("slippage_bps", 0.0)),
+            "initial_capital": float(params.get("initial_capital", 1.0)),
+        }
+
+    def _backtest(self, params: dict) -> dict:
+        prices, features, periods_per_year = self._frames(params)
+        strategy, parameters = self._strategy(params)
+        if strategy == "sma":
+            short, long = int(parameters["short_window"]), int(parameters["long_window"])
+            indicators = self._indicator_store(
+                params, features, sma_crossover_indicators(short, long)
+            )
+            enriched, signals = generate_sma_crossover_signals(
+                features, short, long, indicators=indicators
+            )
+        else:
+            window = int(parameters["window"])
+            indicators = self._indicator_store(
+                params, features, rsi_mean_reversion_indicators(window)
+            )
+            enriched, signals = generate_rsi_mean_reversion_signals(
+                features,
+                window,
+                float(parameters["oversold"]),
+                float(parameters["overbought"]),
+                indicators=indicators,
+            )
+        result = run_backtest(
+            prices, enriched, signals, periods_per_year=periods_per_year, **self._costs(params)
+        )
+        payload = {"strategy": strategy, "parameters": parameters, "metrics": result.metrics}
+        if params.get("include_curve"):
+            payload["equity_curve"] = _curve(result.equity_curve)
+        return _jsonable(payload)
+
+    def _sweep(self, params: dict) -> dict:
+        grid = self._sweep_grid(params)
+        prices, features, periods_per_year = self._frames(params)
+        table = run_sma_parameter_sweep(
+            prices,
+            features,
+            periods_per_year=periods_per_year,
+            **grid,
+            **self._costs(params),
+        )
+        return _jsonable({"results": table.to_dict(orient="records")})
+
+    def _walk_forward(self, params: dict) -> dict:
+        prices, features, periods_per_year = self._frames(params)
+        strategy, parameters = self._strategy(params)
+        if "train_end" not in params:
+            raise ValueError("train_end is required")
+        result = run_walk_forward(
+            prices,
+            features,
+            parameters,
+            train_end=_timestamp(params["train_end"]),
+            strategy=strategy,
+            periods_per_year=periods_per_year,
+            **self._costs(params),
+        )
+        return _jsonable(
+            {
+                "strategy": strategy,
+                "parameters": parameters,
+                "train": result.train.metrics,
+                "test": result.test.metrics,
+            }
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: BacktestServer
+
+    def _send(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        endpoint = self.path.strip("/")
+        if endpoint not in self.server.service.endpoints:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as exc:
+            self._send(400, {"error": f"Invalid JSON body: {exc}"})
+            return
+
+        try:
+            future, source = self.server.service.submit(endpoint, params)
+        except ServiceBusy as exc:
+            self._send(503, {"error": str(exc)}, {"Retry-After": "1"})
+            return
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        try:
+            result = future.result(timeout=self.server.request_timeout)
+        except FutureTimeout:
+            self._send(504, {"error": "Request timed out; it keeps running and will be cached"})
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send(400, {"error": str(exc)})
+        except Exception as exc:  # noqa: BLE001 - report, keep serving
+            self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+        else:
+            self._send(200, result, {"X-Cache": source})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class BacktestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: BacktestService,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        *,
+        request_timeout: float = 300.0,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.service = service
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def load_price_cache(
+    csv_path: str | Path = DEFAULT_DATA_PATH, snapshot_path: str | Path = DEFAULT_SNAPSHOT_PATH
+) -> ResampleCache:
+    """Warm store from the snapshot when it is fresh, else from the CSV."""
+    if snapshot_is_fresh(snapshot_path, csv_path):
+        return ResampleCache.load(snapshot_path)
+    return ResampleCache(load_price_data(csv_path))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local backtest service")
+    parser.add_argument("--csv", default=str(DEFAULT_DATA_PATH))
+    parser.add_argument("--snapshot", default=str(DEFAULT_SNAPSHOT_PATH))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=16)
+    parser.add_argument("--cache-size", type=int, default=128)
+    parser.add_argument("--max-sweep-pairs", type=int, default=2_000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    service = BacktestService(
+        load_price_cache(args.csv, args.snapshot),
+        workers=args.workers,
+        max_pending=args.max_pending,
+        cache_size=args.cache_size,
+        max_sweep_pairs=args.max_sweep_pairs,
+    )
+    server = BacktestServer(service, args.host, args.port, verbose=args.verbose)
+    print(f"Serving {len(service.cache.base)} bars on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
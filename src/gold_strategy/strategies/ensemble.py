@@ -0,0 +1,221 @@
+"""Strategy ensembles: shared-indicator component signals and batched blends.
+
+Component strategies are declared as ``StrategySpec`` values. Their indicators are
+evaluated together in one ``evaluate_indicators`` pass, giving a (time x component)
+0/1 signal matrix. Blends are then plain matrix operations on that matrix:
+
+* ``"and"`` / ``"or"``: long when all / any components are long.
+* vote thresholds: long when at least that fraction of components is long.
+* weightings: each row of a (blend x component) weight matrix gives a fractional
+  position ``signals @ weights.T`` normalized by the row sum.
+
+Every blend becomes a column of one position matrix and is backtested in a single
+``backtest_matrix`` call.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gold_strategy.backtest.engine import ensure_datetime_index
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, summarize_metrics_matrix
+from gold_strategy.backtest.panel import backtest_matrix, simple_returns_matrix
+from gold_strategy.indicators.graph import IndicatorSpec, evaluate_indicators
+from gold_strategy.profiling import count, profiled
+from gold_strategy.strategies.rsi_mean_reversion import (
+    rsi_mean_reversion_indicators,
+    threshold_state,
+)
+from gold_strategy.strategies.sma_crossover import crossover_state, sma_crossover_indicators
+
+COMBINATION_RULES = ("and", "or")
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    kind: str
+    params: Dict[str, float] = field(default_factory=dict, hash=False)
+
+    @classmethod
+    def sma(cls, short_window: int = 20, long_window: int = 50) -> StrategySpec:
+        if short_window >= long_window:
+            raise ValueError("short_window must be less than long_window")
+        return cls("sma", {"short_window": int(short_window), "long_window": int(long_window)})
+
+    @classmethod
+    def rsi(
+        cls, window: int = 14, oversold: float = 30.0, overbought: float = 70.0
+    ) -> StrategySpec:
+        if oversold >= overbought:
+            raise ValueError("oversold threshold must be below overbought")
+        return cls(
+            "rsi",
+            {"window": int(window), "oversold": float(oversold), "overbought": float(overbought)},
+        )
+
+    @property
+    def label(self) -> str:
+        if self.kind == "sma":
+            return f"SMA {self.params['short_window']}/{self.params['long_window']}"
+        if self.kind == "rsi":
+            p = self.params
+            return f"RSI {p['window']} ({p['oversold']:g}/{p['overbought']:g})"
+        raise ValueError(f"Unknown strategy kind: {self.kind}")
+
+    def indicators(self) -> list[IndicatorSpec]:
+        if self.kind == "sma":
+            return sma_crossover_indicators(self.params["short_window"], self.params["long_window"])
+        if self.kind == "rsi":
+            return rsi_mean_reversion_indicators(self.params["window"])
+        raise ValueError(f"Unknown strategy kind: {self.kind}")
+
+
+@profiled("ensemble.component_signals")
+def generate_component_signals(
+    features: pd.DataFrame, specs: Sequence[StrategySpec]
+) -> pd.DataFrame:
+    """Return (date x component) 0/1 signals from one shared indicator pass."""
+    if not specs:
+        raise ValueError("At least one component strategy is required.")
+    labels = [spec.label for spec in specs]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate component strategies: {', '.join(duplicates)}")
+    store = evaluate_indicators(features, [ind for spec in specs for ind in spec.indicators()])
+
+    columns = {}
+    for spec in specs:
+        p = spec.params
+        if spec.kind == "sma":
+            columns[spec.label] = crossover_state(
+                store[f"sma_{p['short_window']}"].to_numpy(),
+                store[f"sma_{p['long_window']}"].to_numpy(),
+            )
+        else:
+            columns[spec.label] = threshold_state(
+                store[f"rsi_{p['window']}"].to_numpy(), p["oversold"], p["overbought"]
+            )
+
+    signals = pd.DataFrame(columns, index=features.index)
+    if "date" in features.columns:
+        signals.index = pd.DatetimeIndex(pd.to_datetime(features["date"], utc=True), name="date")
+    return signals
+
+
+def weight_grid(n_components: int, steps: int = 4) -> np.ndarray:
+    """All non-negative weightings on a 1/``steps`` lattice that sum to one."""
+    if n_components <= 0 or steps <= 0:
+        raise ValueError("n_components and steps must be positive")
+    lattice = product(range(steps + 1), repeat=n_components)
+    rows = [combo for combo in lattice if sum(combo) == steps]
+    return np.array(rows, dtype=float) / steps
+
+
+def blend_matrix(
+    components: np.ndarray,
+    *,
+    rules: Sequence[str] = COMBINATION_RULES,
+    vote_thresholds: Sequence[float] = (),
+    weights: np.ndarray | None = None,
+) -> tuple[np.ndarray, list[dict]]:
+    """Return (time x blend) positions and one descriptor per blend column."""
+    components = np.asarray(components, dtype=float)
+    n_components = components.shape[1]
+    blocks: list[np.ndarray] = []
+    labels: list[dict] = []
+
+    for rule in rules:
+        if rule not in COMBINATION_RULES:
+            raise ValueError(f"rule must be one of {COMBINATION_RULES}")
+        combined = components.min(axis=1) if rule == "and" else components.max(axis=1)
+        blocks.append(combined[:, None])
+        labels.append({"rule": rule, "parameter": ""})
+
+    if vote_thresholds:
+        share_long = components.mean(axis=1)
+        thresholds = np.asarray(vote_thresholds, dtype=float)
+        blocks.append((share_long[:, None] >= thresholds[None, :] - 1e-12).astype(float))
+        labels.extend({"rule": "vote", "parameter": f"{t:g}"} for t in thresholds)
+
+    if weights is not None:
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        if weights.shape[1] != n_components:
+            raise ValueError(f"weights need {n_components} columns, got {weights.shape[1]}")
+        totals = weights.sum(axis=1)
+        if (totals <= 0).any():
+            raise ValueError("each weighting must have a positive sum")
+        blocks.append(components @ (weights / totals[:, None]).T)
+        labels.extend(
+            {"rule": "weighted", "parameter": "/".join(f"{w:g}" for w in row)} for row in weights
+        )
+
+    if not blocks:
+        return np.zeros((len(components), 0)), []
+    return np.hstack(blocks), labels
+
+
+@profiled("ensemble.evaluate")
+def evaluate_ensembles(
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    specs: Sequence[StrategySpec],
+    *,
+    rules: Sequence[str] = COMBINATION_RULES,
+    vote_thresholds: Sequence[float] = (0.5,),
+    weights: np.ndarray | None = None,
+    transaction_cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+) -> pd.DataFrame:
+    """Backtest every requested blend of ``specs`` in one batched matrix run.
+
+    Returns one row per blend (``rule``, ``parameter``) with the standard metrics.
+    Components are included as single-strategy baselines.
+    """
+    price_frame = ensure_datetime_index(prices.copy())
+    components = generate_component_signals(features, specs)
+    components = components.reindex(price_frame.index).fillna(0.0)
+
+    positions, labels = blend_matrix(
+        components.to_numpy(), rules=rules, vote_thresholds=vote_thresholds, weights=weights
+    )
+    baseline_labels = [{"rule": "component", "parameter": label} for label in components.columns]
+    positions = np.hstack([components.to_numpy(), positions])
+    labels = baseline_labels + labels
+    count("ensemble.blends", len(labels))
+
+    asset_returns = simple_returns_matrix(price_frame["close"].to_numpy())
+    _, _, strategy_returns = backtest_matrix(
+        asset_returns, positions, transaction_cost_bps + slippage_bps
+    )
+
+    table = pd.DataFrame(labels)
+    for name, values in summarize_metrics_matrix(strategy_returns, periods_per_year).items():
+        table[name] = values
+    table["exposure"] = positions.mean(axis=0) if len(positions) else 0.0
+    return table
+
+
+def blend_signals(
+    features: pd.DataFrame,
+    specs: Sequence[StrategySpec],
+    *,
+    rule: str = "vote",
+    threshold: float = 0.5,
+    weights: Sequence[float] | None = None,
+) -> pd.Series:
+    """Single blended signal series, ready for ``run_backtest``."""
+    components = generate_component_signals(features, specs)
+    if rule == "vote":
+        positions, _ = blend_matrix(components.to_numpy(), rules=(), vote_thresholds=[threshold])
+    elif rule == "weighted":
+        if weights is None:
+            weights = np.ones(len(specs))
+        positions, _ = blend_matrix(components.to_numpy(), rules=(), weights=np.array([weights]))
+    else:
+        positions, _ = blend_matrix(components.to_numpy(), rules=(rule,))
+    return pd.Series(positions[:, 0], index=components.index, name="signal")
@@ -1,32 +1,48 @@
 """RSI mean reversion strategy."""
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from gold_strategy.indicators.graph import IndicatorSpec, rsi
 from gold_strategy.indicators.rsi import relative_strength_index
+from gold_strategy.profiling import profiled, span
 
 
+def rsi_mean_reversion_indicators(window: int) -> list[IndicatorSpec]:
+    """Indicators ``generate_rsi_mean_reversion_signals`` reads for one window."""
+    return [rsi("close", window)]
+
+
+@profiled("strategy.rsi_mean_reversion")
 def generate_rsi_mean_reversion_signals(
     features: pd.DataFrame,
     window: int = 14,
     oversold: float = 30.0,
     overbought: float = 70.0,
+    *,
+    indicators: pd.DataFrame | None = None,
 ) -> tuple[pd.DataFrame, pd.Series]:
     if oversold >= overbought:
         raise ValueError("oversold threshold must be below overbought")
 
     enriched = features.copy()
     rsi_col = f"rsi_{window}"
-    enriched[rsi_col] = relative_strength_index(enriched["close"], window)
+    if indicators is not None:
+        enriched[rsi_col] = indicators[rsi_col].to_numpy()
+    else:
+        with span("strategy.rsi_mean_reversion.indicators"):
+            enriched[rsi_col] = relative_strength_index(enriched["close"], window)
 
     signals = pd.Series(0.0, index=enriched.index, dtype=float)
     in_position = False
-    for idx, row in enriched.iterrows():
-        if row[rsi_col] <= oversold:
-            in_position = True
-        elif row[rsi_col] >= overbought:
-            in_position = False
-        signals.loc[idx] = 1.0 if in_position else 0.0
+    with span("strategy.rsi_mean_reversion.loop"):
+        for idx, row in enriched.iterrows():
+            if row[rsi_col] <= oversold:
+                in_position = True
+            elif row[rsi_col] >= overbought:
+                in_position = False
+            signals.loc[idx] = 1.0 if in_position else 0.0
 
     if "date" in enriched.columns:
         signals.index = pd.to_datetime(enriched["date"], utc=True)
@@ -34,3 +50,31 @@ def generate_rsi_mean_reversion_signals(
 
     enriched["signal"] = signals.values
     return enriched, signals
+
+
+@profiled("strategy.rsi_mean_reversion_panel")
+def generate_rsi_mean_reversion_panel_signals(
+    closes: pd.DataFrame,
+    window: int = 14,
+    oversold: float = 30.0,
+    overbought: float = 70.0,
+) -> pd.DataFrame:
+    """Return (date x instrument) signals with the same enter/exit rules as above.
+
+    The in-position state is carried forward with ``ffill`` instead of a row loop:
+    oversold bars mark entries, overbought bars mark exits, everything else holds.
+    """
+    if oversold >= overbought:
+        raise ValueError("oversold threshold must be below overbought")
+
+    rsi = relative_strength_index(closes, window)
+    state = threshold_state(rsi.to_numpy(), oversold, overbought)
+    return pd.DataFrame(state, index=closes.index, columns=closes.columns)
+
+
+def threshold_state(rsi: np.ndarray, oversold: float, overbought: float) -> np.ndarray:
+    """In-position state along axis 0: enter at ``oversold``, exit at ``overbought``."""
+    rsi = np.asarray(rsi, dtype=float)
+    marks = np.where(rsi <= oversold, 1.0, np.where(rsi >= overbought, 0.0, np.nan))
+    held = pd.DataFrame(marks.reshape(len(marks), -1)).ffill().fillna(0.0).to_numpy()
+    return held.reshape(rsi.shape)
@@ -1,17 +1,32 @@
 """SMA crossover strategy utilities."""
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from gold_strategy.indicators.graph import IndicatorSpec, sma
 from gold_strategy.indicators.sma import simple_moving_average
+from gold_strategy.profiling import profiled, span
 
 
+def sma_crossover_indicators(short_window: int, long_window: int) -> list[IndicatorSpec]:
+    """Indicators ``generate_sma_crossover_signals`` reads for one parameter pair."""
+    return [sma("close", short_window), sma("close", long_window)]
+
+
+@profiled("strategy.sma_crossover")
 def generate_sma_crossover_signals(
     features: pd.DataFrame,
     short_window: int = 20,
     long_window: int = 50,
+    *,
+    indicators: pd.DataFrame | None = None,
 ) -> tuple[pd.DataFrame, pd.Series]:
-    """Return enriched feature frame and raw signals (1 long, 0 flat)."""
+    """Return enriched feature frame and raw signals (1 long, 0 flat).
+
+    ``indicators`` may hold precomputed ``sma_<window>`` columns (see
+    ``evaluate_indicators``) aligned row-for-row with ``features``.
+    """
     if short_window >= long_window:
         raise ValueError("short_window must be less than long_window")
 
@@ -19,8 +34,13 @@ def generate_sma_crossover_signals(
     short_col = f"sma_{short_window}"
     long_col = f"sma_{long_window}"
 
-    enriched[short_col] = simple_moving_average(enriched["close"], short_window)
-    enriched[long_col] = simple_moving_average(enriched["close"], long_window)
+    if indicators is not None:
+        enriched[short_col] = indicators[short_col].to_numpy()
+        enriched[long_col] = indicators[long_col].to_numpy()
+    else:
+        with span("strategy.sma_crossover.indicators"):
+            enriched[short_col] = simple_moving_average(enriched["close"], short_window)
+            enriched[long_col] = simple_moving_average(enriched["close"], long_window)
 
     valid = enriched[short_col].notna() & enriched[long_col].notna()
     signals = (enriched[short_col] > enriched[long_col]).astype(int)
@@ -32,3 +52,27 @@ def generate_sma_crossover_signals(
     enriched["signal"] = signals.values
 
     return enriched, signals
+
+
+@profiled("strategy.sma_crossover_panel")
+def generate_sma_crossover_panel_signals(
+    closes: pd.DataFrame,
+    short_window: int = 20,
+    long_window: int = 50,
+) -> pd.DataFrame:
+    """Return (date x instrument) 0/1 signals computed in one rolling pass per window."""
+    if short_window >= long_window:
+        raise ValueError("short_window must be less than long_window")
+
+    short_sma = simple_moving_average(closes, short_window)
+    long_sma = simple_moving_average(closes, long_window)
+    state = crossover_state(short_sma.to_numpy(), long_sma.to_numpy())
+    return pd.DataFrame(state, index=closes.index, columns=closes.columns)
+
+
+def crossover_state(
+    short_sma: np.ndarray, long_sma: np.ndarray, dtype: np.dtype | type = float
+) -> np.ndarray:
+    """1 where both SMAs exist and the short one is above the long one, else 0."""
+    # Comparisons against NaN are False, so warm-up bars stay flat.
+    return (np.asarray(short_sma) > np.asarray(long_sma)).astype(dtype, copy=False)
@@ -1,7 +1,10 @@
+import math
+
 import pandas as pd
 import pandas.testing as pdt
 
 from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.metrics import TRADING_DAYS_PER_YEAR, annualization_factor
 
 
 def make_prices():
@@ -47,3 +50,20 @@ def test_positions_shift_and_costs_on_trades():
     pdt.assert_series_equal(result.strategy_returns, strategy_returns, check_names=False)
 
     assert result.equity_curve.iloc[0] == 1.0
+
+
+def test_annualization_scales_with_bar_frequency():
+    prices = make_prices()
+    prices["close"] = [100.0, 100.01, 100.0, 100.01, 100.02]
+    signals = pd.Series([1, 1, 1, 1, 1], index=prices["date"])
+
+    daily = run_backtest(prices, prices.copy(), signals)
+    minute = run_backtest(
+        prices, prices.copy(), signals, periods_per_year=annualization_factor("1min")
+    )
+
+    assert annualization_factor("1D") == TRADING_DAYS_PER_YEAR
+    assert annualization_factor("W") == 52
+    assert minute.metrics["total_return"] == daily.metrics["total_return"]
+    ratio = math.sqrt(annualization_factor("1min") / TRADING_DAYS_PER_YEAR)
+    assert math.isclose(minute.metrics["volatility"], daily.metrics["volatility"] * ratio)
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.slow
+def test_bench_startup_runs_end_to_end():
+    pytest.importorskip("streamlit")
+    output = subprocess.run(
+        [sys.executable, "benchmarks/bench_startup.py", "--repeat", "1", "--rows", "500"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        timeout=600,
+    ).stdout
+
+    assert "CSV parse + resample" in output
+    assert "prebuilt snapshot" in output
@@ -0,0 +1,70 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.bootstrap import (
+    bootstrap_metric_intervals,
+    bootstrap_signal_intervals,
+    stationary_bootstrap_indices,
+)
+from gold_strategy.backtest.metrics import METRIC_NAMES
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_panel_signals
+
+
+def make_returns(periods=300):
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC")
+    return pd.Series(rng.normal(0.0005, 0.01, periods), index=dates)
+
+
+def test_stationary_bootstrap_indices_continue_blocks():
+    rng = np.random.default_rng(0)
+    indices = stationary_bootstrap_indices(50, 20, 10.0, rng)
+    assert indices.shape == (20, 50)
+    assert indices.min() >= 0 and indices.max() < 50
+    steps = np.diff(indices, axis=1)
+    # Inside a block indices advance by one (wrapping at the end).
+    assert ((steps == 1) | (steps == -49)).mean() > 0.8
+
+
+def test_bootstrap_metric_intervals_are_seeded_and_job_independent():
+    returns = make_returns()
+    serial = bootstrap_metric_intervals(returns, n_replicates=600, seed=11)
+    parallel = bootstrap_metric_intervals(returns, n_replicates=600, seed=11, n_jobs=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert list(serial.index) == list(METRIC_NAMES)
+    assert (serial["lower"] <= serial["upper"]).all()
+    assert serial.loc["sharpe", "lower"] < serial.loc["sharpe", "estimate"]
+    assert serial.loc["sharpe", "estimate"] < serial.loc["sharpe", "upper"]
+
+
+@pytest.mark.parametrize("block", [0, -2.0, 0.5])
+def test_non_positive_block_length_is_rejected(block):
+    with pytest.raises(ValueError, match="mean_block_length"):
+        bootstrap_metric_intervals(make_returns(), n_replicates=10, mean_block_length=block)
+
+
+@pytest.mark.parametrize("n_replicates", [0, -1])
+def test_non_positive_replicate_count_is_rejected(n_replicates):
+    returns = make_returns()
+    prices = pd.DataFrame({"date": returns.index, "close": 100 * (1 + returns).cumprod()})
+    signal_fn = partial(generate_sma_crossover_panel_signals, short_window=5, long_window=20)
+
+    with pytest.raises(ValueError, match="n_replicates must be >= 1"):
+        bootstrap_metric_intervals(returns, n_replicates=n_replicates)
+    with pytest.raises(ValueError, match="n_replicates must be >= 1"):
+        bootstrap_signal_intervals(prices, signal_fn, n_replicates=n_replicates)
+
+
+def test_bootstrap_signal_intervals_regenerates_signals():
+    returns = make_returns()
+    prices = pd.DataFrame({"date": returns.index, "close": 100 * (1 + returns).cumprod()})
+    signal_fn = partial(generate_sma_crossover_panel_signals, short_window=5, long_window=20)
+
+    intervals = bootstrap_signal_intervals(prices, signal_fn, n_replicates=50, seed=1)
+
+    assert (intervals["lower"] <= intervals["upper"]).all()
+    assert intervals.loc["max_drawdown", "upper"] <= 0
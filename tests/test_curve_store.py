@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from gold_strategy.backtest.curve_store import CurveStore, parameter_key
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep
+from gold_strategy.data.loaders import build_feature_frame
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+
+
+def make_prices(periods=40):
+    dates = pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC")
+    close = [100 + (i % 7) - (i % 3) for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0,
+        }
+    )
+
+
+def test_sweep_writes_curves_readable_by_parameter_key(tmp_path):
+    prices = make_prices()
+    features = build_feature_frame(prices)
+    run_sma_parameter_sweep(
+        prices, features, [2, 3], [5, 8], transaction_cost_bps=5, curve_store=tmp_path / "curves"
+    )
+
+    store = CurveStore.open(tmp_path / "curves")
+    assert len(store) == 4
+    assert parameter_key({"short_window": 3, "long_window": 8}) in store.keys
+
+    enriched, signals = generate_sma_crossover_signals(features, 3, 8)
+    expected = run_backtest(prices, enriched, signals, transaction_cost_bps=5)
+    curve = store.returns({"short_window": 3, "long_window": 8})
+    pdt.assert_series_equal(curve, expected.strategy_returns, check_names=False)
+    pdt.assert_series_equal(
+        store.equity({"short_window": 3, "long_window": 8}),
+        expected.equity_curve,
+        check_names=False,
+    )
+    assert store.matrix().shape == (40, 4)
+
+
+def test_store_grows_past_initial_capacity(tmp_path):
+    dates = pd.date_range("2020-01-01", periods=5, freq="D", tz="UTC")
+    store = CurveStore.create(tmp_path / "curves", dates, dtype="float32")
+    for i in range(100):
+        store.write(f"set={i}", np.full(5, i, dtype=float))
+    store.write("set=3", np.arange(5))
+    store.flush()
+
+    reopened = CurveStore.open(tmp_path / "curves")
+    assert reopened.returns("set=99").tolist() == [99.0] * 5
+    assert reopened.returns("set=3").tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert reopened.matrix(["set=1", "set=2"]).dtypes.unique().tolist() == [np.float32]
+    with pytest.raises(PermissionError):
+        reopened.write("set=100", np.zeros(5))
+    with pytest.raises(KeyError):
+        reopened.returns("missing")
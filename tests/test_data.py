@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pandas as pd
 
-from gold_strategy.data.loaders import build_feature_frame, load_price_data
+from gold_strategy.data.loaders import build_feature_frame, load_price_data, resample_prices
 
 
 def test_load_price_data(tmp_path: Path):
@@ -42,3 +42,47 @@ def test_build_feature_frame_does_not_mutate_source():
     assert "daily_return" in features.columns
     assert "daily_return" not in prices.columns
     assert features.loc[0, "daily_return"] == 0
+
+
+def test_load_price_data_chunked_matches_single_read(tmp_path: Path):
+    csv = tmp_path / "gold_intraday.csv"
+    df = pd.DataFrame(
+        {
+            "Date": pd.date_range("2020-01-01 09:00", periods=7, freq="min"),
+            "Open": range(7),
+            "High": range(1, 8),
+            "Low": range(7),
+            "Close": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5],
+            "Volume": [None, 10, 3, None, 1, 2, 4],
+            "Notes": "ignored",
+        }
+    )
+    df.to_csv(csv, index=False)
+
+    full = load_price_data(csv)
+    chunked = load_price_data(csv, chunksize=3, downcast=True)
+
+    assert list(chunked.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert chunked["close"].dtype == "float32"
+    pd.testing.assert_frame_equal(chunked.astype(full.dtypes), full)
+
+
+def test_resample_prices_aggregates_ohlcv():
+    prices = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01 09:00", periods=4, freq="30min", tz="UTC"),
+            "open": [1.0, 2.0, 3.0, 4.0],
+            "high": [2.0, 5.0, 4.0, 6.0],
+            "low": [0.5, 1.5, 2.5, 3.5],
+            "close": [1.5, 2.5, 3.5, 4.5],
+            "volume": [1, 2, 3, 4],
+        }
+    )
+
+    hourly = resample_prices(prices, "1h")
+
+    assert hourly["open"].tolist() == [1.0, 3.0]
+    assert hourly["high"].tolist() == [5.0, 6.0]
+    assert hourly["low"].tolist() == [0.5, 2.5]
+    assert hourly["close"].tolist() == [2.5, 4.5]
+    assert hourly["volume"].tolist() == [3, 7]
@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from gold_strategy.backtest.distributed import (
+    run_distributed_sma_sweep,
+    run_worker,
+    start_local_workers,
+    submit_sma_sweep,
+    wait_for_sweep,
+)
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep
+from gold_strategy.data.loaders import build_feature_frame
+
+
+def make_prices(periods=60):
+    dates = pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC")
+    close = [100 + (i % 9) - (i % 4) + 0.2 * i for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0,
+        }
+    )
+
+
+def test_distributed_sweep_matches_local_sweep(tmp_path):
+    prices = make_prices()
+    features = build_feature_frame(prices)
+    shorts, longs = [2, 3, 4, 5], [6, 8, 10]
+
+    expected = run_sma_parameter_sweep(prices, features, shorts, longs, transaction_cost_bps=5)
+    result = run_distributed_sma_sweep(
+        tmp_path / "queue",
+        prices,
+        features,
+        shorts,
+        longs,
+        local_workers=2,
+        shard_size=3,
+        timeout=120,
+        transaction_cost_bps=5,
+    )
+
+    pdt.assert_frame_equal(result, expected)
+
+
+def test_stale_and_failed_shards_are_retried(tmp_path):
+    prices = make_prices()
+    features = build_feature_frame(prices)
+    queue = tmp_path / "queue"
+    assert submit_sma_sweep(queue, prices, features, [2, 3], [5, 6], shard_size=2) == 2
+
+    # Shard 0 was claimed by a worker that died; shard 1 failed once.
+    stale = queue / "running" / "shard-00000@dead.json"
+    os.rename(queue / "pending" / "shard-00000.json", stale)
+    os.utime(stale, (time.time() - 60, time.time() - 60))
+    failed = json.loads((queue / "pending" / "shard-00001.json").read_text())
+    failed["error"] = "RuntimeError: boom"
+    (queue / "failed" / "shard-00001.json").write_text(json.dumps(failed))
+    (queue / "pending" / "shard-00001.json").unlink()
+
+    workers = start_local_workers(queue, 1)
+    try:
+        result = wait_for_sweep(queue, shard_timeout=5, poll_interval=0.05, timeout=120)
+    finally:
+        for process in workers:
+            process.wait(timeout=30)
+
+    expected = run_sma_parameter_sweep(prices, features, [2, 3], [5, 6])
+    pdt.assert_frame_equal(result, expected)
+    assert run_worker(queue) == 0  # STOP is set once the sweep is merged
+
+
+def test_shard_that_keeps_timing_out_is_not_requeued_forever(tmp_path):
+    prices = make_prices()
+    queue = tmp_path / "queue"
+    submit_sma_sweep(queue, prices, build_feature_frame(prices), [2], [5], shard_size=1)
+
+    shard = json.loads((queue / "pending" / "shard-00000.json").read_text())
+    shard["attempt"] = 2
+    stale = queue / "running" / "shard-00000@dead.json"
+    stale.write_text(json.dumps(shard))
+    (queue / "pending" / "shard-00000.json").unlink()
+    os.utime(stale, (time.time() - 60, time.time() - 60))
+
+    with pytest.raises(RuntimeError, match="timed out after 3 attempts"):
+        wait_for_sweep(queue, shard_timeout=5, max_retries=2, poll_interval=0.05, timeout=30)
+    assert not list((queue / "pending").glob("shard-*.json"))
+
+
+def test_sweep_fails_when_every_local_worker_dies(tmp_path):
+    prices = make_prices()
+    queue = tmp_path / "queue"
+    submit_sma_sweep(queue, prices, build_feature_frame(prices), [2, 3], [5, 6], shard_size=1)
+
+    workers = start_local_workers(queue, 1)
+    workers[0].kill()
+    workers[0].wait(timeout=30)
+
+    with pytest.raises(RuntimeError, match="local workers exited"):
+        wait_for_sweep(queue, poll_interval=0.05, timeout=30, workers=workers)
+    assert len(list((queue / "pending").glob("shard-*.json"))) == 4
+
+
+def test_sweep_without_workers_fails_after_shard_timeout(tmp_path):
+    prices = make_prices()
+    queue = tmp_path / "queue"
+    submit_sma_sweep(queue, prices, build_feature_frame(prices), [2], [5], shard_size=1)
+    os.utime(queue / "pending" / "shard-00000.json", (time.time() - 60, time.time() - 60))
+
+    with pytest.raises(RuntimeError, match="No worker has claimed a shard"):
+        wait_for_sweep(queue, shard_timeout=5, poll_interval=0.05, timeout=30)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.strategies.ensemble import (
+    StrategySpec,
+    blend_matrix,
+    blend_signals,
+    evaluate_ensembles,
+    generate_component_signals,
+    weight_grid,
+)
+from gold_strategy.strategies.rsi_mean_reversion import generate_rsi_mean_reversion_signals
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+
+
+def make_frame(periods=150):
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, size=periods)))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2021-01-01", periods=periods, freq="D"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0,
+        }
+    )
+
+
+SPECS = [StrategySpec.sma(5, 20), StrategySpec.sma(10, 30), StrategySpec.rsi(7, 35, 65)]
+
+
+def test_component_signals_match_single_strategy_generators():
+    frame = make_frame()
+    components = generate_component_signals(frame, SPECS)
+
+    _, sma_fast = generate_sma_crossover_signals(frame, 5, 20)
+    _, sma_slow = generate_sma_crossover_signals(frame, 10, 30)
+    _, rsi = generate_rsi_mean_reversion_signals(frame, 7, 35, 65)
+    for column, expected in zip(components.columns, [sma_fast, sma_slow, rsi], strict=True):
+        np.testing.assert_array_equal(components[column].to_numpy(), expected.to_numpy())
+
+
+def test_duplicate_components_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate component"):
+        generate_component_signals(make_frame(), [*SPECS, StrategySpec.sma(5, 20)])
+
+
+def test_blend_matrix_rules():
+    components = np.array([[1, 1, 1], [1, 0, 1], [0, 0, 1], [0, 0, 0]], dtype=float)
+    positions, labels = blend_matrix(
+        components, vote_thresholds=[0.5], weights=np.array([[2.0, 1.0, 1.0]])
+    )
+
+    assert [label["rule"] for label in labels] == ["and", "or", "vote", "weighted"]
+    np.testing.assert_array_equal(positions[:, 0], [1, 0, 0, 0])
+    np.testing.assert_array_equal(positions[:, 1], [1, 1, 1, 0])
+    np.testing.assert_array_equal(positions[:, 2], [1, 1, 0, 0])
+    np.testing.assert_allclose(positions[:, 3], [1.0, 0.75, 0.25, 0.0])
+
+
+def test_weight_grid_rows_sum_to_one():
+    grid = weight_grid(3, steps=4)
+    assert len(grid) == 15
+    np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize("rule", ["and", "or", "vote", "weighted"])
+def test_batched_ensemble_matches_run_backtest(rule):
+    frame = make_frame()
+    weights = np.array([[0.5, 0.25, 0.25]])
+    table = evaluate_ensembles(
+        frame, frame, SPECS, vote_thresholds=(0.5,), weights=weights, transaction_cost_bps=3
+    )
+
+    row = table[table["rule"] == rule].iloc[0]
+    signals = blend_signals(frame, SPECS, rule=rule, threshold=0.5, weights=weights[0])
+    single = run_backtest(frame, frame, signals, transaction_cost_bps=3)
+    for name, value in single.metrics.items():
+        assert row[name] == pytest.approx(value)
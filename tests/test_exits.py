@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.exits import ExitRules, exit_matrix, run_exit_grid
+
+
+def make_bars():
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=6, freq="D", tz="UTC"),
+            "open": [100.0, 100.0, 101.0, 97.0, 99.0, 100.0],
+            "high": [101.0, 101.5, 102.0, 99.5, 100.0, 101.0],
+            "low": [99.0, 99.5, 100.0, 96.0, 98.0, 99.0],
+            "close": [100.0, 101.0, 101.0, 99.0, 99.5, 100.5],
+            "volume": 0,
+        }
+    )
+
+
+def test_stop_loss_fills_at_gap_open_and_goes_flat():
+    prices = make_bars()
+    signals = pd.Series(1.0, index=prices["date"])
+
+    result = run_backtest(
+        prices,
+        prices.copy(),
+        signals,
+        transaction_cost_bps=10,
+        exits=ExitRules(stop_loss=0.02),
+    )
+
+    # Entry reference is the first close (100); the stop at 98 is gapped through on bar 3.
+    assert result.positions.tolist() == [0.0, 1.0, 1.0, 1.0, 0.0, 0.0]
+    assert result.turnover.tolist() == [0.0, 1.0, 0.0, 1.0, 0.0, 0.0]
+    expected = [0.0, 0.01 - 0.001, 0.0, 97.0 / 101.0 - 1 - 0.001, 0.0, 0.0]
+    np.testing.assert_allclose(result.strategy_returns.to_numpy(), expected)
+
+
+def test_take_profit_and_close_fill():
+    prices = make_bars()
+    signals = pd.Series(1.0, index=prices["date"])
+
+    level = run_backtest(prices, prices.copy(), signals, exits=ExitRules(take_profit=0.015))
+    close = run_backtest(
+        prices, prices.copy(), signals, exits=ExitRules(take_profit=0.015, fill="close")
+    )
+
+    # Target 101.5 is touched on bar 1 (high 101.5).
+    assert level.strategy_returns.iloc[1] == pytest.approx(0.015)
+    assert close.strategy_returns.iloc[1] == pytest.approx(0.01)
+    assert level.positions.tolist() == [0.0, 1.0, 0.0, 0.0, 0.0, 0.0]
+
+
+def test_trailing_stop_uses_prior_highs_only():
+    prices = make_bars()
+    signals = pd.Series(1.0, index=prices["date"])
+    result = run_backtest(prices, prices.copy(), signals, exits=ExitRules(trailing_stop=0.01))
+    # High-water after bar 1 is 101.5 -> stop 100.485; bar 2's low (100.0) touches it.
+    assert result.positions.tolist() == [0.0, 1.0, 1.0, 0.0, 0.0, 0.0]
+    assert result.strategy_returns.iloc[2] == pytest.approx(100.485 / 101.0 - 1)
+
+
+def test_exit_grid_matches_individual_backtests():
+    rng = np.random.default_rng(4)
+    n = 300
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    prices = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=n, freq="D", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n)),
+            "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n)),
+            "close": close,
+            "volume": 0,
+        }
+    )
+    signals = pd.Series(((np.arange(n) // 15) % 3 != 0).astype(float), index=prices["date"])
+
+    grid = run_exit_grid(
+        prices,
+        signals,
+        stop_losses=[None, 0.01, 0.03],
+        take_profits=[None, 0.02],
+        trailing_stops=[None, 0.015],
+        transaction_cost_bps=5,
+    )
+    assert len(grid) == 12
+
+    for row in grid.itertuples(index=False):
+        rules = ExitRules(
+            stop_loss=None if pd.isna(row.stop_loss) else row.stop_loss,
+            take_profit=None if pd.isna(row.take_profit) else row.take_profit,
+            trailing_stop=None if pd.isna(row.trailing_stop) else row.trailing_stop,
+        )
+        single = run_backtest(prices, prices.copy(), signals, transaction_cost_bps=5, exits=rules)
+        assert row.sharpe == pytest.approx(single.metrics["sharpe"])
+        assert row.total_return == pytest.approx(single.metrics["total_return"])
+
+
+def test_short_trades_use_mirrored_levels():
+    close = np.array([100.0, 100.0, 95.0, 90.0, 85.0])
+    open_ = np.array([100.0, 100.0, 100.0, 95.0, 90.0])
+    positions = np.array([0.0, -1.0, -1.0, -1.0, -1.0])
+
+    # A falling market is profitable for the short: the 5% stop must not fire.
+    out, _, _ = exit_matrix(
+        positions, open_, close + 0.5, close - 0.5, close, [0.05], [None], [None]
+    )
+    np.testing.assert_array_equal(out[:, 0], positions)
+
+    # Trailing 5% above the lowest low: low 89.5 on bar 3 puts the stop at 93.975.
+    rising = np.array([100.0, 100.0, 95.0, 90.0, 96.0])
+    out, returns, _ = exit_matrix(
+        positions, open_, rising + 0.5, rising - 0.5, rising, [None], [None], [0.05]
+    )
+    np.testing.assert_array_equal(out[:, 0], positions)
+    assert returns[4, 0] == pytest.approx(93.975 / 90.0 - 1)
+
+    # Target 8% below entry (92) is reached by the low of bar 3.
+    out, returns, _ = exit_matrix(
+        positions, open_, close + 0.5, close - 0.5, close, [None], [0.08], [None]
+    )
+    np.testing.assert_array_equal(out[:, 0], [0.0, -1.0, -1.0, -1.0, 0.0])
+    assert returns[3, 0] == pytest.approx(92.0 / 95.0 - 1)
+
+
+def test_flip_from_long_to_short_starts_a_new_trade():
+    close = np.array([100.0, 100.0, 104.0, 104.0, 108.0])
+    positions = np.array([0.0, 1.0, 1.0, -1.0, -1.0])
+
+    # Entry for the short is bar 2's close (104); the 3% stop at 107.12 is hit on bar 4.
+    # Measured from the long's entry (100) the short would not have been stopped.
+    open_ = np.array([100.0, 100.0, 100.0, 104.0, 104.0])
+    out, returns, turnover = exit_matrix(
+        positions, open_, close + 0.5, close - 0.5, close, [0.03], [None], [None]
+    )
+
+    np.testing.assert_array_equal(out[:, 0], positions)
+    assert returns[4, 0] == pytest.approx(107.12 / 104.0 - 1)
+    np.testing.assert_array_equal(turnover[:, 0], [0.0, 1.0, 0.0, 2.0, 1.0])
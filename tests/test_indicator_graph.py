@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from gold_strategy.indicators.graph import evaluate_indicators, rsi, sma
+from gold_strategy.indicators.rsi import relative_strength_index
+from gold_strategy.indicators.sma import simple_moving_average
+from gold_strategy.strategies.rsi_mean_reversion import generate_rsi_mean_reversion_signals
+
+
+def make_features(periods=120):
+    rng = np.random.default_rng(5)
+    close = 1500 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    close[40] = np.nan
+    return pd.DataFrame(
+        {"date": pd.date_range("2020-01-01", periods=periods, freq="D"), "close": close}
+    )
+
+
+def test_evaluate_indicators_matches_direct_helpers():
+    features = make_features()
+    specs = [sma("close", 5), sma("close", 20), rsi("close", 14), rsi("close", 3), sma("close", 5)]
+
+    store = evaluate_indicators(features, specs)
+
+    assert list(store.columns) == ["sma_5", "sma_20", "rsi_14", "rsi_3"]
+    for window in (5, 20):
+        expected = simple_moving_average(features["close"], window)
+        pdt.assert_series_equal(store[f"sma_{window}"], expected, check_names=False)
+    for window in (14, 3):
+        expected = relative_strength_index(features["close"], window)
+        pdt.assert_series_equal(store[f"rsi_{window}"], expected, check_names=False)
+
+
+def test_precomputed_indicators_give_same_signals():
+    features = make_features()
+    store = evaluate_indicators(features, [rsi("close", 7)])
+
+    direct_frame, direct = generate_rsi_mean_reversion_signals(features, 7, 35, 65)
+    shared_frame, shared = generate_rsi_mean_reversion_signals(
+        features, 7, 35, 65, indicators=store
+    )
+
+    pdt.assert_series_equal(shared, direct)
+    pdt.assert_frame_equal(shared_frame, direct_frame)
+
+
+def test_invalid_windows_rejected():
+    with pytest.raises(ValueError):
+        sma("close", 0)
+    with pytest.raises(ValueError):
+        rsi("close", 1)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.curve_store import CurveStore
+from gold_strategy.backtest.engine import lean_signal_is_binary, run_backtest
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep, sma_sweep_returns
+from gold_strategy.data.loaders import build_feature_frame
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+
+
+def make_prices(periods=600):
+    rng = np.random.default_rng(3)
+    close = 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, size=periods)))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2019-01-01", periods=periods, freq="D", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0.0,
+        }
+    )
+
+
+def test_lean_backtest_uses_compact_dtypes_and_matches_float64():
+    prices = make_prices()
+    features = build_feature_frame(prices)
+    enriched, signals = generate_sma_crossover_signals(features, 10, 40)
+
+    full = run_backtest(prices, enriched, signals, transaction_cost_bps=5)
+    lean = run_backtest(prices, enriched, signals, transaction_cost_bps=5, lean=True)
+
+    assert lean.signals.dtype == np.int8
+    assert lean.positions.dtype == np.int8
+    assert lean.turnover.dtype == np.int8
+    assert lean.strategy_returns.dtype == np.float32
+    assert lean.equity_curve.dtype == np.float32
+    np.testing.assert_array_equal(lean.positions.to_numpy(), full.positions.to_numpy())
+    for name, value in full.metrics.items():
+        assert lean.metrics[name] == pytest.approx(value, rel=1e-5, abs=1e-7)
+
+
+def test_lean_backtest_keeps_fractional_weights_as_float32():
+    prices = make_prices(50)
+    weights = pd.Series(np.linspace(0, 1.5, 50), index=prices["date"])
+
+    result = run_backtest(prices, prices, weights, lean=True)
+
+    assert result.positions.dtype == np.float32
+    assert result.positions.iloc[-1] == pytest.approx(weights.iloc[-2])
+
+
+def test_lean_treats_float_unit_signals_as_binary():
+    prices = make_prices(50)
+    signals = pd.Series(np.where(np.arange(50) % 7 < 3, -1.0, 1.0), index=prices["date"])
+    signals.iloc[:5] = np.nan
+
+    lean = run_backtest(prices, prices, signals, transaction_cost_bps=2, lean=True)
+    full = run_backtest(prices, prices, signals, transaction_cost_bps=2)
+
+    assert lean.positions.dtype == np.int8
+    np.testing.assert_array_equal(lean.positions.to_numpy(), full.positions.to_numpy())
+    assert lean_signal_is_binary(np.array([0, 1, 1], dtype=np.int64))
+    assert not lean_signal_is_binary(np.array([0, 2], dtype=np.int64))
+
+
+def test_sweep_return_matrix_matches_run_backtest():
+    prices = make_prices()
+    features = build_feature_frame(prices)
+
+    matrix = sma_sweep_returns(prices, features, [5, 10], [20, 40], transaction_cost_bps=3)
+
+    assert list(matrix.columns)[0] == "long_window=20,short_window=5"
+    enriched, signals = generate_sma_crossover_signals(features, 10, 40)
+    single = run_backtest(prices, enriched, signals, transaction_cost_bps=3)
+    np.testing.assert_allclose(
+        matrix["long_window=40,short_window=10"].to_numpy(), single.strategy_returns.to_numpy()
+    )
+
+
+def test_lean_sweep_matches_float64_sweep(tmp_path):
+    prices = make_prices()
+    features = build_feature_frame(prices)
+    grid = dict(short_windows=[5, 10, 20], long_windows=[30, 60], transaction_cost_bps=2)
+
+    full = run_sma_parameter_sweep(prices, features, **grid)
+    lean = run_sma_parameter_sweep(
+        prices, features, **grid, lean=True, curve_store=tmp_path / "curves"
+    )
+
+    pd.testing.assert_frame_equal(lean, full, rtol=1e-5, atol=1e-7)
+    store = CurveStore.open(tmp_path / "curves")
+    assert store.dtype == np.float32
+    assert len(store) == len(full)
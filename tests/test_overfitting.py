@@ -0,0 +1,125 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.overfitting import (
+    cscv,
+    deflated_sharpe_ratio,
+    expected_max_sharpe,
+    overfitting_diagnostics,
+    split_combinations,
+)
+from gold_strategy.backtest.sweep import sma_sweep_returns
+from gold_strategy.data.loaders import build_feature_frame
+
+
+def per_period_sharpe(values):
+    std = values.std(axis=0)
+    return np.where(std > 1e-12, values.mean(axis=0) / np.where(std > 0, std, 1), 0.0)
+
+
+def test_cscv_matches_naive_split_loop():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0.0002, 0.01, size=(203, 6))
+    n_splits = 6
+
+    logits, is_sharpe, oos_sharpe = cscv(returns, n_splits=n_splits)
+
+    blocks = np.array_split(returns[203 % n_splits :], n_splits)
+    expected = []
+    for picks in combinations(range(n_splits), n_splits // 2):
+        train = np.vstack([blocks[i] for i in picks])
+        test = np.vstack([blocks[i] for i in range(n_splits) if i not in picks])
+        train_sr, test_sr = per_period_sharpe(train), per_period_sharpe(test)
+        best = train_sr.argmax()
+        rank = (test_sr < test_sr[best]).sum() + 1
+        omega = rank / (returns.shape[1] + 1)
+        expected.append((np.log(omega / (1 - omega)), train_sr[best], test_sr[best]))
+
+    expected = np.array(expected)
+    np.testing.assert_allclose(logits, expected[:, 0])
+    np.testing.assert_allclose(is_sharpe, expected[:, 1])
+    np.testing.assert_allclose(oos_sharpe, expected[:, 2])
+
+
+def test_split_combinations_are_symmetric():
+    membership = split_combinations(8)
+
+    assert membership.shape == (70, 8)
+    assert (membership.sum(axis=1) == 4).all()
+    rows = {tuple(row) for row in membership}
+    assert all(tuple(1 - row) in rows for row in membership)
+    with pytest.raises(ValueError):
+        split_combinations(5)
+
+
+def test_threaded_cscv_matches_serial():
+    returns = np.random.default_rng(2).normal(0, 0.01, size=(280, 5))
+
+    serial = cscv(returns, n_splits=14)
+    threaded = cscv(returns, n_splits=14, n_jobs=2)
+
+    for left, right in zip(serial, threaded, strict=True):
+        np.testing.assert_array_equal(left, right)
+
+
+def test_skilled_column_is_not_flagged():
+    rng = np.random.default_rng(3)
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(1600, 20)))
+    returns[7] += 0.003
+
+    report = overfitting_diagnostics(returns, n_splits=8)
+
+    assert report.best_column == 7
+    assert report.pbo == 0.0
+    assert report.prob_oos_loss == 0.0
+    assert report.deflated_sharpe > 0.99
+    assert report.best_sharpe > report.expected_max_sharpe
+
+
+def test_deflated_sharpe_penalizes_many_trials():
+    rng = np.random.default_rng(4)
+    returns = rng.normal(0.0005, 0.01, size=(500, 200))
+
+    few, observed_few, benchmark_few = deflated_sharpe_ratio(returns[:, :10], column=0)
+    many, observed_many, benchmark_many = deflated_sharpe_ratio(returns, column=0)
+
+    assert observed_few == observed_many
+    assert benchmark_many > benchmark_few > 0
+    assert many < few
+    assert expected_max_sharpe(0.01, 1) == 0.0
+
+
+def test_diagnostics_run_on_sweep_return_matrix():
+    rng = np.random.default_rng(5)
+    close = 1500 * np.exp(np.cumsum(rng.normal(0, 0.01, size=400)))
+    prices = pd.DataFrame(
+        {
+            "date": pd.date_range("2018-01-01", periods=400, freq="D", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0.0,
+        }
+    )
+    matrix = sma_sweep_returns(prices, build_feature_frame(prices), [5, 10], [20, 40, 60])
+
+    report = overfitting_diagnostics(matrix, n_splits=8)
+
+    assert report.best_column in matrix.columns
+    assert 0.0 <= report.pbo <= 1.0
+    assert len(report.logits) == 70
+    assert set(report.summary()) >= {"pbo", "deflated_sharpe", "degradation_slope"}
+
+
+def test_non_finite_returns_are_rejected():
+    returns = np.random.default_rng(6).normal(0, 0.01, size=(160, 4))
+    returns[3, 1] = np.nan
+
+    with pytest.raises(ValueError, match="NaN"):
+        overfitting_diagnostics(returns, n_splits=8)
+    with pytest.raises(ValueError, match="NaN"):
+        deflated_sharpe_ratio(pd.DataFrame(returns).replace(np.nan, np.inf))
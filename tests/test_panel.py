@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.panel import run_panel_backtest
+from gold_strategy.data.loaders import load_panel_prices
+from gold_strategy.strategies.rsi_mean_reversion import (
+    generate_rsi_mean_reversion_panel_signals,
+    generate_rsi_mean_reversion_signals,
+)
+from gold_strategy.strategies.sma_crossover import (
+    generate_sma_crossover_panel_signals,
+    generate_sma_crossover_signals,
+)
+
+
+def make_closes(periods=80):
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC")
+    paths = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(periods, 3)), axis=0))
+    return pd.DataFrame(paths, index=pd.Index(dates, name="date"), columns=["gc", "si", "gdx"])
+
+
+def single_instrument_frame(closes: pd.DataFrame, instrument: str) -> pd.DataFrame:
+    close = closes[instrument].to_numpy()
+    return pd.DataFrame(
+        {
+            "date": closes.index,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0,
+        }
+    )
+
+
+@pytest.mark.parametrize("strategy", ["sma", "rsi"])
+def test_panel_metrics_match_single_instrument_backtests(strategy):
+    closes = make_closes()
+    if strategy == "sma":
+        panel_signals = generate_sma_crossover_panel_signals(closes, 5, 15)
+    else:
+        panel_signals = generate_rsi_mean_reversion_panel_signals(closes, 5, 40, 60)
+
+    panel = run_panel_backtest(closes, panel_signals, transaction_cost_bps=5)
+
+    for instrument in closes.columns:
+        frame = single_instrument_frame(closes, instrument)
+        if strategy == "sma":
+            enriched, signals = generate_sma_crossover_signals(frame, 5, 15)
+        else:
+            enriched, signals = generate_rsi_mean_reversion_signals(frame, 5, 40, 60)
+        single = run_backtest(frame, enriched, signals, transaction_cost_bps=5)
+        for name, value in single.metrics.items():
+            assert panel.metrics.loc[instrument, name] == pytest.approx(value)
+
+    expected_portfolio = panel.strategy_returns.mean(axis=1)
+    pd.testing.assert_series_equal(panel.portfolio_returns, expected_portfolio, check_names=False)
+    assert set(panel.portfolio_metrics) == set(panel.metrics.columns)
+
+
+def test_load_panel_prices_aligns_shared_dates(tmp_path: Path):
+    paths = {}
+    for name, start in [("gold", "2020-01-01"), ("silver", "2020-01-02")]:
+        csv = tmp_path / f"{name}.csv"
+        pd.DataFrame(
+            {
+                "Date": pd.date_range(start, periods=4, freq="D"),
+                "Open": 1.0,
+                "High": 1.0,
+                "Low": 1.0,
+                "Close": [1.0, 2.0, 3.0, 4.0],
+                "Volume": 0,
+            }
+        ).to_csv(csv, index=False)
+        paths[name] = csv
+
+    panel = load_panel_prices(paths)
+
+    assert list(panel.columns) == ["gold", "silver"]
+    assert len(panel) == 3
+    assert panel["gold"].tolist() == [2.0, 3.0, 4.0]
+    assert panel["silver"].tolist() == [1.0, 2.0, 3.0]
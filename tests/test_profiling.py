@@ -0,0 +1,71 @@
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from gold_strategy import profiling
+from gold_strategy.backtest.sweep import run_sma_parameter_sweep
+from gold_strategy.data.loaders import build_feature_frame
+
+
+def make_prices():
+    dates = pd.date_range("2020-01-01", periods=30, freq="D", tz="UTC")
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": range(30),
+            "high": range(30),
+            "low": range(30),
+            "close": [100 + (i % 6) for i in range(30)],
+            "volume": 0,
+        }
+    )
+
+
+def test_disabled_mode_records_nothing():
+    assert profiling.active_profiler() is None
+    assert profiling.span("anything") is profiling.span("other")
+    profiling.count("backtests")
+    run_sma_parameter_sweep(make_prices(), build_feature_frame(make_prices()), [2], [4])
+    assert profiling.active_profiler() is None
+
+
+def test_profile_collects_spans_counters_and_exports(tmp_path):
+    prices = make_prices()
+    with profiling.profile(track_allocations=True) as profiler:
+        features = build_feature_frame(prices)
+        run_sma_parameter_sweep(prices, features, [2, 3], [4, 5])
+
+    assert profiling.active_profiler() is None
+    summary = profiler.summary()
+    assert summary.loc["backtest.run_backtest", "calls"] == 4
+    assert summary.loc["sweep.sma", "calls"] == 1
+    assert {"backtest.align", "indicators.evaluate", "alloc_mb"} <= set(summary.index) | set(
+        summary.columns
+    )
+    assert profiler.counters == {"sweep.parameter_sets": 4, "backtests": 4}
+    assert profiler.rates()["backtests"] > 0
+
+    payload = json.loads(profiler.to_json(tmp_path / "profile.json"))
+    assert payload["counters"]["backtests"] == 4
+
+    trace = profiler.to_chrome_trace(tmp_path / "trace.json")
+    names = {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert "sweep.sma" in names
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+
+
+def test_profiler_is_scoped_to_its_thread_and_closed_on_error():
+    seen = []
+    with pytest.raises(RuntimeError):
+        with profiling.profile() as profiler:
+            worker = threading.Thread(target=lambda: seen.append(profiling.active_profiler()))
+            worker.start()
+            worker.join()
+            profiling.count("backtests")
+            raise RuntimeError("script stopped")
+
+    assert seen == [None]
+    assert profiling.active_profiler() is None
+    assert profiler.counters == {"backtests": 1}
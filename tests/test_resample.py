@@ -0,0 +1,49 @@
+import pandas as pd
+import pandas.testing as pdt
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.strategies.sma_crossover import generate_sma_crossover_signals
+
+
+def make_prices(periods=90):
+    dates = pd.date_range("2020-01-01", periods=periods, freq="B", tz="UTC")
+    close = [100 + (i % 7) - (i % 5) + i * 0.1 for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": close,
+            "high": [c + 1 for c in close],
+            "low": [c - 1 for c in close],
+            "close": close,
+            "volume": 1,
+        }
+    )
+
+
+def test_append_matches_full_rebuild():
+    prices = make_prices()
+    cache = ResampleCache(prices.iloc[:47])
+    cache.append(prices.iloc[47:63])
+    cache.append(prices.iloc[63:])
+
+    fresh = ResampleCache(prices)
+    for resolution in cache.resolutions:
+        pdt.assert_frame_equal(cache.prices(resolution), fresh.prices(resolution))
+        pdt.assert_frame_equal(cache.features(resolution), fresh.features(resolution))
+
+
+def test_cached_resolution_feeds_backtest_directly():
+    cache = ResampleCache(make_prices())
+    weekly = cache.features("weekly")
+    enriched, signals = generate_sma_crossover_signals(weekly, short_window=2, long_window=4)
+
+    result = run_backtest(
+        cache.prices("weekly"),
+        enriched,
+        signals,
+        periods_per_year=cache.periods_per_year("weekly"),
+    )
+
+    assert len(result.equity_curve) == len(weekly)
+    assert cache.periods_per_year("monthly") == 12
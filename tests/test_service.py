@@ -0,0 +1,251 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy import profiling
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.service import BacktestServer, BacktestService, ServiceBusy
+from gold_strategy.strategies.sma_crossover import (
+    generate_sma_crossover_signals,
+    sma_crossover_indicators,
+)
+
+
+def make_cache(periods=300):
+    rng = np.random.default_rng(5)
+    close = 1500 * np.exp(np.cumsum(rng.normal(0, 0.01, size=periods)))
+    prices = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0.0,
+        }
+    )
+    return ResampleCache(prices)
+
+
+@pytest.fixture
+def server():
+    service = BacktestService(make_cache(), workers=2, max_pending=4)
+    httpd = BacktestServer(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def post(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), json.loads(exc.read())
+
+
+def blocking_service(**kwargs):
+    """Service whose ``backtest`` endpoint waits on an event, to hold requests in flight."""
+    service = BacktestService(make_cache(60), **kwargs)
+    release = threading.Event()
+    calls = []
+
+    def slow(params):
+        calls.append(params)
+        release.wait(10)
+        return {"echo": params}
+
+    service.endpoints["backtest"] = slow
+    return service, release, calls
+
+
+def test_backtest_endpoint_matches_run_backtest(server):
+    body = {"strategy": "sma", "parameters": {"short_window": 5, "long_window": 20}}
+    status, headers, payload = post(f"{server.url}/backtest", {**body, "transaction_cost_bps": 2})
+
+    assert status == 200
+    assert headers["X-Cache"] == "miss"
+    cache = server.service.cache
+    enriched, signals = generate_sma_crossover_signals(cache.features("daily"), 5, 20)
+    expected = run_backtest(cache.prices("daily"), enriched, signals, transaction_cost_bps=2)
+    for name, value in expected.metrics.items():
+        assert payload["metrics"][name] == pytest.approx(value)
+
+    status, headers, again = post(f"{server.url}/backtest", {**body, "transaction_cost_bps": 2})
+    assert headers["X-Cache"] == "hit"
+    assert again == payload
+
+
+def test_sweep_and_walk_forward_endpoints(server):
+    status, _, sweep = post(
+        f"{server.url}/sweep",
+        {"short_windows": [5, 10], "long_windows": [20, 30], "end": "2020-09-30"},
+    )
+    assert status == 200
+    assert len(sweep["results"]) == 4
+
+    status, _, walk = post(
+        f"{server.url}/walk-forward",
+        {"strategy": "rsi", "train_end": "2020-06-30", "resolution": "weekly"},
+    )
+    assert status == 200
+    assert set(walk["train"]) == set(walk["test"])
+
+
+def test_bad_requests_are_rejected(server):
+    assert post(f"{server.url}/backtest", {"strategy": "macd"})[0] == 400
+    assert post(f"{server.url}/walk-forward", {"strategy": "sma"})[0] == 400
+    assert post(f"{server.url}/nope", {})[0] == 404
+    with urllib.request.urlopen(f"{server.url}/health", timeout=10) as response:
+        health = json.loads(response.read())
+    assert health["status"] == "ok"
+    assert health["stats"]["requests"] == 2
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    service, release, calls = blocking_service(workers=1)
+    first, first_source = service.submit("backtest", {"strategy": "sma"})
+    second, second_source = service.submit("backtest", {"strategy": "sma"})
+
+    assert (first_source, second_source) == ("miss", "coalesced")
+    assert first is second
+    release.set()
+    assert first.result(timeout=10) == {"echo": {"strategy": "sma"}}
+    assert len(calls) == 1
+    service.close()
+
+
+def test_full_pool_returns_503_and_recovers():
+    service, release, _ = blocking_service(workers=1, max_pending=1)
+    httpd = BacktestServer(service, port=0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        service.submit("backtest", {"id": 1})
+        with pytest.raises(ServiceBusy):
+            service.submit("backtest", {"id": 2})
+        status, headers, _ = post(f"{httpd.url}/backtest", {"id": 3})
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+
+        release.set()
+        status, headers, payload = post(f"{httpd.url}/backtest", {"id": 1})
+        assert status == 200
+        assert payload == {"echo": {"id": 1}}
+        assert service.stats["rejected"] == 2
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        service.close()
+
+
+def test_result_cache_is_bounded_lru():
+    service = BacktestService(make_cache(60), cache_size=2)
+    service.endpoints["backtest"] = lambda params: params
+    for key in (1, 2, 1, 3):
+        service.submit("backtest", {"id": key})[0].result(timeout=10)
+
+    assert service.submit("backtest", {"id": 1})[1] == "hit"
+    assert service.submit("backtest", {"id": 2})[1] == "miss"
+    service.close()
+
+
+def test_date_slices_are_reused_across_requests():
+    service = BacktestService(make_cache(120))
+    bodies = ({"strategy": "sma"}, {"strategy": "rsi"}, {"strategy": "rsi", "end": "2020-03-01"})
+    for body in bodies:
+        service.submit("backtest", body)[0].result(timeout=10)
+
+    assert (service.stats["slice_hits"], service.stats["slice_misses"]) == (1, 2)
+    service.close()
+
+
+def test_backtests_reuse_indicator_columns_of_a_slice():
+    service = BacktestService(make_cache(120))
+    for short, long in ((5, 20), (10, 20), (5, 20)):
+        body = {"strategy": "sma", "parameters": {"short_window": short, "long_window": long}}
+        service.submit("backtest", body)[0].result(timeout=10)
+
+    # (5, 20) computes both windows; (10, 20) only sma_10; the repeat is a result-cache hit.
+    assert (service.stats["indicator_hits"], service.stats["indicator_misses"]) == (1, 3)
+    service.close()
+
+
+def test_indicators_are_not_memoized_for_a_slice_evicted_mid_request(monkeypatch):
+    monkeypatch.setattr("gold_strategy.service._SLICE_CACHE_SIZE", 1)
+    service = BacktestService(make_cache(120))
+    first = {"start": "2020-01-01"}
+    features = service._frames(first)[1]
+    # Another request evicts the first slice before its indicators are computed.
+    second = {"start": "2020-02-01"}
+    service._frames(second)
+    specs = sma_crossover_indicators(5, 20)
+
+    columns = service._indicator_store(first, features, specs)
+
+    assert set(columns) == {spec.column for spec in specs}
+    assert list(service._slices) == [service._slice_key(second)]
+    assert service._slices[service._slice_key(second)][2] == {}
+    service.close()
+
+
+def test_equivalent_requests_share_a_cache_entry():
+    service = BacktestService(make_cache(120))
+    service.submit("backtest", {"strategy": "sma", "start": "2020-02-01"})[0].result(timeout=10)
+    spelled_out = {
+        "strategy": "sma",
+        "parameters": {"short_window": "20", "long_window": 50.0},
+        "resolution": "daily",
+        "start": "2020-02-01T00:00:00+00:00",
+        "end": None,
+        "transaction_cost_bps": 0,
+        "initial_capital": "1",
+        "slippage_bps": 0,
+        "include_curve": 0,
+    }
+    assert service.submit("backtest", spelled_out)[1] == "hit"
+    service.close()
+
+
+def test_oversized_sweeps_are_rejected():
+    service = BacktestService(make_cache(60), max_sweep_pairs=3)
+    grid = {"short_windows": [2, 3, 4], "long_windows": [5, 6]}
+    with pytest.raises(ValueError, match="6 parameter pairs"):
+        service.submit("sweep", grid)
+    assert service.stats["requests"] == 1
+    service.close()
+
+    httpd = BacktestServer(BacktestService(make_cache(60), max_sweep_pairs=3), port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    status, _, payload = post(f"{httpd.url}/sweep", grid)
+    assert status == 400 and "at most 3" in payload["error"]
+    httpd.shutdown()
+    httpd.server_close()
+    httpd.service.close()
+
+
+def test_cache_counters_and_worker_spans_reach_an_active_profiler():
+    service = BacktestService(make_cache(120))
+    with profiling.profile() as profiler:
+        for _ in range(2):
+            service.submit("backtest", {"strategy": "sma"})[0].result(timeout=10)
+    service.close()
+
+    # Miss: result, slice, two SMA windows. Hit: resampled prices and features, result.
+    assert profiler.counters["cache.miss"] == 4
+    assert profiler.counters["cache.hit"] == 3
+    summary = profiler.summary()
+    assert summary.loc["backtest.run_backtest", "calls"] == 1
+    assert summary.loc["cache.hit", "calls"] == 3
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.engine import run_backtest
+from gold_strategy.backtest.sizing import (
+    realized_volatility,
+    run_volatility_target_grid,
+    volatility_target_signals,
+)
+
+
+def make_prices(periods=200):
+    rng = np.random.default_rng(11)
+    close = 1500 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, periods)))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=periods, freq="D", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 0,
+        }
+    )
+
+
+def make_signals(prices):
+    flags = (np.arange(len(prices)) // 25) % 2 == 0
+    return pd.Series(flags.astype(float), index=prices["date"])
+
+
+def test_realized_volatility_matches_rolling_std():
+    returns = np.random.default_rng(0).normal(0, 0.01, 60)
+    vols = realized_volatility(returns, [10], periods_per_year=252)
+    expected = pd.Series(returns).rolling(10).std(ddof=0) * np.sqrt(252)
+    np.testing.assert_allclose(vols[10], expected.to_numpy(), rtol=1e-8)
+
+
+def test_grid_row_matches_full_backtest_of_sized_signals():
+    prices = make_prices()
+    signals = make_signals(prices)
+
+    grid = run_volatility_target_grid(
+        prices, signals, [0.1, 0.2], [10, 30], max_leverage=1.5, transaction_cost_bps=5
+    )
+    assert len(grid) == 4
+
+    sized = volatility_target_signals(
+        prices, signals, target_vol=0.2, lookback=30, max_leverage=1.5
+    )
+    assert sized.max() <= 1.5
+    assert sized[signals.to_numpy() == 0].eq(0).all()
+    result = run_backtest(prices, prices.copy(), sized, transaction_cost_bps=5)
+
+    row = grid.set_index(["target_vol", "lookback"]).loc[(0.2, 30)]
+    for name, value in result.metrics.items():
+        assert row[name] == pytest.approx(value)
+
+
+def test_rebalance_threshold_cuts_turnover():
+    prices = make_prices()
+    signals = make_signals(prices)
+    loose = run_volatility_target_grid(prices, signals, [0.15], [20])
+    banded = run_volatility_target_grid(prices, signals, [0.15], [20], rebalance_threshold=0.1)
+    assert banded.loc[0, "turnover"] < loose.loc[0, "turnover"]
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from gold_strategy.data.resample import ResampleCache
+from gold_strategy.data.snapshot import snapshot_is_fresh
+
+
+def make_prices(periods=120):
+    close = np.linspace(100, 130, periods)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=periods, freq="B", tz="UTC"),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.zeros(periods),
+        }
+    )
+
+
+def test_resample_cache_snapshot_round_trip(tmp_path):
+    prices = make_prices()
+    cache = ResampleCache(prices.iloc[:100])
+    cache.save(tmp_path / "snapshot.npz")
+
+    restored = ResampleCache.load(tmp_path / "snapshot.npz")
+    pdt.assert_frame_equal(restored.base, cache.base)
+    for resolution in cache.resolutions:
+        pdt.assert_frame_equal(restored.features(resolution), cache.features(resolution))
+
+    # Incremental appends keep working after a restore.
+    restored.append(prices.iloc[100:])
+    fresh = ResampleCache(prices)
+    pdt.assert_frame_equal(restored.prices("weekly"), fresh.prices("weekly"))
+
+
+def test_snapshot_freshness_follows_source_mtime(tmp_path):
+    source = tmp_path / "gold.csv"
+    snapshot = tmp_path / "snapshot.npz"
+    source.write_text("Date,Open,High,Low,Close,Volume\n")
+    assert not snapshot_is_fresh(snapshot, source)
+
+    ResampleCache(make_prices()).save(snapshot)
+    os.utime(source, (snapshot.stat().st_mtime - 10,) * 2)
+    assert snapshot_is_fresh(snapshot, source)
+
+    os.utime(source, (snapshot.stat().st_mtime + 10,) * 2)
+    assert not snapshot_is_fresh(snapshot, source)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gold_strategy.backtest.metrics import summarize_metrics
+from gold_strategy.backtest.stability import date_range_stability_surface
+
+
+def make_returns(columns=("a", "b")):
+    rng = np.random.default_rng(2)
+    dates = pd.date_range("2018-01-01", "2021-12-31", freq="B", tz="UTC")
+    return pd.DataFrame(
+        rng.normal(0.0004, 0.01, (len(dates), len(columns))), index=dates, columns=columns
+    )
+
+
+def test_surface_cells_match_direct_metrics():
+    returns = make_returns()
+    surface = date_range_stability_surface(returns)
+
+    assert surface.starts == ["2018", "2019", "2020", "2021"]
+    for start, end in [("2018", "2021"), ("2019", "2020"), ("2021", "2021")]:
+        segment = returns.loc[start:end, "b"]
+        equity = (1 + segment).cumprod()
+        expected = summarize_metrics(segment, equity, equity / equity.cummax() - 1)
+        for metric in ("total_return", "cagr", "volatility", "sharpe"):
+            cell = surface.frame(metric, column="b").loc[start, end]
+            assert cell == pytest.approx(expected[metric], rel=1e-6)
+
+    assert np.isnan(surface.frame("sharpe").loc["2020", "2019"])
+
+
+def test_series_input_and_quarterly_periods():
+    series = make_returns(("only",))["only"]
+    surface = date_range_stability_surface(series, period="Q")
+    assert len(surface.starts) == 16
+    assert surface.frame("cagr").shape == (16, 16)